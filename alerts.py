@@ -0,0 +1,253 @@
+"""Threshold alerts evaluated against every snapshot as it is sampled
+
+    python main.py --alerts rules.json                 in the GUI
+    python main.py --watch 10 --alerts rules.json      headless
+
+The rules file is JSON:
+
+    {"rules": [
+        {"name": "Root disk almost full", "metric": "disk_percent",
+         "above": 90, "for": 300, "clear": 85},
+        {"name": "Low memory", "metric": "mem_available", "below": "1 GB",
+         "window": 60, "hook": "logger -t openabout low memory"}
+    ]}
+
+metric is one of METRICS. A rule breaches when the metric is above (or
+below) its threshold; with "window" the value compared is the mean (or
+"aggregate": "min"/"max") of the samples in the last window seconds, and
+with "for" the breach must last that many seconds before the rule fires.
+A firing rule clears once the value crosses "clear" (the threshold itself
+if not given), so a value hovering at the threshold doesn't flap. Firing
+and clearing each send a desktop notification ("notify": false to turn
+off) and run the rule's "hook" shell command, with OPENABOUT_ALERT,
+OPENABOUT_ALERT_STATE (firing or cleared), OPENABOUT_ALERT_METRIC and
+OPENABOUT_ALERT_VALUE set in its environment.
+
+Each rule keeps its own running state (the window's running sum or
+monotonic deque, and when the breach began), so a tick costs O(rules) and
+never rescans history.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+from collections import deque, namedtuple
+from sysinfo import format_bytes
+
+AlertEvent = namedtuple("AlertEvent", ["rule", "firing", "metric", "value", "timestamp", "message"])
+
+def max_busy(snapshot):
+    return max((row.busy_percent for row in snapshot.disk_io if row.busy_percent is not None), default=None)
+
+# metric -> (metric group it needs, value from a SystemSnapshot or None, unit)
+METRICS = {
+    "cpu_percent": ("cpu", lambda s: s.cpu_percent, "%"),
+    "cpu_freq": ("cpu_freq", lambda s: s.cpu_freq, "MHz"),
+    "mem_percent": ("memory", lambda s: s.mem_percent, "%"),
+    "mem_available": ("memory", lambda s: s.mem_available, "bytes"),
+    "swap_used": ("swap", lambda s: s.swap_used, "bytes"),
+    "disk_percent": ("disk", lambda s: s.disk.percent if s.disk else None, "%"),
+    "disk_free": ("disk", lambda s: s.disk.free if s.disk else None, "bytes"),
+    "disk_busy_percent": ("disk_io", max_busy, "%"),
+    "net_errors": ("net_io", lambda s: sum(row.errors for row in s.net_io) if s.net_io else None, "/s"),
+    "net_drops": ("net_io", lambda s: sum(row.drops for row in s.net_io) if s.net_io else None, "/s"),
+    "process_count": ("processes", lambda s: s.process_count or None, ""),
+}
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+def parse_threshold(value, unit):
+    """A number, or for byte metrics a string such as "1.5 GB" """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if unit == "bytes" and isinstance(value, str):
+        number = value.upper().rstrip("B").rstrip()
+        for suffix, factor in sorted(SIZE_UNITS.items(), key=lambda item: -len(item[0])):
+            suffix = suffix.rstrip("B")
+            if suffix and number.endswith(suffix):
+                return float(number[:-len(suffix)]) * factor
+        return float(number)
+    raise ValueError(f"threshold {value!r} is not a number")
+
+def format_value(value, unit):
+    if unit == "bytes":
+        return format_bytes(value)
+    if unit == "%":
+        return f"{value:.1f}%"
+    return f"{value:g} {unit}".rstrip()
+
+class RollingWindow:
+    """Mean, min or max of the samples in the last seconds, in amortised O(1) per sample"""
+    
+    def __init__(self, seconds, aggregate="mean"):
+        if aggregate not in ("mean", "min", "max"):
+            raise ValueError(f"unknown aggregate {aggregate!r}")
+        self.seconds = seconds
+        self.aggregate = aggregate
+        # (timestamp, value); for min/max only the values that can still become the extreme
+        self.samples = deque()
+        self.total = 0.0
+        
+    def add(self, timestamp, value):
+        """Add a sample and return the aggregate over the window ending at it"""
+        samples = self.samples
+        start = timestamp - self.seconds
+        if self.aggregate == "mean":
+            samples.append((timestamp, value))
+            self.total += value
+            while samples[0][0] < start:
+                self.total -= samples.popleft()[1]
+            return self.total / len(samples)
+        if self.aggregate == "max":
+            while samples and samples[-1][1] <= value:
+                samples.pop()
+        else:
+            while samples and samples[-1][1] >= value:
+                samples.pop()
+        samples.append((timestamp, value))
+        while samples[0][0] < start:
+            samples.popleft()
+        return samples[0][1]
+
+class AlertRule:
+    """One rule and its running state"""
+    
+    def __init__(self, spec):
+        if not isinstance(spec, dict):
+            raise ValueError("each rule must be an object")
+        self.metric = spec.get("metric")
+        if self.metric not in METRICS:
+            raise ValueError(f"unknown metric {self.metric!r} (one of {', '.join(METRICS)})")
+        self.group, self.read, self.unit = METRICS[self.metric]
+        self.name = str(spec.get("name") or self.metric)
+        if ("above" in spec) == ("below" in spec):
+            raise ValueError(f"{self.name}: give exactly one of 'above' and 'below'")
+        self.above = "above" in spec
+        self.threshold = parse_threshold(spec["above" if self.above else "below"], self.unit)
+        self.clear = parse_threshold(spec.get("clear", self.threshold), self.unit)
+        if (self.clear > self.threshold) if self.above else (self.clear < self.threshold):
+            raise ValueError(f"{self.name}: 'clear' must be on the other side of the threshold")
+        self.duration = float(spec.get("for", 0))
+        window = float(spec.get("window", 0))
+        self.window = RollingWindow(window, spec.get("aggregate", "mean")) if window > 0 else None
+        self.notify = bool(spec.get("notify", True))
+        self.hook = spec.get("hook")
+        # When the current breach began, and whether the rule has fired
+        self.since = None
+        self.firing = False
+        
+    def update(self, timestamp, value):
+        """Feed one sample; returns True if the rule fired, False if it cleared, None otherwise"""
+        if self.window is not None:
+            value = self.window.add(timestamp, value)
+        self.value = value
+        if self.firing:
+            if value < self.clear if self.above else value > self.clear:
+                self.firing = False
+                self.since = None
+                return False
+            return None
+        if value > self.threshold if self.above else value < self.threshold:
+            if self.since is None:
+                self.since = timestamp
+            if timestamp - self.since >= self.duration:
+                self.firing = True
+                return True
+        else:
+            self.since = None
+        return None
+        
+    def message(self, firing):
+        value = format_value(self.value, self.unit)
+        if not firing:
+            return f"{self.name}: back to normal ({self.metric} {value})"
+        side = "above" if self.above else "below"
+        return f"{self.name}: {self.metric} {value}, {side} {format_value(self.threshold, self.unit)}"
+
+class AlertEngine:
+    """Evaluates every rule against each snapshot and runs the actions of those that change state
+    
+    notify is called with each AlertEvent whose rule has notifications on
+    (desktop_notify by default); the GUI passes its own. Hooks and
+    notifiers are started without waiting for them and reaped on later
+    evaluations.
+    """
+    
+    def __init__(self, rules, notify=None):
+        self.rules = rules
+        self.notify = notify or desktop_notify
+        # Hook and notifier processes still running
+        self.children = []
+        # Metric groups the rules read, which the sampler must keep fresh
+        self.groups = frozenset(rule.group for rule in rules)
+        
+    @classmethod
+    def load(cls, path, notify=None):
+        """Engine for a rules file; raises OSError or ValueError"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        specs = data.get("rules") if isinstance(data, dict) else None
+        if not isinstance(specs, list):
+            raise ValueError("expected an object with a \"rules\" list")
+        return cls([AlertRule(spec) for spec in specs], notify)
+        
+    def evaluate(self, snapshot):
+        """Feed a snapshot to every rule; returns the AlertEvents of rules that fired or cleared"""
+        events = []
+        timestamp = snapshot.timestamp
+        for rule in self.rules:
+            value = rule.read(snapshot)
+            if value is None:
+                continue
+            changed = rule.update(timestamp, value)
+            if changed is not None:
+                events.append(AlertEvent(rule.name, changed, rule.metric, rule.value, timestamp,
+                                         rule.message(changed)))
+                self.act(rule, events[-1])
+        if self.children:
+            self.children = reap(self.children)
+        return events
+        
+    def act(self, rule, event):
+        if rule.notify:
+            process = self.notify(event)
+            if process is not None:
+                self.children.append(process)
+        if rule.hook:
+            env = dict(os.environ, OPENABOUT_ALERT=event.rule, OPENABOUT_ALERT_STATE="firing" if event.firing
+                       else "cleared", OPENABOUT_ALERT_METRIC=event.metric, OPENABOUT_ALERT_VALUE=str(event.value))
+            try:
+                self.children.append(subprocess.Popen(rule.hook, shell=True, env=env, stdin=subprocess.DEVNULL))
+            except OSError as e:
+                print(f"openabout: alert hook for {rule.name} failed: {e}", file=sys.stderr)
+    
+    def firing(self):
+        """Names of the rules currently firing"""
+        return [rule.name for rule in self.rules if rule.firing]
+
+def reap(processes):
+    """The processes that are still running"""
+    return [process for process in processes if process.poll() is None]
+
+def desktop_notify(event):
+    """Best-effort desktop notification outside Qt; falls back to stderr
+    
+    Returns the notifier process, which the caller reaps with reap(), or
+    None. Never waits for it, so it is safe to call from the GUI thread.
+    """
+    title = "OpenAbout alert" if event.firing else "OpenAbout alert cleared"
+    if sys.platform.startswith("linux") and shutil.which("notify-send"):
+        command = ["notify-send", "-u", "critical" if event.firing else "normal", title, event.message]
+    elif sys.platform == "darwin":
+        command = ["osascript", "-e", f"display notification {json.dumps(event.message)} with title "
+                                      f"{json.dumps(title)}"]
+    else:
+        command = None
+    if command is not None:
+        try:
+            return subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+        except OSError:
+            pass
+    print(f"openabout: {title}: {event.message}", file=sys.stderr)
+    return None
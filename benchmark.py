@@ -0,0 +1,510 @@
+"""Benchmarks for the collectors and for a full refresh tick
+
+    python benchmark.py                          every case, real and synthetic machine
+    python benchmark.py --env synthetic --cores 512 --mounts 1000
+    python benchmark.py --only disk --no-gui
+    python benchmark.py --output new.json
+    python benchmark.py --compare old.json new.json
+
+Each case is timed for up to --iterations calls (within a per-case time
+budget) and reports latency percentiles, the memory allocated per call
+(tracemalloc peak and retained bytes) and how many psutil calls one call
+makes. The synthetic machine replaces the psutil functions the collectors
+use with fakes describing hundreds of mounts, interfaces and cores. GUI
+cases run on the offscreen Qt platform.
+
+Results are written as JSON keyed by environment and case name, so the
+files of two versions can be compared with --compare.
+"""
+import atexit
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+import psutil
+import alerts
+import recording
+import sysinfo
+
+# Seconds one case may take before it stops early (after MIN_ITERATIONS)
+CASE_BUDGET = 2.0
+MIN_ITERATIONS = 5
+WARMUP = 3
+# psutil functions whose calls are counted per tick
+COUNTED_CALLS = ("cpu_times", "cpu_count", "cpu_freq", "virtual_memory", "swap_memory", "boot_time",
+                 "disk_partitions", "disk_usage", "disk_io_counters", "net_if_addrs", "net_io_counters",
+                 "process_iter")
+# Rules in the alerts_evaluate case
+ALERT_RULES = 500
+# Slower p50 than this fraction is flagged by --compare
+REGRESSION_THRESHOLD = 0.10
+
+CpuTimes = namedtuple("CpuTimes", ["user", "nice", "system", "idle", "iowait", "irq", "softirq",
+                                   "steal", "guest", "guest_nice"])
+CpuFreq = namedtuple("CpuFreq", ["current", "min", "max"])
+Partition = namedtuple("Partition", ["device", "mountpoint", "fstype", "opts"])
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free", "percent"])
+NetIo = namedtuple("NetIo", ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+                             "errin", "errout", "dropin", "dropout"])
+DiskIo = namedtuple("DiskIo", ["read_count", "write_count", "read_bytes", "write_bytes", "busy_time"])
+NicAddress = namedtuple("NicAddress", ["family", "address", "netmask", "broadcast", "ptp"])
+ProcTimes = namedtuple("ProcTimes", ["user", "system"])
+ProcMemoryInfo = namedtuple("ProcMemoryInfo", ["rss", "vms"])
+
+class SyntheticProcess:
+    """The part of psutil.Process the process tracker uses"""
+    
+    def __init__(self, pid, ticks):
+        self.pid = pid
+        self.ticks = ticks
+        self.info = {}
+        
+    def cpu_times(self):
+        return ProcTimes(self.ticks * (self.pid % 11) / 100, self.ticks / 100)
+        
+    def memory_info(self):
+        return ProcMemoryInfo(self.pid % 97 * 1024**2, self.pid % 89 * 4 * 1024**2)
+        
+    def as_dict(self, attrs, ad_value=None):
+        values = {"name": f"worker-{self.pid}", "username": "bench",
+                  "cmdline": [f"/usr/bin/worker-{self.pid}", "--serve"], "create_time": 1000.0 + self.pid,
+                  "cpu_times": self.cpu_times(), "memory_info": self.memory_info()}
+        return {name: values.get(name, ad_value) for name in attrs}
+
+class SyntheticMachine:
+    """Fake psutil answers for a large machine; CPU counters advance on every call"""
+    
+    def __init__(self, cores=256, mounts=500, interfaces=500, processes=1000, disks=300):
+        self.cores = cores
+        self.processes = processes
+        # Block devices: a third each of disks, loop devices and device-mapper volumes
+        self.disks = [(f"nvme{i // 3}n1", f"loop{i // 3}", f"dm-{i // 3}")[i % 3] for i in range(disks)]
+        self.ticks = 0
+        # "/" last, so finding the primary partition walks the whole table
+        self.partitions = [Partition(f"/dev/vd{i}", f"/mnt/volume{i}", "ext4", "rw") for i in range(mounts - 1)]
+        self.partitions.append(Partition("/dev/vda1", "/", "ext4", "rw"))
+        self.interfaces = {
+            f"eth{i}": [NicAddress(socket.AF_INET, f"10.{i // 250}.{i % 250}.2", "255.255.255.0", None, None),
+                        NicAddress(psutil.AF_LINK, f"02:00:00:00:{i // 256:02x}:{i % 256:02x}", None, None, None)]
+            for i in range(interfaces)
+        }
+        
+    def cpu_times(self, percpu=False):
+        self.ticks += 1
+        t = float(self.ticks)
+        cores = [CpuTimes(t * (1 + i % 7), 0.0, t, t * 3, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0) for i in range(self.cores)]
+        if percpu:
+            return cores
+        return CpuTimes(*(sum(values) for values in zip(*cores)))
+        
+    def cpu_count(self, logical=True):
+        return self.cores if logical else self.cores // 2
+        
+    def cpu_freq(self, percpu=False):
+        freqs = [CpuFreq(2000.0 + i % 13 * 100, 800.0, 3500.0) for i in range(self.cores)]
+        return freqs if percpu else CpuFreq(statistics.fmean(f.current for f in freqs), 800.0, 3500.0)
+        
+    def disk_partitions(self, all=False):
+        return list(self.partitions)
+        
+    def disk_usage(self, path):
+        return DiskUsage(500 * 1024**3, 200 * 1024**3, 300 * 1024**3, 40.0)
+        
+    def disk_io_counters(self, perdisk=False):
+        self.ticks += 1
+        t = self.ticks
+        return {name: DiskIo(t * 10 + i, t * 20, t * 40960 + i, t * 81920, t * 5) for i, name in enumerate(self.disks)}
+        
+    def net_if_addrs(self):
+        return dict(self.interfaces)
+        
+    def net_io_counters(self, pernic=False):
+        # One interface in ten carries traffic, the rest sit idle like container veths
+        self.ticks += 1
+        t = self.ticks
+        return {name: NetIo(t * 1500, t * 9000, t, t * 6, 0, 0, 0, 0) if i % 10 == 0 else NetIo(0, 0, 0, 0, 0, 0, 0, 0)
+                for i, name in enumerate(self.interfaces)}
+    
+    def process_iter(self, attrs=None, ad_value=None):
+        self.ticks += 1
+        for pid in range(1, self.processes + 1):
+            process = SyntheticProcess(pid, self.ticks)
+            process.info = process.as_dict(attrs or [], ad_value)
+            yield process
+
+@contextmanager
+def patched_psutil(machine):
+    """Route the psutil functions the collectors use to a SyntheticMachine"""
+    names = ("cpu_times", "cpu_count", "cpu_freq", "disk_partitions", "disk_usage", "disk_io_counters",
+             "net_if_addrs", "net_io_counters", "process_iter")
+    saved = {name: getattr(psutil, name) for name in names}
+    # The synthetic devices have no /sys/block entries
+    whole_disks_only = sysinfo.DiskIoTracker.WHOLE_DISKS_ONLY
+    sysinfo.DiskIoTracker.WHOLE_DISKS_ONLY = False
+    # Collectors created inside read through psutil, not the /proc fast path
+    saved_backend = os.environ.get("OPENABOUT_BACKEND")
+    os.environ["OPENABOUT_BACKEND"] = "psutil"
+    try:
+        for name in names:
+            setattr(psutil, name, getattr(machine, name))
+        yield machine
+    finally:
+        for name, function in saved.items():
+            setattr(psutil, name, function)
+        sysinfo.DiskIoTracker.WHOLE_DISKS_ONLY = whole_disks_only
+        if saved_backend is None:
+            del os.environ["OPENABOUT_BACKEND"]
+        else:
+            os.environ["OPENABOUT_BACKEND"] = saved_backend
+
+@contextmanager
+def counted_psutil_calls():
+    """Count calls to the psutil functions in COUNTED_CALLS; yields the counts dict"""
+    counts = dict.fromkeys(COUNTED_CALLS, 0)
+    saved = {name: getattr(psutil, name) for name in COUNTED_CALLS}
+    
+    def wrap(name, function):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return function(*args, **kwargs)
+        return counted
+        
+    try:
+        for name, function in saved.items():
+            setattr(psutil, name, wrap(name, function))
+        yield counts
+    finally:
+        for name, function in saved.items():
+            setattr(psutil, name, function)
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+def measure(function, iterations):
+    """Latency percentiles, allocations and psutil calls for one case"""
+    for _ in range(WARMUP):
+        function()
+        
+    durations = []
+    deadline = time.perf_counter() + CASE_BUDGET
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        function()
+        durations.append(time.perf_counter_ns() - start)
+        if i + 1 >= MIN_ITERATIONS and time.perf_counter() > deadline:
+            break
+    durations.sort()
+    
+    # Allocations and call counts in a separate pass; both add overhead
+    tracemalloc.start()
+    with counted_psutil_calls() as counts:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        function()
+        after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    def ms(ns):
+        return round(ns / 1e6, 4)
+        
+    return {
+        "iterations": len(durations),
+        "mean_ms": ms(statistics.fmean(durations)),
+        "p50_ms": ms(percentile(durations, 50)),
+        "p90_ms": ms(percentile(durations, 90)),
+        "p99_ms": ms(percentile(durations, 99)),
+        "max_ms": ms(durations[-1]),
+        "alloc_peak_bytes": peak - before,
+        "alloc_retained_bytes": after - before,
+        "psutil_calls": {name: count for name, count in counts.items() if count},
+    }
+
+def collector_cases():
+    """(name, callable) for the Qt-free collectors"""
+    tracker = sysinfo.CpuUsageTracker()
+    partition_cache = sysinfo.PrimaryPartitionCache()
+    resolver = sysinfo.NetworkIdentityResolver()
+    wmi_provider = sysinfo.WmiProvider()
+    collector = sysinfo.Collector()
+    prober = sysinfo.MountUsageProber()
+    processes = sysinfo.ProcessTracker()
+    backend = sysinfo.select_backend()
+    # Read the files on every call rather than sharing one read per tick
+    backend.REUSE_WINDOW = 0
+    fast_tracker = sysinfo.CpuUsageTracker(backend)
+    disk_io = sysinfo.DiskIoTracker()
+    fast_disk_io = sysinfo.DiskIoTracker(backend)
+    net_io = sysinfo.NetIoTracker()
+    fast_net_io = sysinfo.NetIoTracker(backend)
+    
+    def rescan_disk():
+        partition_cache.invalidate()
+        return sysinfo.collect_disk(partition_cache)
+        
+    def full_snapshot():
+        collector.scheduler.force()
+        return collector.snapshot()
+        
+    session_dir = tempfile.mkdtemp(prefix="openabout-bench-")
+    atexit.register(shutil.rmtree, session_dir, True)
+    recorded = collector.snapshot()
+    session = recording.SessionWriter(os.path.join(session_dir, "bench.oas"),
+                                      sysinfo.collect_static_info(wmi_provider))
+    
+    def all_mounts():
+        return prober.usage_all([p.mountpoint for p in psutil.disk_partitions()], 3.0)
+        
+    # Every metric, with and without windows; each call is one tick two seconds after the last
+    metrics = list(alerts.METRICS)
+    engine = alerts.AlertEngine([alerts.AlertRule({
+        "metric": metrics[i % len(metrics)], "above": i % 100, "for": i % 7 * 10, "window": i % 5 * 30,
+        "aggregate": ("mean", "min", "max")[i % 3], "notify": False}) for i in range(ALERT_RULES)])
+    ticks = iter(range(10**9))
+    
+    def alerts_evaluate():
+        return engine.evaluate(recorded._replace(timestamp=next(ticks) * 2.0))
+        
+    cases = [
+        ("cpu_usage", tracker.sample),
+        ("cpu_freq", sysinfo.read_cpu_freq),
+        ("memory", lambda: psutil.virtual_memory()),
+        ("swap", lambda: psutil.swap_memory()),
+        ("disk_io", disk_io.sample),
+        ("primary_disk", lambda: sysinfo.collect_disk(partition_cache)),
+        ("primary_disk_rescan", rescan_disk),
+        ("network_identity", resolver.get),
+        ("net_io", net_io.sample),
+        ("network_identity_lookup", resolver.resolve),
+        ("static_info", lambda: sysinfo.collect_static_info(wmi_provider)),
+        ("static_facts_probe", lambda: sysinfo.probe_static_facts(platform.system(), wmi_provider)),
+        ("snapshot_tick", full_snapshot),
+        ("all_mounts_usage", all_mounts),
+        ("top_processes", processes.sample),
+        ("session_append", lambda: session.append(recorded)),
+        ("alerts_evaluate", alerts_evaluate),
+    ]
+    if backend is not sysinfo.PSUTIL_BACKEND:
+        # The same counters through the fast path, next to their psutil cases
+        cases += [
+            (f"cpu_usage_{backend.name}", fast_tracker.sample),
+            (f"cpu_freq_{backend.name}", lambda: sysinfo.read_cpu_freq(backend)),
+            (f"memory_{backend.name}", backend.virtual_memory),
+            (f"swap_{backend.name}", backend.swap_memory),
+            (f"disk_io_{backend.name}", fast_disk_io.sample),
+            (f"net_io_{backend.name}", fast_net_io.sample),
+        ]
+    return cases
+
+def gui_cases(app, painted=False):
+    """(name, callable) for the UI-apply steps of a visible OpenAbout window
+    
+    With painted the window uses the MetricsSurface General tab, and only
+    the per-tick cases are returned, suffixed _painted.
+    """
+    import main
+    
+    window = main.OpenAbout(painted=painted)
+    window.update_timer.timeout.disconnect(window.update_dynamic_info)
+    window.show()
+    window.tab_widget.setCurrentIndex(1)
+    window.tab_widget.setCurrentIndex(0)
+    deadline = time.monotonic() + 10
+    while (window.static_info is None or window.sample_pending) and time.monotonic() < deadline:
+        app.processEvents()
+    window.update_timer.stop()
+    # Every group visible, as with both tabs having been on screen
+    window.visible_groups = main.GENERAL_TAB_GROUPS | main.COMPUTER_TAB_GROUPS
+    
+    collector = window.sampler.collector
+    static_info = collector.static_info()
+    snapshots = []
+    for _ in range(3):
+        collector.scheduler.force()
+        snapshots.append(collector.snapshot())
+    # The first has no disk or network rows (there were no earlier counters to take rates from)
+    del snapshots[0]
+    # Alternate between two snapshots so the view model has something to write
+    state = {"tick": 0}
+    
+    def next_snapshot():
+        state["tick"] += 1
+        return snapshots[state["tick"] % 2]
+        
+    def apply_snapshot():
+        window.sample_pending = True
+        window.apply_snapshot(next_snapshot())
+        
+    def disk_info():
+        window.get_disk_info(next_snapshot().disk)
+        window.view.commit()
+        
+    def network_dynamic():
+        window.update_network_dynamic(next_snapshot())
+        window.view.commit()
+        
+    def all_disks():
+        if window.disk_prober is None:
+            window.disk_prober = main.DiskUsageProber()
+        dialog = main.AllDisksDialog(window, window.disk_prober, window.format_bytes)
+        deadline = time.monotonic() + main.AllDisksDialog.TIMEOUT + 1
+        while dialog.waiting and time.monotonic() < deadline:
+            app.processEvents()
+        dialog.done(0)
+        dialog.deleteLater()
+        
+    def full_tick():
+        collector.scheduler.force()
+        window.sample_pending = True
+        window.apply_snapshot(collector.snapshot())
+        window.repaint()
+        
+    def render_tick():
+        # What the UI does with a tick: apply it, then paint only what the tick marked as changed
+        apply_snapshot()
+        app.processEvents()
+        
+    if painted:
+        return [
+            ("gui_apply_snapshot_painted", apply_snapshot),
+            ("gui_disk_info_painted", disk_info),
+            ("gui_render_tick_painted", render_tick),
+            ("gui_full_tick_painted", full_tick),
+        ], window.close
+    return [
+        ("gui_apply_snapshot", apply_snapshot),
+        ("gui_render_tick", render_tick),
+        ("gui_apply_static_info", lambda: window.apply_static_info(static_info)),
+        ("gui_cpu_info", lambda: window.get_cpu_info(static_info)),
+        ("gui_disk_info", disk_info),
+        ("gui_network_dynamic", network_dynamic),
+        ("gui_all_disks", all_disks),
+        ("gui_full_tick", full_tick),
+    ], window.close
+
+def run_cases(cases, iterations, only):
+    results = {}
+    for name, function in cases:
+        if only and only not in name:
+            continue
+        try:
+            results[name] = measure(function, iterations)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+        print_result(name, results[name])
+    return results
+
+def run_environment(args, app):
+    results = run_cases(collector_cases(), args.iterations, args.only)
+    if app is not None:
+        for painted in (False, True):
+            cases, close = gui_cases(app, painted)
+            try:
+                results.update(run_cases(cases, args.iterations, args.only))
+            finally:
+                close()
+    return results
+
+def print_result(name, result):
+    if "error" in result:
+        print(f"  {name:26} {result['error']}")
+        return
+    calls = sum(result["psutil_calls"].values())
+    print(f"  {name:26} p50 {result['p50_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms  "
+          f"alloc {result['alloc_peak_bytes'] / 1024:8.1f} KiB  psutil calls {calls}")
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def compare(old_path, new_path):
+    """Print the p50 change of every case present in both files"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old['meta'].get('revision') or old_path} -> {new['meta'].get('revision') or new_path}")
+    regressions = 0
+    for env, new_results in new["results"].items():
+        old_results = old["results"].get(env, {})
+        print(f"[{env}]")
+        for name, result in new_results.items():
+            before = old_results.get(name)
+            if not before or "error" in before or "error" in result:
+                continue
+            ratio = result["p50_ms"] / before["p50_ms"] if before["p50_ms"] else 1.0
+            flag = ""
+            if ratio > 1 + REGRESSION_THRESHOLD:
+                flag = "  SLOWER"
+                regressions += 1
+            elif ratio < 1 - REGRESSION_THRESHOLD:
+                flag = "  faster"
+            print(f"  {name:26} p50 {before['p50_ms']:9.3f} -> {result['p50_ms']:9.3f} ms ({ratio:5.2f}x)  "
+                  f"alloc {before['alloc_peak_bytes']} -> {result['alloc_peak_bytes']} B{flag}")
+    return 1 if regressions else 0
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark OpenAbout's collectors and refresh tick.")
+    parser.add_argument("--env", choices=("real", "synthetic", "all"), default="all")
+    parser.add_argument("--iterations", type=int, default=200, help="calls per case (default 200)")
+    parser.add_argument("--only", metavar="TEXT", help="only cases whose name contains TEXT")
+    parser.add_argument("--no-gui", action="store_true", help="skip the Qt cases")
+    parser.add_argument("--cores", type=int, default=256, help="synthetic logical CPUs (default 256)")
+    parser.add_argument("--mounts", type=int, default=500, help="synthetic mounts (default 500)")
+    parser.add_argument("--interfaces", type=int, default=500, help="synthetic interfaces (default 500)")
+    parser.add_argument("--processes", type=int, default=1000, help="synthetic processes (default 1000)")
+    parser.add_argument("--disks", type=int, default=300, help="synthetic block devices (default 300)")
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args(argv)
+    if args.compare:
+        return compare(*args.compare)
+        
+    # Keep the static facts the runs cache (fake ones for the synthetic machine) out of the user's cache
+    cache_dir = tempfile.TemporaryDirectory(prefix="openabout-bench-cache-")
+    atexit.register(cache_dir.cleanup)
+    sysinfo.static_cache_path = lambda: os.path.join(cache_dir.name, "static.json")
+    
+    app = None
+    if not args.no_gui:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+        
+    results = {}
+    if args.env in ("real", "all"):
+        print("[real]")
+        results["real"] = run_environment(args, app)
+    if args.env in ("synthetic", "all"):
+        print(f"[synthetic: {args.cores} cores, {args.mounts} mounts, {args.interfaces} interfaces, "
+              f"{args.processes} processes, {args.disks} block devices]")
+        with patched_psutil(SyntheticMachine(args.cores, args.mounts, args.interfaces, args.processes, args.disks)):
+            results["synthetic"] = run_environment(args, app)
+            
+    if args.output:
+        meta = {
+            "revision": git_revision(),
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "logical_cpus": os.cpu_count(),
+            "synthetic": {"cores": args.cores, "mounts": args.mounts, "interfaces": args.interfaces},
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,197 @@
+"""Headless OpenAbout: print the system snapshot without starting the GUI
+
+    python main.py --once             human readable, one snapshot (default)
+    python main.py --json             the same as a JSON object
+    python main.py --json --watch 5   one JSON object per line every 5 seconds
+    python main.py --exporter 9101    Prometheus metrics (see exporter.py)
+    python main.py --agent HOST:PORT  push snapshots to a fleet aggregator (see fleet.py)
+    python main.py --record FILE      append snapshots to a session file (see recording.py)
+    python main.py --watch 10 --alerts FILE   also evaluate alert rules (see alerts.py)
+
+Never imports PySide6, so it needs no display and starts quickly enough to
+be run from cron and monitoring scripts.
+"""
+import json
+import sys
+import time
+from sysinfo import ALL_GROUPS, Collector, format_bytes
+
+HEADLESS_FLAGS = ("--json", "--once", "--watch", "--exporter", "--agent", "--record")
+
+def is_headless(argv):
+    """True if the command line asks for a headless mode"""
+    return any(arg.split("=", 1)[0] in HEADLESS_FLAGS for arg in argv)
+
+def parse_args(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py",
+                                     description="Print OpenAbout system information without the GUI.")
+    parser.add_argument("--json", action="store_true",
+                        help="print JSON (one object per line with --watch)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--once", action="store_true",
+                      help="print one snapshot and exit (default)")
+    mode.add_argument("--watch", type=float, metavar="N",
+                      help="print a snapshot every N seconds until interrupted")
+    mode.add_argument("--exporter", metavar="[HOST:]PORT",
+                      help="serve Prometheus metrics over HTTP (default host 127.0.0.1)")
+    mode.add_argument("--agent", metavar="[HOST:]PORT",
+                      help="push snapshots to the fleet aggregator at HOST:PORT")
+    mode.add_argument("--record", metavar="FILE",
+                      help="append a snapshot every --interval seconds to a session file")
+    parser.add_argument("--alerts", metavar="FILE",
+                        help="evaluate the alert rules in FILE against every --watch snapshot")
+    parser.add_argument("--name", help="host name the agent reports (default: this host's name)")
+    parser.add_argument("--interval", type=float, default=15.0, metavar="S",
+                        help="seconds between exporter, agent or recording collections (default 15)")
+    parser.add_argument("--cpu-window", type=float, default=0.2, metavar="S",
+                        help="seconds to measure CPU usage over for the first snapshot "
+                             "(0 = average since boot; default 0.2)")
+    args = parser.parse_args(argv)
+    if args.watch is not None and args.watch <= 0:
+        parser.error("--watch needs a positive number of seconds")
+    if args.interval <= 0:
+        parser.error("--interval needs a positive number of seconds")
+    if args.alerts and (args.exporter or args.agent or args.record):
+        parser.error("--alerts only works with --once and --watch")
+    if args.alerts:
+        from alerts import AlertEngine
+        try:
+            args.alerts = AlertEngine.load(args.alerts)
+        except (OSError, ValueError) as e:
+            parser.error(f"--alerts {args.alerts}: {e}")
+    return args
+
+def build_report(static, snapshot):
+    """Static info and a snapshot combined into one plain, JSON-serialisable dict"""
+    disk = snapshot.disk
+    return {
+        "timestamp": snapshot.timestamp,
+        "os": {
+            "system": static.system,
+            "release": static.release,
+            "version": static.version,
+        },
+        "cpu": {
+            "brand": static.cpu_brand,
+            "physical_cores": static.physical_cores,
+            "logical_cores": static.logical_cores,
+            "percent": snapshot.cpu_percent,
+            "per_core": list(snapshot.cpu_per_core),
+            "freq_mhz": snapshot.cpu_freq,
+            "per_core_freq_mhz": list(snapshot.cpu_freq_per_core),
+        },
+        "memory": {
+            "total": static.memory_total,
+            "available": snapshot.mem_available,
+            "cached": snapshot.mem_cached,
+            "percent": snapshot.mem_percent,
+            "swap_total": snapshot.swap_total,
+            "swap_used": snapshot.swap_used,
+        },
+        "disk": disk._asdict() if disk else None,
+        "disk_io": [row._asdict() for row in snapshot.disk_io],
+        "uptime": {
+            "boot_time": snapshot.boot_time,
+            "seconds": int(snapshot.timestamp - snapshot.boot_time) if snapshot.boot_time else None,
+        },
+        "network": {
+            "hostname": static.hostname,
+            "domain": static.domain,
+            "interface": snapshot.interface,
+            "ip_address": snapshot.ip_address,
+            "mac_address": snapshot.mac_address,
+            "interface_count": static.interface_count,
+            "activity": [row._asdict() for row in snapshot.net_io],
+        },
+    }
+
+def format_report(report):
+    """Human readable rendering of build_report()"""
+    from datetime import datetime, timedelta
+    os_info, cpu, mem, disk, uptime, net = (report[key] for key in
+                                            ("os", "cpu", "memory", "disk", "uptime", "network"))
+    lines = [
+        f"Operating system: {os_info['system']} {os_info['release']} ({os_info['version']})",
+        f"Processor:        {cpu['brand']} ({cpu['physical_cores']} physical, {cpu['logical_cores']} logical)",
+        f"CPU usage:        {cpu['percent']:.1f}%"
+        + (f" at {cpu['freq_mhz']:.0f} MHz" if cpu['freq_mhz'] else ""),
+        f"Memory:           {format_bytes(mem['total'])} total, {format_bytes(mem['available'])} available "
+        f"({mem['percent']:.1f}% used)",
+        f"Swap:             {format_bytes(mem['swap_total'])} total",
+    ]
+    if disk:
+        lines.append(f"Disk:             {disk['device']} ({disk['mountpoint']}) {disk['fstype']}, "
+                     f"{format_bytes(disk['total'])} total, {format_bytes(disk['free'])} free "
+                     f"({disk['percent']:.1f}% used)")
+    else:
+        lines.append("Disk:             Unknown")
+    for io in report['disk_io']:
+        lines.append(f"Disk activity:    {io['device']} read {format_bytes(io['read_bytes'])}/s "
+                     f"({io['reads']:.1f} IOPS), write {format_bytes(io['write_bytes'])}/s ({io['writes']:.1f} IOPS)"
+                     + (f", {io['busy_percent']:.0f}% busy" if io['busy_percent'] is not None else ""))
+    if uptime['boot_time']:
+        boot = datetime.fromtimestamp(uptime['boot_time']).strftime("%Y-%m-%d %H:%M:%S")
+        lines.append(f"Uptime:           {timedelta(seconds=uptime['seconds'])} (booted {boot})")
+    else:
+        lines.append("Uptime:           Unknown")
+    lines.append(f"Network:          {net['hostname'] or 'Unknown'}, {net['ip_address'] or 'no IP'}"
+                 + (f" on {net['interface']}" if net['interface'] else "")
+                 + f", MAC {net['mac_address'] or 'Unknown'}")
+    for io in net['activity']:
+        lines.append(f"Network activity: {io['interface']} in {format_bytes(io['received'])}/s "
+                     f"({io['packets_received']:.1f} pkt/s), out {format_bytes(io['sent'])}/s "
+                     f"({io['packets_sent']:.1f} pkt/s), {io['errors']:.1f} errors/s, {io['drops']:.1f} drops/s")
+    return "\n".join(lines)
+
+def main(argv):
+    args = parse_args(argv)
+    if args.exporter:
+        import exporter
+        return exporter.serve(args.exporter, args.interval)
+    if args.agent:
+        import fleet
+        return fleet.run_agent(args.agent, args.interval, args.name)
+    if args.record:
+        import recording
+        return recording.record(args.record, args.interval)
+        
+    collector = Collector()
+    static = collector.static_info()
+    
+    # CPU usage and disk and network activity are deltas; prime them so the first reading covers a short window
+    if args.cpu_window > 0:
+        collector.cpu_tracker.sample()
+        collector.disk_io_tracker.sample()
+        collector.net_io_tracker.sample()
+        time.sleep(args.cpu_window)
+        
+    try:
+        next_at = time.monotonic()
+        while True:
+            # The caller picked the cadence, so every group is refreshed each time
+            collector.scheduler.force()
+            # Alert rules may read groups a report leaves out (processes)
+            snapshot = collector.snapshot(ALL_GROUPS | args.alerts.groups if args.alerts else ALL_GROUPS)
+            if args.alerts:
+                args.alerts.evaluate(snapshot)
+            report = build_report(static, snapshot)
+            if args.json:
+                print(json.dumps(report), flush=True)
+            else:
+                print(format_report(report), flush=True)
+            if args.watch is None:
+                return 0
+            if not args.json:
+                print(flush=True)
+            next_at += args.watch
+            time.sleep(max(0.0, next_at - time.monotonic()))
+    except KeyboardInterrupt:
+        return 0
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head)
+        sys.stderr.close()
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
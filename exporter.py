@@ -0,0 +1,263 @@
+"""Prometheus/OpenMetrics text exporter for OpenAbout
+
+    python main.py --exporter 9101                 serve on 127.0.0.1:9101
+    python main.py --exporter 0.0.0.0:9101 --interval 30
+
+A background thread collects a snapshot every --interval seconds and renders
+it once into a cached payload; scrapes only ever send that payload, so any
+number of concurrent scrapers cause no extra psutil calls.
+
+    python exporter.py --load-test
+
+starts an exporter on a free local port and hammers it with concurrent
+keep-alive clients, reporting throughput, latency and collector calls.
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import psutil
+from sysinfo import Collector, MountUsageProber, parse_address
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds to wait for per-mount usage before reporting a mount as not responding
+MOUNT_TIMEOUT = 2.0
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class MetricsWriter:
+    """Accumulates metric families in text exposition format"""
+    
+    def __init__(self):
+        self.lines = []
+        
+    def family(self, name, help_text, samples, kind="gauge"):
+        """Add one family; samples is a list of (labels dict or None, value)"""
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            if labels:
+                label_text = ",".join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+                self.lines.append(f"{name}{{{label_text}}} {value}")
+            else:
+                self.lines.append(f"{name} {value}")
+    
+    def render(self):
+        return ("\n".join(self.lines) + "\n").encode("utf-8")
+
+def render_metrics(static, snapshot, mounts, collection_seconds):
+    """Render one collection as exposition-format bytes
+    
+    mounts is a list of (partition, usage or None if it did not answer in time).
+    """
+    w = MetricsWriter()
+    w.family("openabout_cpu_usage_percent", "Total CPU utilisation since the previous collection.",
+             [(None, snapshot.cpu_percent)])
+    w.family("openabout_cpu_core_usage_percent", "Per-core CPU utilisation since the previous collection.",
+             [({"core": core}, percent) for core, percent in enumerate(snapshot.cpu_per_core)])
+    w.family("openabout_cpu_frequency_mhz", "Current CPU frequency.", [(None, snapshot.cpu_freq)])
+    w.family("openabout_cpu_core_frequency_mhz", "Current frequency of each core.",
+             [({"core": core}, mhz) for core, mhz in enumerate(snapshot.cpu_freq_per_core)])
+    w.family("openabout_cpu_cores", "Number of CPU cores.",
+             [({"kind": "physical"}, static.physical_cores), ({"kind": "logical"}, static.logical_cores)])
+    w.family("openabout_memory_total_bytes", "Total physical memory.", [(None, static.memory_total)])
+    w.family("openabout_memory_available_bytes", "Memory available without swapping.",
+             [(None, snapshot.mem_available)])
+    w.family("openabout_memory_cached_bytes", "Memory used by the page cache.", [(None, snapshot.mem_cached)])
+    w.family("openabout_memory_used_percent", "Memory in use.", [(None, snapshot.mem_percent)])
+    w.family("openabout_swap_total_bytes", "Total swap space.", [(None, snapshot.swap_total)])
+    w.family("openabout_swap_used_bytes", "Swap space in use.", [(None, snapshot.swap_used)])
+    
+    size, free, used, responding = [], [], [], []
+    for partition, usage in mounts:
+        labels = {"device": partition.device, "mountpoint": partition.mountpoint, "fstype": partition.fstype}
+        responding.append((labels, 0 if usage is None else 1))
+        if usage is not None:
+            size.append((labels, usage.total))
+            free.append((labels, usage.free))
+            used.append((labels, usage.used))
+    w.family("openabout_filesystem_size_bytes", "Filesystem size.", size)
+    w.family("openabout_filesystem_free_bytes", "Filesystem free space.", free)
+    w.family("openabout_filesystem_used_bytes", "Filesystem used space.", used)
+    w.family("openabout_filesystem_responding", "1 if the usage probe answered in time, 0 if it hung or failed.",
+             responding)
+    
+    if snapshot.boot_time:
+        w.family("openabout_boot_time_seconds", "System boot time, seconds since the epoch.",
+                 [(None, snapshot.boot_time)])
+        w.family("openabout_uptime_seconds", "Seconds since boot.",
+                 [(None, round(snapshot.timestamp - snapshot.boot_time, 3))])
+    w.family("openabout_network_info", "Identity of the primary network interface.",
+             [({"hostname": static.hostname or "", "domain": static.domain,
+                "interface": snapshot.interface or "", "ip_address": snapshot.ip_address or "",
+                "mac_address": snapshot.mac_address or ""}, 1)])
+    w.family("openabout_collection_duration_seconds", "Time taken by the last collection.",
+             [(None, round(collection_seconds, 6))])
+    w.family("openabout_collection_timestamp_seconds", "When the served snapshot was collected.",
+             [(None, snapshot.timestamp)])
+    return w.render()
+
+class MetricsExporter:
+    """Collects on its own schedule and keeps the rendered payload for scrapers"""
+    
+    def __init__(self, interval=15.0):
+        self.interval = interval
+        self.collector = Collector()
+        self.prober = MountUsageProber()
+        self.static = None
+        self.payload = b""
+        self.collections = 0
+        self.ready = threading.Event()
+        self.stopping = threading.Event()
+        
+    def collect(self):
+        """Collect one snapshot and replace the cached payload"""
+        start = time.perf_counter()
+        if self.static is None:
+            self.static = self.collector.static_info()
+        self.collector.scheduler.force()
+        snapshot = self.collector.snapshot()
+        try:
+            partitions = psutil.disk_partitions()
+        except Exception:
+            partitions = []
+        usages = self.prober.usage_all([p.mountpoint for p in partitions], MOUNT_TIMEOUT)
+        mounts = [(p, usages.get(p.mountpoint)) for p in partitions]
+        # A single reference swap: scrapers see either the old or the new payload
+        self.payload = render_metrics(self.static, snapshot, mounts, time.perf_counter() - start)
+        self.collections += 1
+        self.ready.set()
+        
+    def run(self):
+        """Collection loop; runs until stop()"""
+        next_at = time.monotonic()
+        while not self.stopping.is_set():
+            try:
+                self.collect()
+            except Exception as e:
+                print(f"openabout exporter: collection failed: {e}", file=sys.stderr)
+            next_at += self.interval
+            self.stopping.wait(max(0.0, next_at - time.monotonic()))
+            
+    def start(self):
+        threading.Thread(target=self.run, name="exporter-collector", daemon=True).start()
+        
+    def stop(self):
+        self.stopping.set()
+        
+    def make_server(self, host, port):
+        """HTTP server answering /metrics from the cached payload"""
+        exporter = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; don't let Nagle delay the body
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                # Until the first collection succeeds, answer 503 at once: waiting for it could
+                # outlast the scraper's timeout, and a hung collection would pile up threads
+                if not exporter.ready.is_set():
+                    self.send_error(503, "No metrics collected yet")
+                    return
+                payload = exporter.payload
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                
+            def log_message(self, format, *args):
+                pass
+                
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        return server
+
+def serve(address, interval):
+    host, port = parse_address(address)
+    exporter = MetricsExporter(interval)
+    exporter.start()
+    server = exporter.make_server(host, port)
+    print(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.stop()
+        server.server_close()
+    return 0
+
+def load_test(clients=32, requests=500, interval=1.0):
+    """Scrape a local exporter from many keep-alive clients; print throughput and latency"""
+    import http.client
+    exporter = MetricsExporter(interval)
+    exporter.start()
+    server = exporter.make_server("127.0.0.1", 0)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    exporter.ready.wait()
+    collections_before = exporter.collections
+    
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        mine = []
+        try:
+            for _ in range(requests):
+                start = time.perf_counter()
+                conn.request("GET", "/metrics")
+                response = conn.getresponse()
+                body = response.read()
+                if response.status != 200 or not body:
+                    raise RuntimeError(f"bad response {response.status}")
+                mine.append(time.perf_counter() - start)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+        finally:
+            conn.close()
+            with lock:
+                latencies.extend(mine)
+    
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    collections = exporter.collections - collections_before
+    server.shutdown()
+    exporter.stop()
+    
+    latencies.sort()
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000 if latencies else 0.0
+    print(f"{len(latencies)} scrapes from {clients} clients in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:.0f} req/s), {len(errors)} errors")
+    print(f"latency p50 {pct(50):.2f} ms, p90 {pct(90):.2f} ms, p99 {pct(99):.2f} ms")
+    print(f"collections during the test: {collections} (every {interval:g} s, independent of scrapes)")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="OpenAbout metrics exporter load test.")
+    parser.add_argument("--load-test", action="store_true", help="run the local load test")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500, help="requests per client")
+    args = parser.parse_args()
+    if not args.load_test:
+        parser.error("use 'main.py --exporter PORT' to serve metrics, or --load-test")
+    sys.exit(load_test(args.clients, args.requests))
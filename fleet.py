@@ -0,0 +1,279 @@
+"""Fleet mode: agents push compact snapshots to one aggregator over TCP
+
+    python main.py --agent collector.example:7878             push every 15 s
+    python main.py --agent 127.0.0.1:7878 --interval 2 --name web-1
+
+The protocol is one JSON object per line. Right after connecting an agent
+sends a full record ({"f": {...}}); after that only the fields that changed
+since the previous message ({"d": {...}}), so an idle host costs a few bytes
+per interval. The aggregator keeps the merged record per host and is built
+on asyncio, so one thread follows hundreds of connections.
+
+    python fleet.py --local-test 20
+
+starts an aggregator and 20 local agent processes (distinct --name values)
+and reports what the aggregator received and what it cost.
+"""
+import asyncio
+import json
+import socket
+import sys
+import threading
+import time
+from sysinfo import Collector, parse_address
+
+DEFAULT_PORT = 7878
+# The aggregator listens on loopback only unless given another address
+DEFAULT_HOST = "127.0.0.1"
+# Longest line the aggregator accepts; anything larger drops the connection
+MAX_MESSAGE = 64 * 1024
+# Longest wait between reconnection attempts
+MAX_BACKOFF = 60.0
+
+def fleet_record(static, snapshot, name, interval):
+    """The flat, compact record an agent reports; rounded so noise doesn't defeat the delta"""
+    disk = snapshot.disk
+    return {
+        "host": name or static.hostname or socket.gethostname(),
+        "os": f"{static.system} {static.release}",
+        "cpu_brand": static.cpu_brand,
+        "cores": static.logical_cores,
+        "mem_total": static.memory_total,
+        "interval": interval,
+        "boot_time": int(snapshot.boot_time) if snapshot.boot_time else None,
+        "ip": snapshot.ip_address,
+        "cpu": round(snapshot.cpu_percent, 1),
+        "mem": round(snapshot.mem_percent, 1),
+        "disk": round(disk.percent, 1) if disk else None,
+        "disk_free": disk.free if disk else None,
+    }
+
+# The only fields the aggregator takes from an agent, and their types; anything else
+# (online, address, last_seen...) is the aggregator's own
+NUMBER = (int, float)
+RECORD_FIELDS = {
+    "host": str, "os": str, "cpu_brand": str, "ip": str,
+    "cores": NUMBER, "mem_total": NUMBER, "interval": NUMBER, "boot_time": NUMBER,
+    "cpu": NUMBER, "mem": NUMBER, "disk": NUMBER, "disk_free": NUMBER,
+}
+
+def accepted_fields(fields):
+    """The known fields of a message's field dict whose values are of the right type (or null)"""
+    return {key: value for key, value in fields.items()
+            if key in RECORD_FIELDS and (value is None or isinstance(value, RECORD_FIELDS[key]))
+            and not isinstance(value, bool)}
+
+def encode_message(previous, record):
+    """One protocol line: the full record if previous is None, else the changed fields"""
+    if previous is None:
+        message = {"f": record}
+    else:
+        message = {"d": {key: value for key, value in record.items() if previous.get(key) != value}}
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+class FleetAgent:
+    """Collects on a fixed cadence and pushes deltas, reconnecting with backoff"""
+    
+    def __init__(self, address, interval=15.0, name=None):
+        self.host, self.port = parse_address(address)
+        self.interval = interval
+        self.name = name
+        self.collector = Collector()
+        
+    def run(self):
+        static = self.collector.static_info()
+        backoff = 1.0
+        while True:
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=10)
+            except OSError as e:
+                print(f"openabout agent: {self.host}:{self.port}: {e}; retrying in {backoff:g} s", file=sys.stderr)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                continue
+            backoff = 1.0
+            with sock:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                previous = None
+                next_at = time.monotonic()
+                try:
+                    while True:
+                        # The agent picks the cadence, so every group is refreshed each time
+                        self.collector.scheduler.force()
+                        record = fleet_record(static, self.collector.snapshot(), self.name, self.interval)
+                        sock.sendall(encode_message(previous, record))
+                        previous = record
+                        next_at += self.interval
+                        time.sleep(max(0.0, next_at - time.monotonic()))
+                except OSError as e:
+                    print(f"openabout agent: connection lost: {e}", file=sys.stderr)
+
+def run_agent(address, interval, name=None):
+    try:
+        FleetAgent(address, interval, name).run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+class FleetAggregator:
+    """asyncio server merging agent messages into one record per host
+    
+    The event loop runs on its own thread; readers on other threads (the GUI
+    timer, the local test) call take_changes() to get the hosts updated since
+    their last call, so they never walk the whole fleet per tick.
+    """
+    
+    def __init__(self):
+        self.hosts = {}
+        # host -> the writer of its current connection, so a stale one can't mark it offline
+        self.connections = {}
+        self.changed = set()
+        self.lock = threading.Lock()
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.address = None
+        self.messages = 0
+        self.bytes_received = 0
+        self.full_messages = 0
+        self.full_bytes = 0
+        
+    async def handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        address = peer[0] if peer else ""
+        host = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                now = time.time()
+                with self.lock:
+                    self.messages += 1
+                    self.bytes_received += len(line)
+                    if "f" in message:
+                        self.full_messages += 1
+                        self.full_bytes += len(line)
+                        fields = accepted_fields(message["f"])
+                        name = str(fields.get("host") or address)
+                        if host is not None and name != host:
+                            # The agent was renamed: its old name has no connection any more
+                            self.disconnect(host, writer)
+                        host = name
+                        self.hosts[host] = dict(fields, address=address, online=True)
+                        self.connections[host] = writer
+                    elif host is None:
+                        # A delta before any full record can't be applied
+                        break
+                    else:
+                        self.hosts[host].update(accepted_fields(message.get("d", {})))
+                    self.hosts[host]["last_seen"] = now
+                    self.changed.add(host)
+        except (ValueError, TypeError, AttributeError, ConnectionError):
+            # Malformed or oversized line, or the peer reset; drop this agent
+            pass
+        finally:
+            if host is not None:
+                with self.lock:
+                    self.disconnect(host, writer)
+            writer.close()
+            
+    def disconnect(self, host, writer):
+        """Mark host offline if writer is still its connection; call with the lock held"""
+        if self.connections.get(host) is writer:
+            del self.connections[host]
+            self.hosts[host]["online"] = False
+            self.changed.add(host)
+            
+    def take_changes(self):
+        """{host: copy of its record} for every host updated since the previous call"""
+        with self.lock:
+            changed, self.changed = self.changed, set()
+            return {host: dict(self.hosts[host]) for host in changed}
+            
+    def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start listening on a background thread; raises OSError if the port can't be bound"""
+        ready = threading.Event()
+        errors = []
+        
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                self.server = loop.run_until_complete(
+                    asyncio.start_server(self.handle, host, port, limit=MAX_MESSAGE))
+            except OSError as e:
+                errors.append(e)
+                loop.close()
+                ready.set()
+                return
+            self.loop = loop
+            self.address = self.server.sockets[0].getsockname()[:2]
+            ready.set()
+            try:
+                loop.run_forever()
+            finally:
+                self.server.close()
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                loop.close()
+                
+        self.thread = threading.Thread(target=run, name="fleet-aggregator", daemon=True)
+        self.thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+            
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(2)
+            self.loop = None
+
+def local_test(agents=10, duration=10.0, interval=1.0):
+    """Run an aggregator and several local agent processes; print what arrived"""
+    import os
+    import subprocess
+    aggregator = FleetAggregator()
+    aggregator.start("127.0.0.1", 0)
+    port = aggregator.address[1]
+    main_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    processes = [subprocess.Popen([sys.executable, main_py, "--agent", f"127.0.0.1:{port}",
+                                   "--interval", str(interval), "--name", f"agent-{i}"])
+                 for i in range(agents)]
+    cpu_start = time.process_time()
+    try:
+        time.sleep(duration)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+    cpu_used = time.process_time() - cpu_start
+    time.sleep(0.2)
+    aggregator.stop()
+    
+    hosts = aggregator.hosts
+    deltas = aggregator.messages - aggregator.full_messages
+    delta_bytes = aggregator.bytes_received - aggregator.full_bytes
+    print(f"{len(hosts)} of {agents} agents reported: {aggregator.messages} messages, "
+          f"{aggregator.bytes_received} bytes in {duration:g} s")
+    if aggregator.full_messages:
+        print(f"full records: {aggregator.full_bytes / aggregator.full_messages:.0f} bytes on average")
+    if deltas:
+        print(f"deltas: {delta_bytes / deltas:.0f} bytes on average")
+    print(f"aggregator CPU time: {cpu_used * 1000:.0f} ms")
+    return 0 if len(hosts) == agents else 1
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="OpenAbout fleet aggregator local test.")
+    parser.add_argument("--local-test", type=int, metavar="N", required=True,
+                        help="run N local agents against an in-process aggregator")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="agent interval in seconds")
+    args = parser.parse_args()
+    sys.exit(local_test(args.local_test, args.duration, args.interval))
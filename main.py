@@ -1,19 +1,1358 @@
 import sys
-import platform
+# Headless modes (--json/--once/--watch) must never load PySide6
+if __name__ == "__main__" and len(sys.argv) > 1:
+    import cli
+    if cli.is_headless(sys.argv[1:]):
+        sys.exit(cli.main(sys.argv[1:]))
 import psutil
 import socket
 import os
+import math
 import time
+import traceback
+# Reference point for the startup timings reported with OPENABOUT_TIMING=1
+LAUNCH_TIME = time.perf_counter()
 from datetime import datetime, timedelta
+from sysinfo import Collector, MetricHistory, MountUsageProber, diagnostics, format_bytes, parse_address
+from recording import SessionReader, SessionWriter
+from alerts import AlertEngine, desktop_notify, reap
 from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 # ======= OS CONFIGURATION/PRESET =======
 Os = ""
 # =========================================
-class OpenAbout(QMainWindow):
+
+class SnapshotSampler(QObject):
+    """Worker living on its own QThread; collects snapshots so psutil never blocks the GUI"""
+    snapshot_ready = Signal(object)
+    static_ready = Signal(object)
+    # (AlertEvent, names of the rules firing after it)
+    alert_changed = Signal(object, object)
+    
+    def __init__(self, alerts=None):
+        super().__init__()
+        self.collector = Collector()
+        # AlertEngine run against every snapshot; its events come back through alert_changed
+        self.alerts = alerts
+        if alerts is not None:
+            alerts.notify = self.notify_alert
+        # Session file every snapshot is appended to (OPENABOUT_RECORD), opened on the first sample
+        self.record_path = os.environ.get("OPENABOUT_RECORD")
+        self.recorder = None
+        # Errors already printed, so a failure that repeats every tick is reported once
+        self.reported = set()
+        
+    def failed(self, step, error):
+        """Record a handled exception in Diagnostics and print its traceback the first time it happens"""
+        diagnostics.failed(step, error)
+        key = (step, type(error), str(error))
+        if key not in self.reported:
+            self.reported.add(key)
+            print(f"openabout: {step} failed:", file=sys.stderr)
+            traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+            
+    @Slot(object)
+    def sample(self, visible):
+        """Collect one snapshot of the visible groups and hand it to the UI (None if collection failed)"""
+        try:
+            snapshot = self.collector.snapshot(visible)
+        except Exception as e:
+            self.failed("sampler.snapshot", e)
+            snapshot = None
+        if snapshot is not None and self.record_path:
+            self.record(snapshot)
+        if snapshot is not None and self.alerts is not None:
+            try:
+                with diagnostics.measure("alerts.evaluate"):
+                    self.alerts.evaluate(snapshot)
+            except Exception as e:
+                self.failed("alerts.evaluate", e)
+        self.snapshot_ready.emit(snapshot)
+        
+    def notify_alert(self, event):
+        """Hand an alert to the UI along with the rules firing now, read here on the sampler thread"""
+        self.alert_changed.emit(event, self.alerts.firing())
+        
+    def record(self, snapshot):
+        """Append to the session file; recording stops for good on the first error"""
+        try:
+            if self.recorder is None:
+                self.recorder = SessionWriter(self.record_path, self.collector.static_info())
+            with diagnostics.measure("session.append"):
+                self.recorder.append(snapshot)
+        except (OSError, ValueError) as e:
+            diagnostics.failed("session.append", e)
+            print(f"openabout: recording to {self.record_path} stopped: {e}", file=sys.stderr)
+            self.record_path = None
+            
+    @Slot(int, str)
+    def set_process_options(self, limit, key):
+        """Change the process tracker's row limit and sort key; runs on the sampler thread, between samples"""
+        tracker = self.collector.process_tracker
+        tracker.limit = limit
+        tracker.key = key
+        self.collector.scheduler.force()
+        
+    @Slot()
+    def close_recorder(self):
+        """Flush and close the session file; runs on the sampler thread as it finishes"""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+            
+    @Slot()
+    def sample_static(self):
+        """Collect the static facts and hand them to the UI (None if collection failed)"""
+        try:
+            info = self.collector.static_info()
+        except Exception as e:
+            self.failed("sampler.static_info", e)
+            info = None
+        self.static_ready.emit(info)
+
+class WidgetViewModel:
+    """Remembers the last value rendered into each widget and only touches widgets that changed
+    
+    Values are staged with set_text/set_value/set_tooltip and written in one
+    pass by commit(), so Qt coalesces the resulting relayout and repaint into
+    a single update per tick.
+    """
+    
+    def __init__(self):
+        self.rendered = {}
+        self.pending = {}
+        self.updates_applied = 0
+        self.updates_avoided = 0
+        
+    def set_text(self, label, text):
+        self.pending[(label, "text")] = text
+        
+    def set_value(self, bar, value):
+        self.pending[(bar, "value")] = value
+        
+    def set_tooltip(self, widget, text):
+        self.pending[(widget, "tooltip")] = text
+        
+    def commit(self):
+        """Write staged values that differ from what is already shown"""
+        pending, self.pending = self.pending, {}
+        with diagnostics.measure("ui.commit"):
+            for key, value in pending.items():
+                if key in self.rendered and self.rendered[key] == value:
+                    self.updates_avoided += 1
+                    continue
+                widget, kind = key
+                if kind == "text":
+                    widget.setText(value)
+                elif kind == "value":
+                    widget.setValue(value)
+                else:
+                    widget.setToolTip(value)
+                self.rendered[key] = value
+                self.updates_applied += 1
+
+class DiskUsageProber(QObject):
+    """Qt front end for MountUsageProber; results arrive through the probed signal"""
+    # mountpoint, usage (None on error), seconds taken
+    probed = Signal(str, object, float)
+    
+    def __init__(self):
+        super().__init__()
+        self.prober = MountUsageProber()
+        
+    def probe(self, mountpoint):
+        """Queue a probe; False if a probe of this mount is still outstanding"""
+        return self.prober.probe(mountpoint, self.probed.emit)
+
+class SortableItem(QTableWidgetItem):
+    """Table item that sorts by a raw value instead of its display text"""
+    
+    def __init__(self, text, sort_value):
+        super().__init__(text)
+        self.sort_value = sort_value
+        
+    def __lt__(self, other):
+        if isinstance(other, SortableItem):
+            return self.sort_value < other.sort_value
+        return super().__lt__(other)
+
+class AllDisksDialog(QDialog):
+    """Sortable table of every partition, filled in as usage probes complete"""
+    COLUMNS = ["Device", "Mountpoint", "File System", "Total", "Used", "Free", "Use %", "Status"]
+    STATUS_COLUMN = 7
+    # Seconds before a probe is reported as slow / not responding
+    SLOW_AFTER = 0.5
+    TIMEOUT = 3.0
+    
+    def __init__(self, parent, prober, format_bytes):
+        super().__init__(parent)
+        self.setWindowTitle("All Disks")
+        self.resize(640, 360)
+        self.prober = prober
+        self.format_bytes = format_bytes
+        self.rows = {}
+        self.waiting = {}
+        
+        layout = QVBoxLayout(self)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+        
+        ok_btn = QPushButton("OK")
+        ok_btn.clicked.connect(self.accept)
+        layout.addWidget(ok_btn, 0, Qt.AlignRight)
+        
+        self.prober.probed.connect(self.on_probed)
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.timeout.connect(self.check_timeouts)
+        self.timeout_timer.start(250)
+        
+        self.start_probes()
+        
+    def start_probes(self):
+        """Add a row per partition and fan the usage probes out to the pool"""
+        try:
+            partitions = psutil.disk_partitions()
+        except Exception:
+            partitions = []
+            
+        now = time.monotonic()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(partitions))
+        for partition in partitions:
+            if partition.mountpoint in self.rows:
+                continue
+            row = len(self.rows)
+            key_item = QTableWidgetItem(partition.device)
+            self.table.setItem(row, 0, key_item)
+            self.table.setItem(row, 1, QTableWidgetItem(partition.mountpoint))
+            self.table.setItem(row, 2, QTableWidgetItem(partition.fstype))
+            self.rows[partition.mountpoint] = key_item
+            
+            if self.prober.probe(partition.mountpoint):
+                self.set_status(key_item, "Probing...")
+                self.waiting[partition.mountpoint] = now
+            else:
+                # Still stuck from an earlier probe; don't pile up another
+                self.set_status(key_item, "Not responding")
+        self.table.setRowCount(len(self.rows))
+        self.table.setSortingEnabled(True)
+        
+        if not partitions:
+            self.timeout_timer.stop()
+            
+    def set_status(self, key_item, text):
+        self.table.setItem(key_item.row(), self.STATUS_COLUMN, QTableWidgetItem(text))
+        
+    def on_probed(self, mountpoint, usage, elapsed):
+        """Fill in one row as its probe completes"""
+        key_item = self.rows.get(mountpoint)
+        if key_item is None:
+            return
+        self.waiting.pop(mountpoint, None)
+        
+        self.table.setSortingEnabled(False)
+        row = key_item.row()
+        if usage is None:
+            self.set_status(key_item, "Error")
+        else:
+            self.table.setItem(row, 3, SortableItem(self.format_bytes(usage.total), usage.total))
+            self.table.setItem(row, 4, SortableItem(self.format_bytes(usage.used), usage.used))
+            self.table.setItem(row, 5, SortableItem(self.format_bytes(usage.free), usage.free))
+            self.table.setItem(row, 6, SortableItem(f"{usage.percent}%", usage.percent))
+            self.set_status(key_item, f"Slow ({elapsed:.1f} s)" if elapsed >= self.SLOW_AFTER else "OK")
+        self.table.setSortingEnabled(True)
+        
+        if not self.waiting:
+            self.timeout_timer.stop()
+            
+    def check_timeouts(self):
+        """Mark probes that have exceeded the timeout instead of waiting on them"""
+        now = time.monotonic()
+        for mountpoint, started in list(self.waiting.items()):
+            if now - started >= self.TIMEOUT:
+                self.set_status(self.rows[mountpoint], "Not responding")
+                del self.waiting[mountpoint]
+        if not self.waiting:
+            self.timeout_timer.stop()
+            
+    def done(self, result):
+        self.prober.probed.disconnect(self.on_probed)
+        super().done(result)
+
+class FleetDialog(QDialog):
+    """Hosts reported by fleet agents (main.py --agent), one row each
+    
+    The aggregator keeps running while the dialog is hidden; the table is
+    refreshed once a second from the hosts that changed since the last tick.
+    """
+    COLUMNS = ["Host", "Address", "Operating System", "CPU %", "Memory %", "Disk %", "Uptime", "Status"]
+    STATUS_COLUMN = 7
+    # Intervals without a message before an online host is reported as stale
+    STALE_AFTER = 3
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        # asyncio is only loaded once the fleet view is actually used
+        import fleet
+        self.fleet = fleet
+        self.setWindowTitle("Fleet")
+        self.resize(760, 420)
+        self.aggregator = None
+        self.rows = {}
+        self.records = {}
+        layout = QVBoxLayout(self)
+        
+        listen_layout = QHBoxLayout()
+        listen_layout.addWidget(QLabel("Listen on:"))
+        # Loopback only by default; agents on other machines need e.g. 0.0.0.0:7878
+        self.address_edit = QLineEdit(f"{fleet.DEFAULT_HOST}:{fleet.DEFAULT_PORT}")
+        self.address_edit.setToolTip("[HOST:]PORT to accept agents on; the default host is 127.0.0.1.\n"
+                                     "Agents are not authenticated, so only listen on trusted networks.")
+        listen_layout.addWidget(self.address_edit)
+        self.listen_btn = QPushButton("Start")
+        self.listen_btn.clicked.connect(self.toggle_listening)
+        listen_layout.addWidget(self.listen_btn)
+        self.status_label = QLabel("Not listening")
+        listen_layout.addWidget(self.status_label, 1)
+        layout.addLayout(listen_layout)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.hide)
+        layout.addWidget(close_btn, 0, Qt.AlignRight)
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        
+    def toggle_listening(self):
+        if self.aggregator is not None:
+            self.stop()
+            return
+        aggregator = self.fleet.FleetAggregator()
+        address = self.address_edit.text().strip()
+        try:
+            aggregator.start(*parse_address(address, self.fleet.DEFAULT_HOST))
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Fleet", f"Could not listen on {address}:\n{e}")
+            return
+        self.aggregator = aggregator
+        self.address_edit.setEnabled(False)
+        self.listen_btn.setText("Stop")
+        self.refresh_timer.start(1000)
+        self.refresh()
+        
+    def stop(self):
+        """Stop listening; rows stay in the table as offline"""
+        if self.aggregator is None:
+            return
+        self.aggregator.stop()
+        self.aggregator = None
+        self.refresh_timer.stop()
+        self.address_edit.setEnabled(True)
+        self.listen_btn.setText("Start")
+        self.table.setSortingEnabled(False)
+        for host, record in self.records.items():
+            record["online"] = False
+            self.set_status(self.rows[host], "Offline")
+        self.table.setSortingEnabled(True)
+        self.status_label.setText(f"Not listening ({len(self.rows)} hosts seen)")
+        
+    def set_status(self, key_item, text):
+        self.table.setItem(key_item.row(), self.STATUS_COLUMN, QTableWidgetItem(text))
+        
+    def refresh(self):
+        """Apply the hosts that changed since the last tick and re-check staleness"""
+        changes = self.aggregator.take_changes()
+        now = time.time()
+        self.table.setSortingEnabled(False)
+        for host, record in changes.items():
+            key_item = self.rows.get(host)
+            if key_item is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+                key_item = QTableWidgetItem(host)
+                self.table.setItem(row, 0, key_item)
+                self.rows[host] = key_item
+            self.records[host] = record
+            row = key_item.row()
+            self.table.setItem(row, 1, QTableWidgetItem(record.get("address", "")))
+            self.table.setItem(row, 2, QTableWidgetItem(record.get("os") or ""))
+            for column, key in ((3, "cpu"), (4, "mem"), (5, "disk")):
+                value = record.get(key)
+                if value is None:
+                    self.table.setItem(row, column, SortableItem("", -1.0))
+                else:
+                    self.table.setItem(row, column, SortableItem(f"{value:.1f}", value))
+            boot_time = record.get("boot_time")
+            if boot_time:
+                uptime = int(now - boot_time)
+                self.table.setItem(row, 6, SortableItem(str(timedelta(seconds=uptime)), uptime))
+            else:
+                self.table.setItem(row, 6, SortableItem("", -1))
+            self.set_status(key_item, "Online" if record.get("online") else "Offline")
+            
+        # Hosts still connected but silent for a few intervals
+        for host, record in self.records.items():
+            if host in changes or not record.get("online"):
+                continue
+            interval = record.get("interval") or 15
+            if now - record.get("last_seen", now) > self.STALE_AFTER * interval:
+                record["online"] = False
+                self.set_status(self.rows[host], "Stale")
+        self.table.setSortingEnabled(True)
+        
+        online = sum(1 for record in self.records.values() if record.get("online"))
+        host, port = self.aggregator.address
+        self.status_label.setText(f"Listening on {host}:{port}: {len(self.records)} hosts, {online} online")
+
+class Sparkline(QWidget):
+    """Small line graph of one metric's history; click to switch between tiers"""
+    # What one point of each tier of the history is
+    TIER_POINTS = ("samples", "minute averages")
+    
+    def __init__(self, history, metric):
+        super().__init__()
+        self.history = history
+        self.metric_name = metric
+        self.tier = 0
+        self.setFixedSize(80, 18)
+        self.setCursor(Qt.PointingHandCursor)
+        
+    def mousePressEvent(self, event):
+        self.tier = (self.tier + 1) % len(self.history.steps)
+        self.update()
+        
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.paint_history(painter, self.rect(), self.history, self.metric_name, self.tier)
+        painter.end()
+        
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            # Worked out on hover rather than on every repaint
+            QToolTip.showText(event.globalPos(), self.history_tooltip(self.history, self.metric_name, self.tier), self)
+            return True
+        return super().event(event)
+        
+    @staticmethod
+    def paint_history(painter, rect, history, metric, tier):
+        """Paint one tier of a metric's history into rect"""
+        painter.fillRect(rect, QColor("#FFFFFF"))
+        painter.setPen(QColor("#8A8A8A"))
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+        
+        times, values = history.series(metric, tier)
+        if not values:
+            return
+            
+        # Max per pixel column so short spikes stay visible
+        width = rect.width() - 2
+        height = rect.height() - 3
+        per_column = max(1, -(-len(values) // width))
+        peaks = [max(values[begin:begin + per_column]) for begin in range(0, len(values), per_column)]
+        left, bottom, scale = rect.x() + 1, rect.y() + 1 + height, height / 100.0
+        points = [QPointF(left + x, bottom - scale * min(peak, 100.0)) for x, peak in enumerate(peaks)]
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor("#316AC5"), 1))
+        painter.drawPolyline(points)
+        painter.restore()
+        
+    @staticmethod
+    def span_name(times):
+        """'last 40 minutes', 'last 5 hours'... for the time the samples cover
+        
+        Worked out from the timestamps, since how long a tier reaches back
+        depends on how often it was sampled (every 10 s while hidden).
+        """
+        minutes = round((times[-1] - times[0]) / 60)
+        if minutes < 2:
+            return "last minute"
+        if minutes < 60:
+            return f"last {minutes} minutes"
+        hours = round(minutes / 60)
+        return "last hour" if hours == 1 else f"last {hours} hours"
+        
+    @classmethod
+    def history_tooltip(cls, history, metric, tier):
+        times, values = history.series(metric, tier)
+        if not values:
+            return f"No {cls.TIER_POINTS[tier]} yet; click to switch"
+        peak_index = max(range(len(values)), key=values.__getitem__)
+        peak_time = datetime.fromtimestamp(times[peak_index]).strftime("%H:%M")
+        return (f"Peak {values[peak_index]:.0f}% at {peak_time} ({cls.span_name(times)} of "
+                f"{cls.TIER_POINTS[tier]}); click to switch")
+
+class ProcessTableModel(QAbstractTableModel):
+    """Top processes keyed by PID, updated in place
+    
+    update() removes rows of processes that dropped out, emits dataChanged
+    for rows whose counters changed and appends new ones, so the view keeps
+    its selection and scroll position. Ordering is left to a
+    QSortFilterProxyModel sorting on SORT_ROLE.
+    """
+    COLUMNS = ["PID", "Name", "User", "CPU %", "Memory", "Command Line"]
+    CPU_COLUMN = 3
+    MEMORY_COLUMN = 4
+    SORT_ROLE = Qt.UserRole
+    
+    def __init__(self, format_bytes):
+        super().__init__()
+        self.format_bytes = format_bytes
+        self.rows = []
+        # pid -> row index in self.rows
+        self.index_of = {}
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(row.pid)
+            if column == 1:
+                return row.name
+            if column == 2:
+                return row.username
+            if column == self.CPU_COLUMN:
+                return f"{row.cpu_percent:.1f}"
+            if column == self.MEMORY_COLUMN:
+                return self.format_bytes(row.rss)
+            return row.cmdline
+        if role == self.SORT_ROLE:
+            return (row.pid, row.name.lower(), row.username, row.cpu_percent, row.rss, row.cmdline)[column]
+        if role == Qt.ToolTipRole and column == 5:
+            return row.cmdline
+        if role == Qt.TextAlignmentRole and column in (0, self.CPU_COLUMN, self.MEMORY_COLUMN):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+        
+    def update(self, rows):
+        """Apply a new set of top rows as removals, changes and inserts"""
+        incoming = {row.pid: row for row in rows}
+        
+        # Remove from the bottom up so indices stay valid
+        gone = sorted((self.index_of[pid] for pid in self.index_of.keys() - incoming.keys()), reverse=True)
+        for position in gone:
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self.rows[position]
+            self.endRemoveRows()
+        if gone:
+            self.index_of = {row.pid: position for position, row in enumerate(self.rows)}
+            
+        # Same process, new counters
+        last_column = len(self.COLUMNS) - 1
+        for position, row in enumerate(self.rows):
+            new = incoming.pop(row.pid)
+            if new != row:
+                self.rows[position] = new
+                first = self.CPU_COLUMN if new.create_time == row.create_time else 0
+                self.dataChanged.emit(self.index(position, first), self.index(position, last_column))
+                
+        if incoming:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(incoming) - 1)
+            for row in incoming.values():
+                self.index_of[row.pid] = len(self.rows)
+                self.rows.append(row)
+            self.endInsertRows()
+
+class DeviceTableModel(QAbstractTableModel):
+    """Per-device rows keyed by their first field (the device name), updated in place
+    
+    columns is a list of (header, function formatting that field). update()
+    emits dataChanged only for rows whose values changed and inserts or
+    removes rows only when devices come or go, so a tick on a quiet machine
+    repaints nothing.
+    """
+    
+    def __init__(self, columns):
+        super().__init__()
+        self.headers = [header for header, format_value in columns]
+        self.formats = [format_value for header, format_value in columns]
+        self.rows = []
+        # device -> row index in self.rows
+        self.index_of = {}
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return self.formats[column](self.rows[index.row()][column])
+        if role == Qt.TextAlignmentRole and column > 0:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+        
+    def update(self, rows):
+        """Apply a new set of rows as removals, changes and inserts"""
+        incoming = {row[0]: row for row in rows}
+        
+        gone = sorted((self.index_of[device] for device in self.index_of.keys() - incoming.keys()), reverse=True)
+        # One removal per run of adjacent rows, from the end so the positions left stay valid
+        next_gone = 0
+        while next_gone < len(gone):
+            first = last = gone[next_gone]
+            next_gone += 1
+            while next_gone < len(gone) and gone[next_gone] == first - 1:
+                first -= 1
+                next_gone += 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.rows[first:last + 1]
+            self.endRemoveRows()
+        if gone:
+            self.index_of = {row[0]: position for position, row in enumerate(self.rows)}
+            
+        # Same device, new values; one dataChanged spans the changed rows, the view repaints what it shows
+        first = last = None
+        for position, row in enumerate(self.rows):
+            new = incoming.pop(row[0])
+            if new is not row and new != row:
+                self.rows[position] = new
+                if first is None:
+                    first = position
+                last = position
+        if first is not None:
+            self.dataChanged.emit(self.createIndex(first, 1), self.createIndex(last, len(self.headers) - 1))
+            
+        if incoming:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(incoming) - 1)
+            for row in incoming.values():
+                self.index_of[row[0]] = len(self.rows)
+                self.rows.append(row)
+            self.endInsertRows()
+
+def device_table(model, visible_rows=4):
+    """Compact read-only view of a DeviceTableModel, as tall as its rows up to visible_rows"""
+    view = QTableView()
+    view.setModel(model)
+    view.setSelectionMode(QAbstractItemView.NoSelection)
+    view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    view.setFocusPolicy(Qt.NoFocus)
+    view.verticalHeader().setVisible(False)
+    view.verticalHeader().setDefaultSectionSize(18)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    
+    def fit():
+        rows = min(max(model.rowCount(), 1), visible_rows)
+        view.setFixedHeight(view.horizontalHeader().height() + rows * 18 + 2 * view.frameWidth())
+        
+    model.rowsInserted.connect(fit)
+    model.rowsRemoved.connect(fit)
+    fit()
+    return view
+
+class CoreHeatMap(QWidget):
+    """Utilisation of every logical CPU as one grid of coloured cells
+    
+    A single widget paints all cells, so 256 CPUs cost one paintEvent of
+    plain fillRects. Cells shrink as the CPU count grows to keep the grid
+    within MAX_ROWS rows; hovering a cell shows its usage and frequency.
+    """
+    MAX_CELL = 14
+    MIN_CELL = 5
+    GAP = 1
+    MAX_ROWS = 6
+    # (count, columns, cell size) -> make_grid() of that shape
+    grids = {}
+    
+    def __init__(self):
+        super().__init__()
+        self.values = ()
+        self.freqs = ()
+        # Integer percent per core; repaint only when one of these changes
+        self.levels = b""
+        self.colors = self.level_colors()
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        
+    @staticmethod
+    def level_colors():
+        """Colour of each integer percent: white to XP blue up to 80%, then on to red"""
+        blue, red = QColor("#316AC5"), QColor("#C0392B")
+        colors = []
+        for level in range(101):
+            if level <= 80:
+                start, end, f = QColor("#FFFFFF"), blue, level / 80
+            else:
+                start, end, f = blue, red, (level - 80) / 20
+            colors.append(QColor(int(start.red() + (end.red() - start.red()) * f),
+                                 int(start.green() + (end.green() - start.green()) * f),
+                                 int(start.blue() + (end.blue() - start.blue()) * f)))
+        return colors
+        
+    def set_values(self, per_core, freqs):
+        """New per-core percentages and MHz; repaints only if a cell's colour changes"""
+        levels = bytes(min(int(p), 100) for p in per_core)
+        resized = len(per_core) != len(self.values)
+        self.values = per_core
+        self.freqs = freqs
+        if resized:
+            self.updateGeometry()
+        if levels != self.levels:
+            self.levels = levels
+            self.update()
+            
+    def grid(self, width):
+        """(columns, cell size) for the current CPU count at this width"""
+        return self.cell_grid(len(self.values), width)
+        
+    @classmethod
+    def cell_grid(cls, count, width):
+        count = max(count, 1)
+        for cell in range(cls.MAX_CELL, cls.MIN_CELL - 1, -1):
+            columns = max(1, (width + cls.GAP) // (cell + cls.GAP))
+            if -(-count // columns) <= cls.MAX_ROWS:
+                return columns, cell
+        return max(1, (width + cls.GAP) // (cls.MIN_CELL + cls.GAP)), cls.MIN_CELL
+        
+    @classmethod
+    def grid_height(cls, count, width):
+        columns, cell = cls.cell_grid(count, width)
+        rows = -(-max(count, 1) // columns)
+        return rows * (cell + cls.GAP) - cls.GAP
+        
+    def hasHeightForWidth(self):
+        return True
+        
+    def heightForWidth(self, width):
+        return self.grid_height(len(self.values), width)
+        
+    def sizeHint(self):
+        return QSize(200, self.heightForWidth(200))
+        
+    def resizeEvent(self, event):
+        # Fixed vertical policy: keep the height in step with the width
+        height = self.heightForWidth(self.width())
+        if height != self.height():
+            self.setFixedHeight(height)
+        super().resizeEvent(event)
+        
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.paint_cells(painter, self.rect(), self.levels, self.colors)
+        painter.end()
+        
+    @classmethod
+    def paint_cells(cls, painter, rect, levels, colors):
+        """Paint the grid of levels into rect
+        
+        The levels go in as one 8-bit indexed image, a pixel per cell, that
+        is scaled up and clipped to the cell interiors in a single drawImage;
+        the borders are a pixmap drawn once per grid shape. A repaint is a
+        handful of calls however many CPUs there are, not two per cell.
+        """
+        if not levels:
+            return
+        count = len(levels)
+        columns, cell = cls.cell_grid(count, rect.width())
+        step = cell + cls.GAP
+        rows = -(-count // columns)
+        grid = cls.grids.get((count, columns, cell))
+        if grid is None:
+            grid = cls.grids[(count, columns, cell)] = cls.make_grid(count, columns, cell)
+        interiors, borders = grid
+        data = levels.ljust(columns * rows, b"\0")
+        image = QImage(data, columns, rows, columns, QImage.Format_Indexed8)
+        image.setColorTable([color.rgba() for color in colors])
+        painter.save()
+        painter.setClipRegion(interiors.translated(rect.topLeft()), Qt.IntersectClip)
+        painter.drawImage(QRect(rect.x(), rect.y(), columns * step, rows * step), image)
+        painter.restore()
+        painter.drawPixmap(rect.topLeft(), borders)
+        
+    @classmethod
+    def make_grid(cls, count, columns, cell):
+        """(QRegion of the cell interiors, QPixmap of the cell borders) for one grid shape"""
+        step = cell + cls.GAP
+        interiors = QRegion()
+        borders = QPixmap(columns * step, -(-count // columns) * step)
+        borders.fill(Qt.transparent)
+        painter = QPainter(borders)
+        painter.setPen(QColor("#8A8A8A"))
+        for index in range(count):
+            x, y = index % columns * step, index // columns * step
+            interiors += QRect(x + 1, y + 1, cell - 2, cell - 2)
+            painter.drawRect(x, y, cell - 1, cell - 1)
+        painter.end()
+        return interiors, borders
+        
+        
+    @classmethod
+    def cell_tooltip(cls, values, freqs, width, pos):
+        """Usage and frequency of the cell under pos (relative to the grid), or None"""
+        columns, cell = cls.cell_grid(len(values), width)
+        step = cell + cls.GAP
+        column, row = pos.x() // step, pos.y() // step
+        index = row * columns + column
+        if not (0 <= column < columns and 0 <= index < len(values)):
+            return None
+        text = f"CPU {index}: {values[index]:.1f}%"
+        if index < len(freqs):
+            text += f" at {freqs[index]} MHz"
+        return text
+        
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            pos = event.position().toPoint() if hasattr(event, "position") else event.pos()
+            text = self.cell_tooltip(self.values, self.freqs, self.width(), pos)
+            if text:
+                QToolTip.showText(event.globalPos(), text, self)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+
+class PaintedField:
+    """A label drawn by a MetricsSurface
+    
+    Answers the setText/text/setToolTip calls the window and WidgetViewModel
+    make on a QLabel, and on a change repaints only its own rectangle.
+    """
+    
+    def __init__(self, surface, content=""):
+        self.surface = surface
+        self.rect = QRect()
+        self.content = content
+        self.tip = ""
+        
+    def setText(self, text):
+        if text != self.content:
+            self.content = text
+            self.update()
+            
+    def text(self):
+        return self.content
+        
+    def setToolTip(self, text):
+        self.tip = text
+        
+    def toolTip(self):
+        return self.tip
+        
+    def tooltip_at(self, pos):
+        return self.tip
+        
+    def click(self):
+        pass
+        
+    def update(self):
+        self.surface.update(self.rect)
+        
+    def paint(self, painter):
+        self.surface.draw_text(painter, self.rect, self.content)
+
+class PaintedBar(PaintedField):
+    """An XP progress bar drawn by a MetricsSurface; answers setValue/value like a QProgressBar"""
+    
+    def __init__(self, surface):
+        super().__init__(surface)
+        self.number = 0
+        
+    def setValue(self, value):
+        if value != self.number:
+            self.number = value
+            self.update()
+            
+    def value(self):
+        return self.number
+        
+    def paint(self, painter):
+        # The frame and white trough are part of the background
+        inner = self.rect.adjusted(2, 2, -2, -2)
+        filled = inner.width() * max(0, min(self.number, 100)) // 100
+        if filled:
+            painter.drawPixmap(QRect(inner.x(), inner.y(), filled, inner.height()),
+                               self.surface.chunk(inner.size()), self.surface.device_rect(QRect(0, 0, filled, inner.height())))
+        self.surface.draw_text(painter, self.rect, f"{self.number}%", MetricsSurface.BAR_FONT, Qt.AlignCenter)
+
+class PaintedSparkline(PaintedField):
+    """A Sparkline drawn by a MetricsSurface; click to switch between tiers"""
+    
+    def __init__(self, surface, history, metric):
+        super().__init__(surface)
+        self.history = history
+        self.metric_name = metric
+        self.tier = 0
+        
+    def click(self):
+        self.tier = (self.tier + 1) % len(self.history.steps)
+        self.update()
+        
+    def tooltip_at(self, pos):
+        # Worked out on hover rather than on every repaint
+        return Sparkline.history_tooltip(self.history, self.metric_name, self.tier)
+        
+    def paint(self, painter):
+        Sparkline.paint_history(painter, self.rect, self.history, self.metric_name, self.tier)
+
+class PaintedHeatMap(PaintedField):
+    """A CoreHeatMap drawn by a MetricsSurface"""
+    
+    def __init__(self, surface):
+        super().__init__(surface)
+        self.values = ()
+        self.freqs = ()
+        self.levels = b""
+        
+    def set_values(self, per_core, freqs):
+        """New per-core percentages and MHz; repaints only if a cell's colour changes"""
+        levels = bytes(min(int(p), 100) for p in per_core)
+        resized = len(per_core) != len(self.values)
+        self.values = per_core
+        self.freqs = freqs
+        if levels != self.levels:
+            self.levels = levels
+            self.update()
+        if resized:
+            self.surface.relayout()
+            
+    def tooltip_at(self, pos):
+        return CoreHeatMap.cell_tooltip(self.values, self.freqs, self.rect.width(), pos - self.rect.topLeft())
+        
+    def paint(self, painter):
+        CoreHeatMap.paint_cells(painter, self.rect, self.levels, self.surface.heat_colors)
+
+class MetricsSurface(QWidget):
+    """The General tab's metrics painted by one widget instead of a tree of styled labels and bars
+    
+    Rows are added top to bottom with group(), text(), bar(), heat_map()
+    and widget(). Group frames, captions and bar troughs are drawn once into
+    a background pixmap; values are blitted from a cache of rendered strings
+    and bar fills from a cached gradient pixmap, so a tick repaints just the
+    rectangles of the fields that changed, with no stylesheet polish or
+    relayout. Interactive widgets (the activity table, buttons) sit on top
+    as children.
+    """
+    MARGIN = 9
+    PADDING = 10
+    CAPTION_GAP = 12
+    ROW_HEIGHT = 18
+    SPACING = 5
+    SPARKLINE_WIDTH = 80
+    # Rendered strings kept; the oldest is dropped beyond this
+    GLYPH_CACHE_SIZE = 512
+    TEXT_FONT, TITLE_FONT, BAR_FONT = range(3)
+    
     def __init__(self):
         super().__init__()
+        self.rows = []
+        self.fields = []
+        self.fonts = []
+        for pixels, weight in ((11, QFont.Normal), (11, QFont.Bold), (10, QFont.Normal)):
+            font = QFont("Tahoma")
+            font.setPixelSize(pixels)
+            font.setWeight(weight)
+            self.fonts.append(font)
+        self.heat_colors = CoreHeatMap.level_colors()
+        # (text, font) -> pixmap of the rendered string
+        self.glyphs = {}
+        # (width, height) -> bar fill gradient
+        self.chunks = {}
+        self.background = None
+        self.frames = []
+        self.captions = []
+        self.troughs = []
+        self.setMouseTracking(True)
+        
+    # Building
+    
+    def group(self, title):
+        self.rows.append(("group", title, None))
+        
+    def text(self, caption, content="Loading..."):
+        field = PaintedField(self, content)
+        self.rows.append(("text", caption, field))
+        self.fields.append(field)
+        return field
+        
+    def bar(self, caption, history, metric):
+        """A progress bar with a sparkline of the metric's history next to it; returns both"""
+        bar, sparkline = PaintedBar(self), PaintedSparkline(self, history, metric)
+        self.rows.append(("bar", caption, (bar, sparkline)))
+        self.fields += [bar, sparkline]
+        return bar, sparkline
+        
+    def heat_map(self, caption):
+        heat_map = PaintedHeatMap(self)
+        self.rows.append(("heat_map", caption, heat_map))
+        self.fields.append(heat_map)
+        return heat_map
+        
+    def widget(self, caption, widget, alignment=None):
+        """A real widget placed over the surface, on a line of its own below its caption"""
+        widget.setParent(self)
+        self.rows.append(("widget", caption, (widget, alignment)))
+        
+    # Layout
+    
+    def relayout(self):
+        """Place every row for the current width and redraw the background"""
+        width = self.width()
+        left = self.MARGIN + self.PADDING
+        right = width - self.MARGIN - self.PADDING
+        # Values line up in one column after the widest caption
+        metrics = QFontMetrics(self.fonts[self.TEXT_FONT])
+        caption_width = max([metrics.horizontalAdvance(caption) + self.CAPTION_GAP
+                             for kind, caption, item in self.rows if caption and kind not in ("group", "widget")],
+                            default=0)
+        value_left = left + caption_width
+        self.frames, self.captions, self.troughs = [], [], []
+        y = 0
+        group_top = None
+        
+        def close_group(y):
+            if group_top is not None:
+                self.frames[-1][1].setBottom(y + self.PADDING - self.SPACING)
+                y += self.PADDING
+            return y
+            
+        for kind, caption, item in self.rows:
+            if kind == "group":
+                y = close_group(y) + self.SPACING
+                group_top = y + self.ROW_HEIGHT // 2
+                self.frames.append((caption, QRect(self.MARGIN, group_top, width - 2 * self.MARGIN, 0)))
+                y += self.ROW_HEIGHT + self.PADDING
+                continue
+            if kind == "widget":
+                widget, alignment = item
+                if caption:
+                    self.captions.append((caption, QRect(left, y, right - left, self.ROW_HEIGHT)))
+                    y += self.ROW_HEIGHT + self.SPACING
+                hint = widget.sizeHint()
+                if alignment == Qt.AlignRight:
+                    widget.setGeometry(right - hint.width(), y, hint.width(), hint.height())
+                else:
+                    height = max(widget.minimumHeight(), min(hint.height(), widget.maximumHeight()))
+                    widget.setGeometry(left, y, right - left, height)
+                y += widget.height() + self.SPACING
+                continue
+            x = left
+            if caption:
+                self.captions.append((caption, QRect(left, y, caption_width, self.ROW_HEIGHT)))
+                x = value_left
+            if kind == "text":
+                item.rect = QRect(x, y, right - x, self.ROW_HEIGHT)
+                height = self.ROW_HEIGHT
+            elif kind == "bar":
+                bar, sparkline = item
+                bar.rect = QRect(x, y, right - x - self.SPARKLINE_WIDTH - self.SPACING, self.ROW_HEIGHT)
+                sparkline.rect = QRect(right - self.SPARKLINE_WIDTH, y, self.SPARKLINE_WIDTH, self.ROW_HEIGHT)
+                self.troughs.append(bar.rect)
+                height = self.ROW_HEIGHT
+            else:
+                height = CoreHeatMap.grid_height(len(item.values), right - x)
+                item.rect = QRect(x, y + 2, right - x, height)
+                height = max(height + 4, self.ROW_HEIGHT)
+            y += height + self.SPACING
+        y = close_group(y) + self.SPACING
+        self.background = None
+        if self.minimumHeight() != y:
+            self.setMinimumHeight(y)
+        self.update()
+        
+    def resizeEvent(self, event):
+        self.relayout()
+        super().resizeEvent(event)
+        
+    def event(self, event):
+        if event.type() == QEvent.LayoutRequest:
+            # A child changed its size (the activity table grows with its rows)
+            self.relayout()
+            return True
+        if event.type() == QEvent.ToolTip:
+            pos = event.position().toPoint() if hasattr(event, "position") else event.pos()
+            field = self.field_at(pos)
+            text = field.tooltip_at(pos) if field is not None else None
+            if text:
+                QToolTip.showText(event.globalPos(), text, self)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+        
+    def field_at(self, pos):
+        for field in self.fields:
+            if field.rect.contains(pos):
+                return field
+        return None
+        
+    def mouseMoveEvent(self, event):
+        clickable = isinstance(self.field_at(event.position().toPoint()), PaintedSparkline)
+        self.setCursor(Qt.PointingHandCursor if clickable else Qt.ArrowCursor)
+        
+    def mousePressEvent(self, event):
+        field = self.field_at(event.position().toPoint())
+        if field is not None:
+            field.click()
+            
+    # Painting
+    
+    def device_rect(self, rect):
+        """rect in the device pixels of a pixmap made for this widget"""
+        ratio = self.devicePixelRatioF()
+        return QRect(int(rect.x() * ratio), int(rect.y() * ratio),
+                     math.ceil(rect.width() * ratio), math.ceil(rect.height() * ratio))
+    
+    def new_pixmap(self, size):
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(math.ceil(size.width() * ratio), math.ceil(size.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        return pixmap
+        
+    def glyph(self, text, font):
+        """The string rendered once into a transparent pixmap"""
+        key = (text, font)
+        pixmap = self.glyphs.get(key)
+        if pixmap is None:
+            metrics = QFontMetrics(self.fonts[font])
+            pixmap = self.new_pixmap(QSize(max(metrics.horizontalAdvance(text), 1), metrics.height()))
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self.fonts[font])
+            painter.setPen(self.palette().color(QPalette.WindowText))
+            painter.drawText(0, metrics.ascent(), text)
+            painter.end()
+            if len(self.glyphs) >= self.GLYPH_CACHE_SIZE:
+                del self.glyphs[next(iter(self.glyphs))]
+            self.glyphs[key] = pixmap
+        return pixmap
+        
+    def draw_text(self, painter, rect, text, font=TEXT_FONT, alignment=Qt.AlignLeft):
+        pixmap = self.glyph(text, font)
+        size = pixmap.deviceIndependentSize()
+        x = rect.x() + (rect.width() - size.width()) / 2 if alignment == Qt.AlignCenter else rect.x()
+        y = rect.y() + (rect.height() - size.height()) / 2
+        if size.width() > rect.width():
+            painter.save()
+            painter.setClipRect(rect)
+            painter.drawPixmap(QPointF(x, y), pixmap)
+            painter.restore()
+        else:
+            painter.drawPixmap(QPointF(x, y), pixmap)
+            
+    def chunk(self, size):
+        """Bar fill gradient for a trough of this size"""
+        key = (size.width(), size.height())
+        pixmap = self.chunks.get(key)
+        if pixmap is None:
+            pixmap = self.new_pixmap(size)
+            gradient = QLinearGradient(0, 0, 0, size.height())
+            gradient.setColorAt(0.0, QColor("#5B8FE0"))
+            gradient.setColorAt(0.45, QColor("#316AC5"))
+            gradient.setColorAt(1.0, QColor("#2A5CAE"))
+            painter = QPainter(pixmap)
+            painter.fillRect(QRect(QPoint(0, 0), size), gradient)
+            painter.end()
+            self.chunks[key] = pixmap
+        return pixmap
+        
+    def render_background(self):
+        """Group frames, titles, captions and bar troughs: everything that doesn't change per tick"""
+        pixmap = self.new_pixmap(self.size())
+        pixmap.fill(self.palette().color(QPalette.Window))
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        border = QColor("#8A8A8A")
+        title_metrics = QFontMetrics(self.fonts[self.TITLE_FONT])
+        for title, rect in self.frames:
+            painter.setPen(border)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 3, 3)
+            title_rect = QRect(rect.x() + 7, rect.y() - self.ROW_HEIGHT // 2,
+                               title_metrics.horizontalAdvance(title) + 10, self.ROW_HEIGHT)
+            painter.fillRect(title_rect, self.palette().color(QPalette.Window))
+            self.draw_text(painter, title_rect.adjusted(5, 0, 0, 0), title, self.TITLE_FONT)
+        for caption, rect in self.captions:
+            self.draw_text(painter, rect, caption)
+        for rect in self.troughs:
+            painter.setPen(border)
+            painter.setBrush(QColor("#FFFFFF"))
+            painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 3, 3)
+        painter.end()
+        return pixmap
+        
+    def paintEvent(self, event):
+        with diagnostics.measure("ui.surface_paint"):
+            if self.background is None or self.background.deviceIndependentSize().toSize() != self.size():
+                self.background = self.render_background()
+            # The region, not its bounding rect: two changed labels far apart mustn't repaint
+            # everything between them
+            exposed = event.region()
+            painter = QPainter(self)
+            for rect in exposed:
+                painter.drawPixmap(rect, self.background, self.device_rect(rect))
+            for field in self.fields:
+                if exposed.intersects(field.rect):
+                    field.paint(painter)
+            painter.end()
+
+class ReplayBar(QWidget):
+    """Play/pause, speed and a seek slider over a session file
+    
+    A timer advances a replay clock by the elapsed time times the speed and
+    emits the row at that time whenever it changes; moving the slider jumps
+    straight to a row.
+    """
+    # row, True if it was a jump rather than playback moving forward
+    row_selected = Signal(int, bool)
+    SPEEDS = (1, 10, 60, 600, 3600)
+    TICK = 100
+    
+    def __init__(self, reader, speed=60):
+        super().__init__()
+        self.reader = reader
+        self.speed = speed
+        self.row = 0
+        self.clock = reader.timestamp(0) if len(reader) else 0.0
+        self.last_tick = None
+        
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(15, 6, 15, 0)
+        self.play_btn = QPushButton("Play")
+        self.play_btn.setFixedWidth(60)
+        self.play_btn.clicked.connect(self.toggle_playing)
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, max(0, len(reader) - 1))
+        # Seek on release; while dragging only the time shown follows
+        self.slider.setTracking(False)
+        self.slider.valueChanged.connect(self.seek)
+        self.slider.sliderMoved.connect(self.show_time)
+        self.time_label = QLabel()
+        self.time_label.setMinimumWidth(120)
+        self.speed_combo = QComboBox()
+        speeds = list(self.SPEEDS) if speed in self.SPEEDS else sorted(self.SPEEDS + (speed,))
+        for value in speeds:
+            self.speed_combo.addItem(f"{value:g}x", value)
+        self.speed_combo.setCurrentIndex(speeds.index(speed))
+        self.speed_combo.currentIndexChanged.connect(
+            lambda index: setattr(self, "speed", self.speed_combo.itemData(index)))
+        layout.addWidget(self.play_btn)
+        layout.addWidget(self.slider, 1)
+        layout.addWidget(self.time_label)
+        layout.addWidget(self.speed_combo)
+        
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.TICK)
+        self.timer.timeout.connect(self.advance)
+        if not len(reader):
+            self.time_label.setText("Empty session")
+            for widget in (self.play_btn, self.slider, self.speed_combo):
+                widget.setEnabled(False)
+    
+    def toggle_playing(self):
+        if self.timer.isActive():
+            self.timer.stop()
+            self.play_btn.setText("Play")
+            return
+        if self.row >= len(self.reader) - 1:
+            # Replay again from the start
+            self.seek(0)
+        self.last_tick = time.monotonic()
+        self.timer.start()
+        self.play_btn.setText("Pause")
+        
+    def advance(self):
+        now = time.monotonic()
+        self.clock += (now - self.last_tick) * self.speed
+        self.last_tick = now
+        row = self.reader.find(self.clock)
+        if row >= len(self.reader) - 1:
+            self.toggle_playing()
+        if row != self.row:
+            self.show_row(row, False)
+            
+    def seek(self, row):
+        """Jump to a row (slider moved)"""
+        self.clock = self.reader.timestamp(row)
+        self.show_row(row, True)
+        
+    def show_row(self, row, jumped):
+        self.row = row
+        self.slider.blockSignals(True)
+        self.slider.setValue(row)
+        self.slider.blockSignals(False)
+        self.show_time(row)
+        self.row_selected.emit(row, jumped)
+        
+    def show_time(self, row):
+        at = datetime.fromtimestamp(self.reader.timestamp(row))
+        self.time_label.setText(at.strftime("%Y-%m-%d %H:%M:%S"))
+
+# Metrics kept in the history, and the groups that must be sampled to feed it
+HISTORY_METRICS = ("cpu", "memory", "disk")
+HISTORY_GROUPS = frozenset(HISTORY_METRICS)
+# Sampling interval (ms) for the history while nothing is on screen
+BACKGROUND_INTERVAL = 10000
+
+# Metric groups whose widgets live on each tab
+GENERAL_TAB_GROUPS = frozenset(["cpu", "memory", "cpu_freq", "disk", "disk_io", "swap", "boot_time"])
+COMPUTER_TAB_GROUPS = frozenset(["network", "net_io"])
+PROCESSES_TAB_GROUPS = frozenset(["processes"])
+
+# Sampler threads that were still running when their window closed
+STRAY_THREADS = []
+
+class OpenAbout(QMainWindow):
+    sample_requested = Signal(object)
+    static_requested = Signal()
+    # (row limit, sort key) for the sampler's process tracker
+    process_options_changed = Signal(int, str)
+    
+    def __init__(self, replay=None, speed=60, alerts=None, painted=False):
+        super().__init__()
+        # Paint the General tab's metrics with one MetricsSurface instead of styled widgets
+        self.painted = painted
+        # SessionReader to show instead of this machine; nothing is sampled then
+        self.replay = replay
+        # Metric groups the alert rules read, sampled even when not on screen
+        self.alert_groups = alerts.groups if alerts is not None else frozenset()
+        self.tray_icon = None
+        # notify-send/osascript processes started without a tray
+        self.notifiers = []
+        self.replay_row = None
+        self.replay_snapshot = None
         self.setWindowTitle("System Properties")
         self.setFixedSize(560,723)
         
@@ -30,19 +1369,68 @@ class OpenAbout(QMainWindow):
         main_layout = QVBoxLayout(central_widget)
         main_layout.setContentsMargins(0, 0, 0, 0)
         
+        # Fixed-size history behind the sparklines
+        self.history = MetricHistory(HISTORY_METRICS)
+        
         # Create tabs
         self.create_tabs(main_layout)
         
+        # Replay controls
+        if replay is not None:
+            self.replay_bar = ReplayBar(replay, speed)
+            self.replay_bar.row_selected.connect(self.replay_to)
+            main_layout.addWidget(self.replay_bar)
+            self.setFixedSize(560, 723 + self.replay_bar.sizeHint().height())
+            self.setWindowTitle(f"System Properties - Replay of {os.path.basename(replay.path)}")
+            
         # Create buttons
         self.create_buttons(main_layout)
         
-        # Timer for dynamic updates
+        # Worker pool for the "View All Disks" dialog, created on first use
+        self.disk_prober = None
+        
+        # Fleet aggregator view, created on first use
+        self.fleet_dialog = None
+        
+        # Only widgets whose value changed get touched
+        self.view = WidgetViewModel()
+        
+        # Background sampler; results come back through a queued signal
+        self.sample_pending = False
+        self.sample_again = False
+        self.visible_groups = frozenset()
+        self.sampler_thread = QThread(self)
+        self.sampler = SnapshotSampler(alerts)
+        self.sampler.moveToThread(self.sampler_thread)
+        self.sampler.alert_changed.connect(self.show_alert, Qt.QueuedConnection)
+        self.sample_requested.connect(self.sampler.sample, Qt.QueuedConnection)
+        self.sampler.snapshot_ready.connect(self.apply_snapshot, Qt.QueuedConnection)
+        self.static_requested.connect(self.sampler.sample_static, Qt.QueuedConnection)
+        self.sampler.static_ready.connect(self.apply_static_info, Qt.QueuedConnection)
+        self.process_options_changed.connect(self.sampler.set_process_options, Qt.QueuedConnection)
+        self.static_pending = False
+        self.static_info = None
+        # Direct: runs on the sampler thread once its last sample() has returned
+        self.sampler_thread.finished.connect(self.sampler.close_recorder, Qt.DirectConnection)
+        self.sampler_thread.finished.connect(self.sampler.deleteLater)
+        self.sampler_thread.start()
+        
+        # Timer for dynamic updates, started once the window is on screen
         self.update_timer = QTimer()
+        self.update_timer.setInterval(2000)  # Update every 2 seconds
         self.update_timer.timeout.connect(self.update_dynamic_info)
-        self.update_timer.start(2000)  # Update every 2 seconds
+        self.tab_widget.currentChanged.connect(self.update_visibility)
+        self.expose_filter_installed = False
+        self.closing = False
         
-        # Initial data load
-        self.update_all_info()
+        # Startup timings
+        self.first_paint_at = None
+        self.populated_at = None
+        self.snapshot_applied = False
+        
+        # The first sample is taken when showEvent finds the widgets on screen;
+        # static info is loaded once the event loop is running and the window is painted
+        QTimer.singleShot(0, self.update_static_info)
         
     def apply_xp_style(self):
         """Apply Windows XP visual style"""
@@ -144,12 +1532,33 @@ class OpenAbout(QMainWindow):
         self.tab_widget = QTabWidget()
         self.tab_widget.setFont(QFont("Tahoma", 10))
         
-        # Create tabs
+        # Create tabs; "Computer Name" is built on first activation
         self.tab_widget.addTab(self.create_general_tab(), "General")
-        self.tab_widget.addTab(self.create_computer_tab(), "Computer Name")
-        
+        self.computer_tab = QWidget()
+        QVBoxLayout(self.computer_tab).setContentsMargins(0, 0, 0, 0)
+        self.computer_tab_built = False
+        self.tab_widget.addTab(self.computer_tab, "Computer Name")
+        self.tab_widget.currentChanged.connect(self.ensure_tab_built)
+        self.processes_tab = self.create_processes_tab()
+        self.tab_widget.addTab(self.processes_tab, "Processes")
+        
+        # Hidden unless started with OPENABOUT_DIAGNOSTICS=1
+        self.diagnostics_tab = None
+        if diagnostics.enabled:
+            self.diagnostics_tab = self.create_diagnostics_tab()
+            self.tab_widget.addTab(self.diagnostics_tab, "Diagnostics")
+            
         layout.addWidget(self.tab_widget)
         
+    def ensure_tab_built(self, index):
+        """Build the Computer Name tab the first time it is shown"""
+        if index != 1 or self.computer_tab_built:
+            return
+        self.computer_tab.layout().addWidget(self.create_computer_tab())
+        self.computer_tab_built = True
+        if self.static_info is not None:
+            self.get_network_info(self.static_info)
+        
     def create_general_tab(self):
         """Create the General tab with dynamic system info"""
         tab = QWidget()
@@ -171,7 +1580,7 @@ class OpenAbout(QMainWindow):
         info_widget = QWidget()
         info_layout = QVBoxLayout(info_widget)
         
-        self.system_title = QLabel()
+        self.system_title = QLabel("Loading...")
         self.system_title.setFont(QFont("Tahoma", 12, QFont.Bold))
         info_layout.addWidget(self.system_title)
         
@@ -204,6 +1613,11 @@ class OpenAbout(QMainWindow):
         scroll.setFrameShape(QFrame.NoFrame)
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         
+        if self.painted:
+            scroll.setWidget(self.create_metrics_surface())
+            layout.addWidget(scroll, 1)
+            return tab
+            
         content = QWidget()
         scroll.setWidget(content)
         content_layout = QVBoxLayout(content)
@@ -243,9 +1657,24 @@ class OpenAbout(QMainWindow):
         self.cpu_progress = QProgressBar()
         self.cpu_progress.setTextVisible(True)
         cpu_usage_layout.addWidget(self.cpu_progress, 1)
+        self.cpu_sparkline = Sparkline(self.history, "cpu")
+        cpu_usage_layout.addWidget(self.cpu_sparkline)
         
         cpu_layout.addWidget(cpu_usage_widget)
         
+        # Per-core usage
+        cpu_cores_usage_widget = QWidget()
+        cpu_cores_usage_layout = QHBoxLayout(cpu_cores_usage_widget)
+        cpu_cores_usage_layout.setContentsMargins(5, 0, 5, 5)
+        
+        per_core_label = QLabel("Per core:")
+        per_core_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        cpu_cores_usage_layout.addWidget(per_core_label)
+        self.core_heat_map = CoreHeatMap()
+        cpu_cores_usage_layout.addWidget(self.core_heat_map, 1)
+        
+        cpu_layout.addWidget(cpu_cores_usage_widget)
+        
         # CPU frequency
         cpu_freq_widget = QWidget()
         cpu_freq_layout = QHBoxLayout(cpu_freq_widget)
@@ -287,6 +1716,8 @@ class OpenAbout(QMainWindow):
         self.mem_progress = QProgressBar()
         self.mem_progress.setTextVisible(True)
         mem_usage_layout.addWidget(self.mem_progress, 1)
+        self.memory_sparkline = Sparkline(self.history, "memory")
+        mem_usage_layout.addWidget(self.memory_sparkline)
         
         mem_layout.addWidget(mem_usage_widget)
         
@@ -332,6 +1763,8 @@ class OpenAbout(QMainWindow):
         self.disk_progress = QProgressBar()
         self.disk_progress.setTextVisible(True)
         disk_usage_layout.addWidget(self.disk_progress, 1)
+        self.disk_sparkline = Sparkline(self.history, "disk")
+        disk_usage_layout.addWidget(self.disk_sparkline)
         
         disk_layout.addWidget(disk_usage_widget)
         
@@ -351,6 +1784,11 @@ class OpenAbout(QMainWindow):
         
         storage_layout.addWidget(disk_widget)
         
+        # Per-device activity
+        storage_layout.addWidget(QLabel("Activity:"))
+        self.disk_io_model = self.create_disk_io_model()
+        storage_layout.addWidget(device_table(self.disk_io_model))
+        
         # All disks button
         disks_button = QPushButton("View All Disks...")
         disks_button.clicked.connect(self.show_all_disks)
@@ -383,6 +1821,55 @@ class OpenAbout(QMainWindow):
         
         return tab
         
+    def create_disk_io_model(self):
+        rate = lambda value: f"{self.format_bytes(value)}/s"
+        iops = lambda value: f"{value:.1f}"
+        return DeviceTableModel([
+            ("Device", str), ("Read", rate), ("Write", rate), ("Reads/s", iops), ("Writes/s", iops),
+            ("Busy", lambda value: "n/a" if value is None else f"{value:.0f}%"),
+        ])
+        
+    def create_metrics_surface(self):
+        """The General tab's groups painted by one MetricsSurface (--painted)
+        
+        Binds the same attribute names as the widget tree, so everything
+        that updates the General tab works unchanged.
+        """
+        surface = MetricsSurface()
+        
+        surface.group("Computer Information")
+        self.manufacturer_label = surface.text("Operating system or desktop:", f"{Os}")
+        
+        surface.group("Processor")
+        self.cpu_label = surface.text(None)
+        self.cpu_progress, self.cpu_sparkline = surface.bar("CPU Usage:", self.history, "cpu")
+        self.core_heat_map = surface.heat_map("Per core:")
+        self.cpu_freq_label = surface.text("Frequency:")
+        self.cpu_cores_label = surface.text("Cores:")
+        
+        surface.group("Memory (RAM)")
+        self.memory_label = surface.text(None)
+        self.mem_progress, self.memory_sparkline = surface.bar("Memory Usage:", self.history, "memory")
+        self.mem_available_label = surface.text("Available:")
+        self.mem_cached_label = surface.text("Cached:")
+        self.swap_total_label = surface.text("Swap Total:")
+        
+        surface.group("Storage")
+        self.disk_label = surface.text(None)
+        self.disk_progress, self.disk_sparkline = surface.bar("Disk Usage:", self.history, "disk")
+        self.disk_free_label = surface.text("Free:")
+        self.fs_label = surface.text("File System:")
+        self.disk_io_model = self.create_disk_io_model()
+        surface.widget("Activity:", device_table(self.disk_io_model))
+        disks_button = QPushButton("View All Disks...")
+        disks_button.clicked.connect(self.show_all_disks)
+        surface.widget(None, disks_button, Qt.AlignRight)
+        
+        surface.group("System Uptime")
+        self.uptime_label = surface.text(None)
+        self.boot_time_label = surface.text("Boot Time:")
+        return surface
+        
     def create_computer_tab(self):
         """Create the Computer Name tab"""
         tab = QWidget()
@@ -450,13 +1937,125 @@ class OpenAbout(QMainWindow):
         refresh_net_btn.clicked.connect(self.refresh_network_info)
         net_layout.addWidget(refresh_net_btn, 4, 0, 1, 2)
         
+        # Other machines running "main.py --agent"
+        fleet_btn = QPushButton("Fleet...")
+        fleet_btn.clicked.connect(self.show_fleet)
+        net_layout.addWidget(fleet_btn, 5, 0, 1, 2)
+        
         net_group.setLayout(net_layout)
         layout.addWidget(net_group)
         
+        # Per-interface activity
+        activity_group = QGroupBox("Network Activity")
+        activity_layout = QVBoxLayout()
+        
+        tracker = self.sampler.collector.net_io_tracker
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Show:"))
+        self.net_include_edit = QLineEdit(tracker.include)
+        self.net_include_edit.setPlaceholderText("all interfaces")
+        self.net_include_edit.setToolTip("Interface name patterns, e.g. eth*, wl*")
+        self.net_include_edit.editingFinished.connect(self.update_network_filter)
+        filter_layout.addWidget(self.net_include_edit)
+        filter_layout.addWidget(QLabel("Hide:"))
+        self.net_exclude_edit = QLineEdit(tracker.exclude)
+        self.net_exclude_edit.setPlaceholderText("none")
+        self.net_exclude_edit.setToolTip("Interface name patterns, e.g. lo, veth*, docker*")
+        self.net_exclude_edit.editingFinished.connect(self.update_network_filter)
+        filter_layout.addWidget(self.net_exclude_edit)
+        activity_layout.addLayout(filter_layout)
+        
+        rate = lambda value: f"{self.format_bytes(value)}/s"
+        per_second = lambda value: f"{value:.1f}"
+        self.net_io_model = DeviceTableModel([
+            ("Interface", str), ("Received", rate), ("Sent", rate), ("Pkts in/s", per_second),
+            ("Pkts out/s", per_second), ("Errors/s", per_second), ("Drops/s", per_second),
+        ])
+        activity_layout.addWidget(device_table(self.net_io_model))
+        
+        activity_group.setLayout(activity_layout)
+        layout.addWidget(activity_group)
+        
         layout.addStretch()
         
         return tab
         
+    def create_processes_tab(self):
+        """Create the Processes tab: the top processes by CPU or memory"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setContentsMargins(15, 15, 15, 15)
+        
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Show top:"))
+        self.process_limit_spin = QSpinBox()
+        self.process_limit_spin.setRange(5, 500)
+        self.process_limit_spin.setValue(25)  # ProcessTracker's default
+        self.process_limit_spin.valueChanged.connect(self.update_process_options)
+        controls_layout.addWidget(self.process_limit_spin)
+        controls_layout.addWidget(QLabel("by"))
+        self.process_key_combo = QComboBox()
+        self.process_key_combo.addItem("CPU", "cpu")
+        self.process_key_combo.addItem("Memory", "rss")
+        self.process_key_combo.currentIndexChanged.connect(self.update_process_options)
+        controls_layout.addWidget(self.process_key_combo)
+        controls_layout.addStretch()
+        self.process_count_label = QLabel()
+        controls_layout.addWidget(self.process_count_label)
+        layout.addLayout(controls_layout)
+        
+        self.process_model = ProcessTableModel(self.format_bytes)
+        self.process_proxy = QSortFilterProxyModel(self)
+        self.process_proxy.setSourceModel(self.process_model)
+        self.process_proxy.setSortRole(ProcessTableModel.SORT_ROLE)
+        self.process_proxy.setDynamicSortFilter(True)
+        
+        self.process_view = QTableView()
+        self.process_view.setModel(self.process_proxy)
+        self.process_view.setSortingEnabled(True)
+        self.process_view.sortByColumn(ProcessTableModel.CPU_COLUMN, Qt.DescendingOrder)
+        self.process_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.process_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.process_view.verticalHeader().setVisible(False)
+        self.process_view.verticalHeader().setDefaultSectionSize(20)
+        self.process_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.process_view)
+        
+        return tab
+        
+    def update_process_options(self):
+        """Pass the row limit and sort key to the sampler's process tracker"""
+        key = self.process_key_combo.currentData()
+        # Queued, so the sampler applies them between samples and the next sample uses them
+        self.process_options_changed.emit(self.process_limit_spin.value(), key)
+        column = ProcessTableModel.MEMORY_COLUMN if key == "rss" else ProcessTableModel.CPU_COLUMN
+        self.process_view.sortByColumn(column, Qt.DescendingOrder)
+        self.request_refresh()
+        
+    def create_diagnostics_tab(self):
+        """Create the Diagnostics tab: timing and failures of every instrumented step"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setContentsMargins(15, 15, 15, 15)
+        
+        columns = ["Step", "Calls", "Errors", "Last ms", "Mean ms", "p99 ms", "Last error"]
+        self.diagnostics_table = QTableWidget(0, len(columns))
+        self.diagnostics_table.setHorizontalHeaderLabels(columns)
+        self.diagnostics_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.diagnostics_table.verticalHeader().setVisible(False)
+        self.diagnostics_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.diagnostics_table)
+        
+        export_btn = QPushButton("Export JSON...")
+        export_btn.clicked.connect(self.export_diagnostics)
+        layout.addWidget(export_btn, 0, Qt.AlignRight)
+        
+        self.diagnostics_timer = QTimer(self)
+        self.diagnostics_timer.timeout.connect(self.refresh_diagnostics)
+        self.diagnostics_timer.start(1000)
+        
+        return tab
+        
     def create_buttons(self, layout):
         """Create the XP-style buttons"""
         button_widget = QWidget()
@@ -464,7 +2063,7 @@ class OpenAbout(QMainWindow):
         button_layout.setContentsMargins(15, 10, 15, 15)
         
         # Refresh button
-        refresh_btn = QPushButton("Refresh")
+        self.refresh_btn = refresh_btn = QPushButton("Refresh")
         refresh_btn.setIcon(QApplication.style().standardIcon(QStyle.SP_BrowserReload))
         refresh_btn.clicked.connect(self.update_all_info)
         refresh_btn.setFixedWidth(100)
@@ -489,321 +2088,371 @@ class OpenAbout(QMainWindow):
         
     def update_all_info(self):
         """Update all system information"""
+        # Explicit refresh: don't wait for slow tiers to come due
+        self.sampler.collector.scheduler.force()
+        self.request_refresh()
         self.update_static_info()
-        self.update_dynamic_info()
         
     def update_static_info(self):
-        """Update static system information"""
-        # System info
-        system = platform.system()
-        release = platform.release()
-        version = platform.version()
-        
-        if system == "Windows":
-            self.system_title.setText(f"Microsoft Windows {release}")
-            self.version_label.setText(f"Version {version}")
-        elif system == "Linux":
-            self.system_title.setText("Linux")
-            self.version_label.setText(f"{release} ({version})")
-        else:
-            self.system_title.setText(f"{system} {release}")
-            self.version_label.setText(version)
-        if Os != "":
-            self.manufacturer_label.setText(f"{Os}")
-            pass
-        else:
+        """Ask the sampler thread for the static system information"""
+        if self.replay is not None:
+            # The facts of the recorded machine
+            if self.replay.static is not None:
+                self.apply_static_info(self.replay.static)
+            return
+        if self.static_pending:
+            return
+        self.static_pending = True
+        self.static_requested.emit()
+        
+    def apply_static_info(self, info):
+        """Apply static system information (runs on the GUI thread)"""
+        with diagnostics.measure("ui.apply_static_info"):
+            self.static_pending = False
+            if info is None:
+                return
+            self.static_info = info
+        
+            # System info
+            system = info.system
+            release = info.release
+            version = info.version
+        
             if system == "Windows":
-                self.manufacturer_label.setText(f"Microsoft Windows {release}")
+                self.system_title.setText(f"Microsoft Windows {release}")
+                self.version_label.setText(f"Version {version}")
             elif system == "Linux":
-                self.manufacturer_label.setText("Linux")
+                self.system_title.setText("Linux")
+                self.version_label.setText(f"{release} ({version})")
             else:
-                self.manufacturer_label.setText(f"{system} {release}")
-        
-        # Manufacturer and model
-        self.get_system_manufacturer()
+                self.system_title.setText(f"{system} {release}")
+                self.version_label.setText(version)
+            if Os != "":
+                self.manufacturer_label.setText(f"{Os}")
+                pass
+            else:
+                if system == "Windows":
+                    self.manufacturer_label.setText(f"Microsoft Windows {release}")
+                elif system == "Linux":
+                    self.manufacturer_label.setText("Linux")
+                else:
+                    self.manufacturer_label.setText(f"{system} {release}")
         
-        # CPU info
-        self.get_cpu_info()
+            # CPU info
+            self.get_cpu_info(info)
         
-        # Memory info
-        self.get_memory_info()
+            # Memory info
+            self.get_memory_info(info)
         
-        # Network info
-        self.get_network_info()
+            # Network info
+            if self.computer_tab_built:
+                self.get_network_info(info)
+            
+            self.check_populated()
         
     def update_dynamic_info(self):
-        """Update dynamic system information"""
-        # CPU usage
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        self.cpu_progress.setValue(int(cpu_percent))
-        
-        # CPU frequency (dynamic)
-        try:
-            freq = psutil.cpu_freq()
-            if freq:
-                self.cpu_freq_label.setText(f"{freq.current:.0f} MHz")
-        except:
-            pass
-        
-        # Memory usage
-        mem = psutil.virtual_memory()
-        self.mem_progress.setValue(int(mem.percent))
-        self.mem_available_label.setText(self.format_bytes(mem.available))
-        self.mem_cached_label.setText(self.format_bytes(mem.cached if hasattr(mem, 'cached') else 0))
-        
-        # Swap memory
-        swap = psutil.swap_memory()
-        self.swap_total_label.setText(self.format_bytes(swap.total))
-        
-        # Disk usage
-        self.get_disk_info()
-        
-        # System uptime
-        self.get_uptime()
-        
-        # Network info updates
-        self.update_network_dynamic()
-        
-    def get_system_manufacturer(self):
-        """Get system manufacturer information"""
-        system = platform.system()
-        
-        try:
-            if system == "Windows":
-                try:
-                    import wmi
-                    c = wmi.WMI()
-                    for computer in c.Win32_ComputerSystem():
-                        # self.model_label.setText("unknown")
-                        pass
-                    for bios in c.Win32_BIOS():
-                        # self.bios_label.setText(bios.Caption or "Unknown")
-                        pass
-                except:
-                    pass
-                    # self.model_label.setText("Unknown")
-                    # self.bios_label.setText("BIOS")
-                    
-            elif system == "Linux":
-                # Try to read from DMI/sysfs
-                try:
-                    with open('/sys/class/dmi/id/sys_vendor', 'r') as f:
-                        pass
-                except:
-                    pass
-
-                try:
-                    with open('/sys/class/dmi/id/product_name', 'r') as f:
-                        # self.model_label.setText(f.read().strip() or "Unknown")
-                        pass
-                except:
-                    pass
-                    
-                try:
-                    with open('/sys/class/dmi/id/bios_version', 'r') as f:
-                        self.bios_label.setText(f.read().strip() or "BIOS")
-                except:
-                    self.bios_label.setText("BIOS")
-                    
-            else:  # macOS
-                # self.manufacturer_label.setText("Apple")
-                # self.model_label.setText("Mac")
-                # self.bios_label.setText("EFI")
-                pass
-                
-        except Exception as e:
-            # self.manufacturer_label.setText("Unknown")
-            # self.model_label.setText("Unknown")
-            pass
-            
-    def get_cpu_info(self):
-        """Get CPU information"""
-        try:
-            # Try to get detailed CPU info
-            cpu_data = cpuinfo.get_cpu_info()
-            brand = cpu_data.get('brand_raw', 'Unknown CPU')
-            self.cpu_label.setText(brand)
-            
-            # CPU cores
-            physical_cores = psutil.cpu_count(logical=False)
-            logical_cores = psutil.cpu_count(logical=True)
-            self.cpu_cores_label.setText(f"{physical_cores} physical, {logical_cores} logical")
-            
-            # Initial CPU frequency
-            freq = psutil.cpu_freq()
-            if freq:
-                self.cpu_freq_label.setText(f"{freq.current:.0f} MHz")
-            else:
-                self.cpu_freq_label.setText("Unknown")
-                
-        except Exception as e:
-            self.cpu_label.setText(platform.processor() or "Unknown CPU")
-            self.cpu_cores_label.setText(f"{psutil.cpu_count()} cores")
-            
-    def get_memory_info(self):
-        """Get memory information"""
-        try:
-            mem = psutil.virtual_memory()
-            total_gb = mem.total / (1024**3)
-            self.memory_label.setText(f"Total Physical Memory: {total_gb:.1f} GB")
-        except:
-            self.memory_label.setText("Memory: Unknown")
-            
-    def get_disk_info(self):
-        """Get disk information"""
-        try:
-            # Get primary disk (usually C:\ on Windows, / on Linux)
-            partitions = psutil.disk_partitions()
-            primary_partition = None
+        """Ask the sampler thread for a fresh snapshot of the visible and history metrics"""
+        if self.replay is not None:
+            # Newly shown widgets get the row being replayed
+            if self.replay_snapshot is not None:
+                self.apply_snapshot(self.replay_snapshot)
+            return
+        # Skip the tick if the previous sample has not come back yet
+        if self.sample_pending:
+            return
+        self.sample_pending = True
+        self.sample_requested.emit(self.visible_groups | HISTORY_GROUPS | self.alert_groups)
+        
+    def request_refresh(self):
+        """Sample now, or as soon as the outstanding snapshot arrives"""
+        if self.sample_pending:
+            self.sample_again = True
+        else:
+            self.update_dynamic_info()
             
-            for partition in partitions:
-                if platform.system() == "Windows":
-                    if partition.mountpoint == "C:\\":
-                        primary_partition = partition
-                        break
-                else:
-                    if partition.mountpoint == "/":
-                        primary_partition = partition
-                        break
+    def compute_visible_groups(self):
+        """Metric groups whose widgets are currently on screen"""
+        if not self.isVisible() or self.isMinimized():
+            return frozenset()
+        handle = self.windowHandle()
+        if handle is not None and not handle.isExposed():
+            return frozenset()
+        index = self.tab_widget.currentIndex()
+        if index == 0:
+            return GENERAL_TAB_GROUPS
+        if index == 1:
+            return COMPUTER_TAB_GROUPS
+        if self.tab_widget.currentWidget() is self.processes_tab:
+            return PROCESSES_TAB_GROUPS
+        # Diagnostics: keep every collector running so its stats stay current
+        return GENERAL_TAB_GROUPS | COMPUTER_TAB_GROUPS
+        
+    def update_visibility(self):
+        """Suspend sampling of hidden metrics and refresh newly shown ones right away"""
+        if self.closing:
+            return
+        visible = self.compute_visible_groups()
+        newly_visible = visible - self.visible_groups
+        self.visible_groups = visible
+        
+        # With nothing on screen only the history is fed, at a slower pace
+        self.update_timer.setInterval(2000 if visible else BACKGROUND_INTERVAL)
+        if not self.update_timer.isActive() and self.replay is None:
+            self.update_timer.start()
+        if newly_visible:
+            self.request_refresh()
             
-            if not primary_partition and partitions:
-                primary_partition = partitions[0]
+    def showEvent(self, event):
+        """Start sampling when the window is shown"""
+        super().showEvent(event)
+        handle = self.windowHandle()
+        if handle is not None and not self.expose_filter_installed:
+            # Expose events tell us when the window is obscured or uncovered
+            handle.installEventFilter(self)
+            self.expose_filter_installed = True
+        self.update_visibility()
+        
+    def hideEvent(self, event):
+        """Stop sampling while the window is hidden"""
+        super().hideEvent(event)
+        self.update_visibility()
+        
+    def changeEvent(self, event):
+        """Track minimise/restore"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_visibility()
             
-            if primary_partition:
-                usage = psutil.disk_usage(primary_partition.mountpoint)
+    def eventFilter(self, obj, event):
+        """Watch expose events on the native window"""
+        if obj == self.windowHandle() and event.type() == QEvent.Expose:
+            self.update_visibility()
+        return super().eventFilter(obj, event)
+        
+    def apply_snapshot(self, snapshot):
+        """Apply a sampled snapshot to the widgets (runs on the GUI thread)"""
+        with diagnostics.measure("ui.apply_snapshot"):
+            self.sample_pending = False
+            if self.sample_again:
+                self.sample_again = False
+                self.update_dynamic_info()
+            if snapshot is None:
+                return
                 
-                total_gb = usage.total / (1024**3)
-                free_gb = usage.free / (1024**3)
+            # History is recorded even while nothing is on screen; replay_to() fills it from the file
+            if self.replay is None:
+                self.history.add(snapshot.timestamp, {
+                    "cpu": snapshot.cpu_percent,
+                    "memory": snapshot.mem_percent,
+                    "disk": snapshot.disk.percent if snapshot.disk else 0.0,
+                })
+            if not self.visible_groups:
+                return
+            for sparkline in (self.cpu_sparkline, self.memory_sparkline, self.disk_sparkline):
+                sparkline.update()
                 
-                self.disk_label.setText(f"{primary_partition.device} ({primary_partition.mountpoint}) - {total_gb:.1f} GB")
-                self.disk_progress.setValue(int(usage.percent))
-                self.disk_free_label.setText(f"{free_gb:.1f} GB")
-                self.fs_label.setText(primary_partition.fstype)
+            # CPU usage
+            self.view.set_value(self.cpu_progress, int(snapshot.cpu_percent))
+            self.core_heat_map.set_values(snapshot.cpu_per_core, snapshot.cpu_freq_per_core)
+            
+            # CPU frequency (dynamic)
+            if snapshot.cpu_freq_per_core:
+                self.view.set_text(self.cpu_freq_label,
+                                   f"{snapshot.cpu_freq:.0f} MHz ({min(snapshot.cpu_freq_per_core)}"
+                                   f"-{max(snapshot.cpu_freq_per_core)} MHz across cores)")
+            elif snapshot.cpu_freq is not None:
+                self.view.set_text(self.cpu_freq_label, f"{snapshot.cpu_freq:.0f} MHz")
                 
-        except Exception as e:
-            self.disk_label.setText("Disk: Unknown")
-            self.disk_progress.setValue(0)
-            self.disk_free_label.setText("Unknown")
-            self.fs_label.setText("Unknown")
+            # Memory usage
+            self.view.set_value(self.mem_progress, int(snapshot.mem_percent))
+            self.view.set_text(self.mem_available_label, self.format_bytes(snapshot.mem_available))
+            self.view.set_text(self.mem_cached_label, self.format_bytes(snapshot.mem_cached))
             
-    def get_uptime(self):
-        """Get system uptime"""
-        try:
-            boot_time = psutil.boot_time()
-            uptime_seconds = time.time() - boot_time
-            uptime_str = str(timedelta(seconds=int(uptime_seconds)))
+            # Swap memory
+            self.view.set_text(self.swap_total_label, self.format_bytes(snapshot.swap_total))
             
-            self.uptime_label.setText(f"System has been running for {uptime_str}")
+            # Disk usage
+            self.get_disk_info(snapshot.disk)
+            self.disk_io_model.update(snapshot.disk_io)
             
-            boot_time_str = datetime.fromtimestamp(boot_time).strftime("%Y-%m-%d %H:%M:%S")
-            self.boot_time_label.setText(boot_time_str)
+            # System uptime
+            self.get_uptime(snapshot)
             
-        except:
-            self.uptime_label.setText("Uptime: Unknown")
-            self.boot_time_label.setText("Unknown")
+            # Network info updates
+            self.update_network_dynamic(snapshot)
             
-    def get_network_info(self):
-        """Get network information"""
-        try:
-            # Hostname
-            hostname = socket.gethostname()
-            self.hostname_label.setText(hostname)
-            self.full_name_label.setText(hostname)
-            
-            # Workgroup/Domain
-            if platform.system() == "Windows":
-                try:
-                    import wmi
-                    c = wmi.WMI()
-                    for computer in c.Win32_ComputerSystem():
-                        domain = computer.Domain or "WORKGROUP"
-                        self.workgroup_label.setText(domain)
-                except:
-                    self.workgroup_label.setText("WORKGROUP")
-            else:
-                self.workgroup_label.setText("WORKGROUP")
+            # Top processes, applied to the model as row inserts/removes/changes
+            if "processes" in self.visible_groups:
+                self.process_model.update(snapshot.processes)
+                self.view.set_text(self.process_count_label, f"{snapshot.process_count} processes")
                 
-            # IP and MAC address
-            self.update_network_dynamic()
+            # Sampling overhead per tier
+            costs = ", ".join(f"{tier} {seconds * 1000:.1f} ms" for tier, seconds in snapshot.tier_costs)
+            self.view.set_tooltip(self.refresh_btn, f"Sampling cost over the last minute: {costs}\n"
+                                                    f"Widget updates avoided: {self.view.updates_avoided}")
             
-            # Network interface count
-            net_if_addrs = psutil.net_if_addrs()
-            self.net_count_label.setText(str(len(net_if_addrs)))
+            # One batched write of everything that changed
+            self.view.commit()
             
-        except:
-            self.hostname_label.setText("Unknown")
-            self.full_name_label.setText("Unknown")
-            self.workgroup_label.setText("Unknown")
-            self.net_count_label.setText("0")
+            self.snapshot_applied = True
+            self.check_populated()
             
-    def update_network_dynamic(self):
-        """Update dynamic network information"""
+    def replay_to(self, row, jumped):
+        """Show a row of the replayed session, feeding the history with the rows up to it"""
+        reader = self.replay
+        columns = {"cpu": "cpu_percent", "memory": "mem_percent", "disk": "disk_percent"}
+        if jumped or self.replay_row is None or row < self.replay_row:
+            # Refill the history with what it would hold at this row, in bulk: a seek on a
+            # long session would otherwise add() up to a day of rows one by one
+            start = reader.find(reader.timestamp(row) - self.history.span())
+            self.history.load(reader.column("timestamp", start, row + 1),
+                              {metric: reader.column(name, start, row + 1) for metric, name in columns.items()})
+        else:
+            start = self.replay_row + 1
+            times = reader.column("timestamp", start, row + 1)
+            values = [reader.column(name, start, row + 1) for name in columns.values()]
+            for timestamp, *row_values in zip(times, *values):
+                self.history.add(timestamp, dict(zip(columns, row_values)))
+        self.replay_row = row
+        self.replay_snapshot = reader.snapshot(row)
+        self.apply_snapshot(self.replay_snapshot)
+        
+    def refresh_diagnostics(self):
+        """Fill the Diagnostics table while it is the current tab"""
+        if self.tab_widget.currentWidget() is not self.diagnostics_tab or not self.isVisible():
+            return
+        report = diagnostics.report()
+        table = self.diagnostics_table
+        table.setRowCount(len(report))
+        for row, (name, stats) in enumerate(report.items()):
+            values = [name, stats["count"], stats["errors"], f"{stats['last_ms']:.3f}",
+                      f"{stats['mean_ms']:.3f}", f"{stats['p99_ms']:.3f}", stats["last_error"] or ""]
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(str(value)))
+    
+    def export_diagnostics(self):
+        """Save the diagnostics report as JSON"""
+        path, _ = QFileDialog.getSaveFileName(self, "Export Diagnostics", "openabout-diagnostics.json",
+                                              "JSON files (*.json)")
+        if not path:
+            return
         try:
-            # Get primary IP address
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip_address = s.getsockname()[0]
-            s.close()
-            self.ip_label.setText(ip_address)
-            
-            # Get MAC address of primary interface
-            net_if_addrs = psutil.net_if_addrs()
-            mac_address = "Unknown"
-            
-            for interface, addrs in net_if_addrs.items():
-                for addr in addrs:
-                    if addr.family == psutil.AF_LINK and addr.address:
-                        mac_address = addr.address
-                        break
-                if mac_address != "Unknown":
-                    break
-            
-            self.mac_label.setText(mac_address)
+            diagnostics.export_json(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Diagnostics", f"Could not write {path}:\n{e}")
             
-        except Exception as e:
-            self.ip_label.setText("Unknown")
-            self.mac_label.setText("Unknown")
+    def event(self, event):
+        """Time the window's repaints (the backing store is flushed on UpdateRequest)"""
+        if diagnostics.enabled and event.type() == QEvent.UpdateRequest:
+            with diagnostics.measure("ui.repaint"):
+                return super().event(event)
+        return super().event(event)
+        
+    def check_populated(self):
+        """Record time-to-fully-populated once static info and a snapshot are both shown"""
+        if self.populated_at is not None or not self.snapshot_applied or self.static_info is None:
+            return
+        self.populated_at = time.perf_counter()
+        self.report_timing("fully populated", self.populated_at)
+        
+    def paintEvent(self, event):
+        """Record time-to-first-paint"""
+        super().paintEvent(event)
+        if self.first_paint_at is None:
+            self.first_paint_at = time.perf_counter()
+            self.report_timing("first paint", self.first_paint_at)
             
-    def show_all_disks(self):
-        """Show all disks in a dialog"""
-        dialog = QDialog(self)
-        dialog.setWindowTitle("All Disks")
-        dialog.setFixedSize(400, 300)
-        
-        layout = QVBoxLayout(dialog)
-        
-        text_edit = QTextEdit()
-        text_edit.setReadOnly(True)
-        
-        try:
-            partitions = psutil.disk_partitions()
-            disk_info = "Disk Partitions:\n\n"
-            
-            for partition in partitions:
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    disk_info += f"Device: {partition.device}\n"
-                    disk_info += f"Mountpoint: {partition.mountpoint}\n"
-                    disk_info += f"File System: {partition.fstype}\n"
-                    disk_info += f"Total: {self.format_bytes(usage.total)}\n"
-                    disk_info += f"Used: {self.format_bytes(usage.used)} ({usage.percent}%)\n"
-                    disk_info += f"Free: {self.format_bytes(usage.free)}\n"
-                    disk_info += "-" * 40 + "\n"
-                except:
-                    continue
-                    
-            text_edit.setText(disk_info)
-        except:
-            text_edit.setText("Unable to retrieve disk information")
+    def report_timing(self, what, at):
+        """Print a startup timing to stderr when OPENABOUT_TIMING is set"""
+        if os.environ.get("OPENABOUT_TIMING"):
+            print(f"{what}: {(at - LAUNCH_TIME) * 1000:.0f} ms", file=sys.stderr)
+            
+    def get_cpu_info(self, info):
+        """Show CPU information"""
+        self.cpu_label.setText(info.cpu_brand)
+        if info.physical_cores:
+            self.cpu_cores_label.setText(f"{info.physical_cores} physical, {info.logical_cores} logical")
+        else:
+            self.cpu_cores_label.setText(f"{info.logical_cores} cores")
+            
+    def get_memory_info(self, info):
+        """Show memory information"""
+        total_gb = info.memory_total / (1024**3)
+        self.memory_label.setText(f"Total Physical Memory: {total_gb:.1f} GB")
+        
+    def get_disk_info(self, disk):
+        """Show primary disk information from a DiskSnapshot"""
+        if disk is None:
+            self.view.set_text(self.disk_label, "Disk: Unknown")
+            self.view.set_value(self.disk_progress, 0)
+            self.view.set_text(self.disk_free_label, "Unknown")
+            self.view.set_text(self.fs_label, "Unknown")
+            return
+            
+        total_gb = disk.total / (1024**3)
+        free_gb = disk.free / (1024**3)
         
-        layout.addWidget(text_edit)
+        self.view.set_text(self.disk_label, f"{disk.device} ({disk.mountpoint}) - {total_gb:.1f} GB")
+        self.view.set_value(self.disk_progress, int(disk.percent))
+        self.view.set_text(self.disk_free_label, f"{free_gb:.1f} GB")
+        self.view.set_text(self.fs_label, disk.fstype)
+            
+    def get_uptime(self, snapshot):
+        """Show system uptime as of the snapshot"""
+        if snapshot.boot_time is None:
+            self.view.set_text(self.uptime_label, "Uptime: Unknown")
+            self.view.set_text(self.boot_time_label, "Unknown")
+            return
+            
+        uptime_seconds = snapshot.timestamp - snapshot.boot_time
+        uptime_str = str(timedelta(seconds=int(uptime_seconds)))
         
-        ok_btn = QPushButton("OK")
-        ok_btn.clicked.connect(dialog.accept)
-        layout.addWidget(ok_btn, 0, Qt.AlignRight)
+        self.view.set_text(self.uptime_label, f"System has been running for {uptime_str}")
         
+        boot_time_str = datetime.fromtimestamp(snapshot.boot_time).strftime("%Y-%m-%d %H:%M:%S")
+        self.view.set_text(self.boot_time_label, boot_time_str)
+            
+    def get_network_info(self, info):
+        """Show network information"""
+        hostname = info.hostname or "Unknown"
+        self.hostname_label.setText(hostname)
+        self.full_name_label.setText(hostname)
+        self.workgroup_label.setText(info.domain)
+        self.net_count_label.setText(str(info.interface_count))
+        
+    def update_network_filter(self):
+        """Pass the interface patterns to the sampler's network tracker"""
+        tracker = self.sampler.collector.net_io_tracker
+        include, exclude = self.net_include_edit.text(), self.net_exclude_edit.text()
+        if (include, exclude) == (tracker.include, tracker.exclude):
+            return
+        tracker.set_patterns(include, exclude)
+        
+    def update_network_dynamic(self, snapshot):
+        """Show IP and MAC address of the primary interface and per-interface activity from the snapshot"""
+        if not self.computer_tab_built:
+            return
+        self.net_io_model.update(snapshot.net_io)
+        if snapshot.ip_address and snapshot.interface:
+            self.view.set_text(self.ip_label, f"{snapshot.ip_address} ({snapshot.interface})")
+        else:
+            self.view.set_text(self.ip_label, snapshot.ip_address or "Unknown")
+        self.view.set_text(self.mac_label, snapshot.mac_address or "Unknown")
+            
+    def show_all_disks(self):
+        """Show all disks in a dialog"""
+        if self.disk_prober is None:
+            self.disk_prober = DiskUsageProber()
+        dialog = AllDisksDialog(self, self.disk_prober, self.format_bytes)
         dialog.exec()
         
+    def show_fleet(self):
+        """Show the fleet view; it keeps aggregating while hidden"""
+        if self.fleet_dialog is None:
+            self.fleet_dialog = FleetDialog(self)
+        self.fleet_dialog.show()
+        self.fleet_dialog.raise_()
+        
     def show_network_id(self):
         """Show network identification information"""
         QMessageBox.information(self, "Network ID", 
@@ -813,27 +2462,87 @@ class OpenAbout(QMainWindow):
         
     def refresh_network_info(self):
         """Refresh network information"""
-        self.get_network_info()
+        self.sampler.collector.network_resolver.invalidate()
+        self.sampler.collector.scheduler.force()
+        self.request_refresh()
+        self.update_static_info()
         QMessageBox.information(self, "Network Info", "Network information refreshed!")
         
+    def show_alert(self, event, firing):
+        """Notify about an alert rule that fired or cleared, from the tray if there is one"""
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            self.notifiers = reap(self.notifiers)
+            process = desktop_notify(event)
+            if process is not None:
+                self.notifiers.append(process)
+            return
+        if self.tray_icon is None:
+            self.tray_icon = QSystemTrayIcon(self.windowIcon(), self)
+            self.tray_icon.activated.connect(self.showNormal)
+            self.tray_icon.show()
+        self.tray_icon.setToolTip("\n".join(["OpenAbout alerts:"] + firing) if firing else "OpenAbout: no alerts")
+        self.tray_icon.showMessage("OpenAbout alert" if event.firing else "OpenAbout alert cleared", event.message,
+                                   QSystemTrayIcon.Warning if event.firing else QSystemTrayIcon.Information)
+    
+    def closeEvent(self, event):
+        """Stop the sampler thread before the window goes away"""
+        self.closing = True
+        self.update_timer.stop()
+        if self.fleet_dialog is not None:
+            self.fleet_dialog.stop()
+        self.sampler_thread.quit()
+        # Don't hang on exit if a psutil call is stuck
+        if not self.sampler_thread.wait(2000):
+            # It closes the recorder itself when the call returns; keep the
+            # QThread alive until then rather than destroying it mid-run
+            print("openabout: sampler still busy at exit", file=sys.stderr)
+            self.sampler_thread.setParent(None)
+            STRAY_THREADS.append(self.sampler_thread)
+        super().closeEvent(event)
+        
     def format_bytes(self, bytes_value):
         """Format bytes to human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_value < 1024.0:
-                return f"{bytes_value:.1f} {unit}"
-            bytes_value /= 1024.0
-        return f"{bytes_value:.1f} PB"
+        return format_bytes(bytes_value)
 
 def main():
-    app = QApplication(sys.argv)
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py", description="OpenAbout system properties.")
+    parser.add_argument("--replay", metavar="FILE", help="replay a session file recorded with --record")
+    parser.add_argument("--speed", type=float, default=60, metavar="X",
+                        help="initial replay speed (default 60x)")
+    parser.add_argument("--alerts", metavar="FILE", default=os.environ.get("OPENABOUT_ALERTS"),
+                        help="evaluate the alert rules in FILE (see alerts.py) against every snapshot")
+    parser.add_argument("--painted", action="store_true", default=bool(os.environ.get("OPENABOUT_PAINTED")),
+                        help="draw the General tab's metrics with one custom-painted widget "
+                             "(faster over remote X/VNC)")
+    # Anything else is for Qt
+    args, qt_args = parser.parse_known_args(sys.argv[1:])
+    replay = None
+    if args.replay:
+        try:
+            replay = SessionReader(args.replay)
+        except (OSError, ValueError) as e:
+            print(f"openabout: {args.replay}: {e}", file=sys.stderr)
+            sys.exit(1)
+    alerts = None
+    if args.alerts and replay is None:
+        try:
+            alerts = AlertEngine.load(args.alerts)
+        except (OSError, ValueError) as e:
+            print(f"openabout: {args.alerts}: {e}", file=sys.stderr)
+            sys.exit(1)
+            
+    app = QApplication(sys.argv[:1] + qt_args)
     
     # Set XP-like font
     font = QFont("Tahoma", 9)
     app.setFont(font)
     
     # Create and show window
-    window = OpenAbout()
+    window = OpenAbout(replay, args.speed, alerts, args.painted)
     window.show()
+    if replay is not None and len(replay):
+        window.replay_bar.seek(0)
     
     sys.exit(app.exec())
 
@@ -0,0 +1,328 @@
+"""Session recording: snapshots appended to a memory-mapped columnar file
+
+    python main.py --record night.oas --interval 2      record headless
+    OPENABOUT_RECORD=night.oas python main.py           record while the GUI runs
+    python main.py --replay night.oas                   replay in the GUI
+
+A session file is a fixed header followed by blocks of ROWS_PER_BLOCK
+snapshots. Inside a block every column (timestamp, CPU %, available
+memory, ...) is stored contiguously at a fixed width, the per-core columns
+as one fixed-width cell of logical_cores values. Appending a snapshot is a
+handful of struct.pack_into calls into the mapped block followed by
+bumping the row count in the header, so a recording cut short by a crash
+ends at its last complete row. Strings (disk device, interface, addresses)
+and the static facts are written once, into the header, from the first
+snapshot.
+
+Reading maps the file and parses only the header, so opening a week-long
+session costs the same as opening an empty one; rows are decoded only when
+asked for, and seeking by time is a binary search over the timestamps.
+
+    python recording.py --info night.oas
+
+prints what a session file holds.
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from sysinfo import DiskSnapshot, StaticInfo, SystemSnapshot
+
+MAGIC = b"OASESS01"
+# Header: magic, rows per block, cores, row count; then the length of the JSON metadata and the JSON
+HEADER = struct.Struct("<8sIIQ")
+COUNT_OFFSET = 16
+META_LENGTH = struct.Struct("<I")
+META_OFFSET = HEADER.size + META_LENGTH.size
+# A multiple of the mmap allocation granularity on every platform (64 KiB on Windows)
+HEADER_SIZE = 64 * 1024
+ROWS_PER_BLOCK = 4096
+
+# (name, struct code, one value per core); floats are NaN where the snapshot had None
+COLUMNS = (
+    ("timestamp", "d", False),
+    ("cpu_percent", "f", False),
+    ("cpu_freq", "f", False),
+    ("mem_percent", "f", False),
+    ("mem_available", "Q", False),
+    ("mem_cached", "Q", False),
+    ("swap_total", "Q", False),
+    ("swap_used", "Q", False),
+    ("disk_total", "Q", False),
+    ("disk_free", "Q", False),
+    ("disk_percent", "f", False),
+    ("boot_time", "d", False),
+    ("process_count", "I", False),
+    ("cpu_per_core", "f", True),
+    ("cpu_freq_per_core", "f", True),
+)
+
+def block_layout(cores, rows_per_block):
+    """({column: (offset in block, Struct)}, block size) for a session with this many cores"""
+    layout = {}
+    offset = 0
+    for name, code, per_core in COLUMNS:
+        cell = struct.Struct(f"<{cores if per_core else 1}{code}")
+        layout[name] = (offset, cell)
+        offset += cell.size * rows_per_block
+    # Each block is mapped on its own, so it starts on an allocation boundary
+    granularity = mmap.ALLOCATIONGRANULARITY
+    return layout, -(-offset // granularity) * granularity
+
+def fit(values, cores):
+    """Exactly cores floats: padded with NaN, or cut short (CPUs hot-plugged since the start)"""
+    values = list(values[:cores])
+    if len(values) < cores:
+        values.extend([math.nan] * (cores - len(values)))
+    return values
+
+class SessionWriter:
+    """Appends snapshots to a session file, creating it or continuing an existing one
+    
+    Only the block being filled is mapped. Raises ValueError if an existing
+    file isn't a session or was recorded with a different number of cores.
+    """
+    
+    def __init__(self, path, static, rows_per_block=ROWS_PER_BLOCK):
+        self.static = static
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            if os.fstat(self.fd).st_size < HEADER_SIZE:
+                self.cores = static.logical_cores or 1
+                self.rows_per_block = rows_per_block
+                self.count = 0
+                os.ftruncate(self.fd, HEADER_SIZE)
+                self.header = mmap.mmap(self.fd, HEADER_SIZE)
+                HEADER.pack_into(self.header, 0, MAGIC, rows_per_block, self.cores, 0)
+            else:
+                self.header = mmap.mmap(self.fd, HEADER_SIZE)
+                magic, self.rows_per_block, self.cores, self.count = HEADER.unpack_from(self.header)
+                if magic != MAGIC:
+                    raise ValueError(f"{path} is not an OpenAbout session file")
+                if self.cores != (static.logical_cores or 1):
+                    raise ValueError(f"{path} was recorded with {self.cores} cores, this machine has "
+                                     f"{static.logical_cores}")
+        except Exception:
+            os.close(self.fd)
+            raise
+        self.layout, self.block_size = block_layout(self.cores, self.rows_per_block)
+        self.cells = [self.layout[name] for name, code, per_core in COLUMNS]
+        self.block = None
+        self.block_index = -1
+        
+    def map_block(self, index):
+        """Grow the file to hold block index and map it"""
+        if self.block is not None:
+            self.block.close()
+        start = HEADER_SIZE + index * self.block_size
+        if os.fstat(self.fd).st_size < start + self.block_size:
+            os.ftruncate(self.fd, start + self.block_size)
+        self.block = mmap.mmap(self.fd, self.block_size, offset=start)
+        self.block_index = index
+        
+    def write_meta(self, snapshot):
+        """Static facts and the first snapshot's strings, into the header"""
+        disk = snapshot.disk
+        meta = json.dumps({
+            "static": self.static._asdict(),
+            "disk": [disk.device, disk.mountpoint, disk.fstype] if disk else None,
+            "interface": snapshot.interface,
+            "ip_address": snapshot.ip_address,
+            "mac_address": snapshot.mac_address,
+        }).encode("utf-8")
+        if META_OFFSET + len(meta) > HEADER_SIZE:
+            raise ValueError("session metadata does not fit in the header")
+        META_LENGTH.pack_into(self.header, HEADER.size, len(meta))
+        self.header[META_OFFSET:META_OFFSET + len(meta)] = meta
+        
+    def append(self, snapshot):
+        """Write one row and then publish it by bumping the row count"""
+        if self.count == 0:
+            self.write_meta(snapshot)
+        block, row = divmod(self.count, self.rows_per_block)
+        if block != self.block_index:
+            self.map_block(block)
+        disk = snapshot.disk
+        nan = math.nan
+        values = (
+            (snapshot.timestamp,),
+            (snapshot.cpu_percent,),
+            (nan if snapshot.cpu_freq is None else snapshot.cpu_freq,),
+            (snapshot.mem_percent,),
+            (snapshot.mem_available or 0,),
+            (snapshot.mem_cached or 0,),
+            (snapshot.swap_total or 0,),
+            (snapshot.swap_used or 0,),
+            (disk.total if disk else 0,),
+            (disk.free if disk else 0,),
+            (disk.percent if disk else 0.0,),
+            (snapshot.boot_time or nan,),
+            (snapshot.process_count,),
+            fit(snapshot.cpu_per_core, self.cores),
+            fit(snapshot.cpu_freq_per_core, self.cores),
+        )
+        block_map = self.block
+        for (offset, cell), value in zip(self.cells, values):
+            cell.pack_into(block_map, offset + row * cell.size, *value)
+        self.count += 1
+        struct.pack_into("<Q", self.header, COUNT_OFFSET, self.count)
+        
+    def close(self):
+        """Flush to disk and release the mappings"""
+        if self.block is not None:
+            self.block.flush()
+            self.block.close()
+            self.block = None
+        if self.header is not None:
+            self.header.flush()
+            self.header.close()
+            self.header = None
+            os.close(self.fd)
+
+class SessionReader:
+    """Random access to the rows of a session file without reading it in
+    
+    The row count is taken when the file is opened; rows appended by a
+    writer afterwards are not seen.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+                raise ValueError(f"{path} is not an OpenAbout session file")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.rows_per_block, self.cores, count = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            self.map.close()
+            raise ValueError(f"{path} is not an OpenAbout session file")
+        self.layout, self.block_size = block_layout(self.cores, self.rows_per_block)
+        # Rows of a block the file was not yet grown to hold can't be complete
+        self.count = min(count, (len(self.map) - HEADER_SIZE) // self.block_size * self.rows_per_block)
+        length, = META_LENGTH.unpack_from(self.map, HEADER.size)
+        meta = json.loads(bytes(self.map[META_OFFSET:META_OFFSET + length])) if length else {}
+        self.static = StaticInfo(**meta["static"]) if "static" in meta else None
+        self.disk_identity = meta.get("disk")
+        self.network = (meta.get("interface"), meta.get("ip_address"), meta.get("mac_address"))
+        
+    def __len__(self):
+        return self.count
+        
+    def value(self, name, row):
+        """One cell; a tuple for the per-core columns, else a number"""
+        offset, cell = self.layout[name]
+        block, row = divmod(row, self.rows_per_block)
+        values = cell.unpack_from(self.map, HEADER_SIZE + block * self.block_size + offset + row * cell.size)
+        return values if len(values) > 1 or name.endswith("per_core") else values[0]
+        
+    def column(self, name, start, stop):
+        """Values of a one-value column for rows start to stop, read block by block"""
+        offset, cell = self.layout[name]
+        values = []
+        while start < stop:
+            block, row = divmod(start, self.rows_per_block)
+            rows = min(stop - start, self.rows_per_block - row)
+            begin = HEADER_SIZE + block * self.block_size + offset + row * cell.size
+            values.extend(value for value, in cell.iter_unpack(self.map[begin:begin + rows * cell.size]))
+            start += rows
+        return values
+        
+    def timestamp(self, row):
+        return self.value("timestamp", row)
+        
+    def find(self, timestamp):
+        """Index of the last row at or before timestamp (0 if it is before the first)"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp(middle) <= timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return max(0, low - 1)
+        
+    def snapshot(self, row):
+        """Row as a SystemSnapshot; disk and network activity, processes and tier costs are not recorded"""
+        value = self.value
+        cpu_freq = value("cpu_freq", row)
+        per_core = value("cpu_per_core", row)
+        freqs = value("cpu_freq_per_core", row)
+        disk = None
+        disk_total = value("disk_total", row)
+        if disk_total and self.disk_identity:
+            disk = DiskSnapshot(*self.disk_identity, disk_total, value("disk_free", row),
+                                round(value("disk_percent", row), 1))
+        boot_time = value("boot_time", row)
+        return SystemSnapshot(
+            timestamp=value("timestamp", row),
+            cpu_percent=round(value("cpu_percent", row), 1),
+            cpu_per_core=tuple(round(percent, 1) for percent in per_core if percent == percent),
+            cpu_freq=None if math.isnan(cpu_freq) else cpu_freq,
+            cpu_freq_per_core=tuple(round(freq) for freq in freqs if freq == freq),
+            mem_percent=round(value("mem_percent", row), 1),
+            mem_available=value("mem_available", row),
+            mem_cached=value("mem_cached", row),
+            swap_total=value("swap_total", row),
+            swap_used=value("swap_used", row),
+            disk=disk,
+            disk_io=(),
+            boot_time=None if math.isnan(boot_time) else boot_time,
+            interface=self.network[0],
+            ip_address=self.network[1],
+            mac_address=self.network[2],
+            net_io=(),
+            process_count=value("process_count", row),
+            processes=(),
+            tier_costs=(),
+        )
+        
+    def close(self):
+        self.map.close()
+
+def record(path, interval):
+    """Headless recording loop for 'main.py --record'; runs until interrupted"""
+    import time
+    from sysinfo import Collector
+    collector = Collector()
+    try:
+        writer = SessionWriter(path, collector.static_info())
+    except (OSError, ValueError) as e:
+        print(f"openabout: {path}: {e}", file=sys.stderr)
+        return 1
+    print(f"Recording to {path} every {interval:g} s ({writer.count} rows already there)", file=sys.stderr)
+    try:
+        next_at = time.monotonic()
+        while True:
+            # The caller picked the cadence, so every group is refreshed each time
+            collector.scheduler.force()
+            writer.append(collector.snapshot())
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.monotonic()))
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        writer.close()
+
+def describe(path):
+    """Print what a session file holds"""
+    from datetime import datetime
+    reader = SessionReader(path)
+    print(f"{path}: {len(reader)} rows, {reader.cores} cores, {reader.rows_per_block} rows per block")
+    if reader.static:
+        print(f"recorded on {reader.static.hostname or 'unknown host'} ({reader.static.system} "
+              f"{reader.static.release})")
+    if len(reader):
+        first, last = reader.timestamp(0), reader.timestamp(len(reader) - 1)
+        print(f"from {datetime.fromtimestamp(first):%Y-%m-%d %H:%M:%S} "
+              f"to {datetime.fromtimestamp(last):%Y-%m-%d %H:%M:%S} ({last - first:.0f} s)")
+    reader.close()
+    return 0
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="OpenAbout session files.")
+    parser.add_argument("--info", metavar="FILE", required=True, help="describe a session file")
+    args = parser.parse_args()
+    sys.exit(describe(args.info))
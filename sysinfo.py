@@ -0,0 +1,1444 @@
+"""System information collection for OpenAbout, usable without Qt
+
+Everything here is plain Python on top of psutil so that the headless
+modes (cli.py) can run without importing PySide6. The GUI drives the same
+Collector from its sampler thread.
+"""
+import platform
+import psutil
+import socket
+import os
+import sys
+import fnmatch
+import heapq
+import json
+import operator
+import queue
+import re
+import select
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque, namedtuple
+from itertools import repeat
+
+# Immutable result of one sampling pass
+SystemSnapshot = namedtuple("SystemSnapshot", [
+    "timestamp", "cpu_percent", "cpu_per_core", "cpu_freq", "cpu_freq_per_core",
+    "mem_percent", "mem_available", "mem_cached", "swap_total", "swap_used",
+    "disk", "disk_io", "boot_time", "interface", "ip_address", "mac_address", "net_io",
+    "process_count", "processes",
+    "tier_costs",
+])
+# Facts that only change on reboot or hardware change
+StaticInfo = namedtuple("StaticInfo", [
+    "system", "release", "version",
+    "vendor", "model", "bios",
+    "cpu_brand", "physical_cores", "logical_cores", "memory_total",
+    "hostname", "domain", "interface_count",
+])
+DiskSnapshot = namedtuple("DiskSnapshot", ["device", "mountpoint", "fstype", "total", "free", "percent"])
+ProcessRow = namedtuple("ProcessRow", ["pid", "name", "username", "cmdline", "cpu_percent", "rss", "create_time"])
+# Per second since the previous sample; busy_percent is None where the OS doesn't report busy time
+DiskIoRow = namedtuple("DiskIoRow", ["device", "read_bytes", "write_bytes", "reads", "writes", "busy_percent"])
+# Per second since the previous sample; errors and drops count both directions
+NetIoRow = namedtuple("NetIoRow", ["interface", "received", "sent", "packets_received", "packets_sent",
+                                   "errors", "drops"])
+
+class CallStats:
+    """Call count, durations and failures of one instrumented step"""
+    # Durations kept for the p99
+    RECENT = 256
+    
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.recent = deque(maxlen=self.RECENT)
+        self.last_error = None
+        
+    def add(self, elapsed, error=None):
+        self.count += 1
+        self.total += elapsed
+        self.last = elapsed
+        self.recent.append(elapsed)
+        if error is not None:
+            self.errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            
+    def as_dict(self):
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "last_ms": round(self.last * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p99_ms": round(recent[min(len(recent) - 1, int(0.99 * len(recent)))] * 1000, 3) if recent else 0.0,
+            "last_error": self.last_error,
+        }
+
+class Measurement:
+    """Context manager timing one step into Diagnostics; exceptions are recorded, not swallowed"""
+    
+    def __init__(self, diagnostics, name):
+        self.diagnostics = diagnostics
+        self.name = name
+        
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+        
+    def __exit__(self, kind, error, traceback):
+        self.diagnostics.record(self.name, time.perf_counter() - self.start, error)
+        return False
+
+class NullMeasurement:
+    """Shared do-nothing stand-in for Measurement while diagnostics are off"""
+    
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, kind, error, traceback):
+        return False
+
+class Diagnostics:
+    """Per-step timing and failure statistics for the collectors and the UI
+    
+    Off unless OPENABOUT_DIAGNOSTICS=1 is set; while off, record() returns
+    at once and measure() hands out one shared no-op context manager, so the
+    instrumented code pays an attribute check per step.
+    """
+    
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.null = NullMeasurement()
+        
+    def record(self, name, elapsed, error=None):
+        """Add one run of a step (thread safe)"""
+        if not self.enabled:
+            return
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = CallStats()
+            stats.add(elapsed, error)
+            
+    def failed(self, name, error):
+        """Record an exception that was handled without timing the step"""
+        self.record(name + ".error", 0.0, error)
+        
+    def measure(self, name):
+        """with diagnostics.measure("step"): ..."""
+        return Measurement(self, name) if self.enabled else self.null
+        
+    def report(self):
+        """{step: stats dict}, sorted by step name"""
+        with self.lock:
+            return {name: self.stats[name].as_dict() for name in sorted(self.stats)}
+            
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump({"timestamp": time.time(), "steps": self.report()}, f, indent=1)
+
+diagnostics = Diagnostics(os.environ.get("OPENABOUT_DIAGNOSTICS") == "1")
+
+class PsutilBackend:
+    """Kernel counters through psutil; works everywhere"""
+    name = "psutil"
+    
+    def cpu_times(self):
+        """Per-CPU times, each with the _fields of psutil's scputimes"""
+        return psutil.cpu_times(percpu=True)
+        
+    def cpu_freq(self):
+        return psutil.cpu_freq(percpu=True)
+        
+    def virtual_memory(self):
+        return psutil.virtual_memory()
+        
+    def swap_memory(self):
+        return psutil.swap_memory()
+        
+    def boot_time(self):
+        return psutil.boot_time()
+        
+    def disk_io_counters(self):
+        """{device: counters} with read/write counts and bytes, and busy_time in ms where reported"""
+        return psutil.disk_io_counters(perdisk=True) or {}
+        
+    def net_io_counters(self):
+        """{interface: counters} with the fields of psutil's snetio"""
+        return psutil.net_io_counters(pernic=True) or {}
+
+PSUTIL_BACKEND = PsutilBackend()
+
+ProcCpuTimes = namedtuple("ProcCpuTimes", ["user", "nice", "system", "idle", "iowait", "irq", "softirq",
+                                           "steal", "guest", "guest_nice"])
+ProcCpuFreq = namedtuple("ProcCpuFreq", ["current", "min", "max"])
+ProcMemory = namedtuple("ProcMemory", ["total", "available", "percent", "used", "free", "buffers", "cached"])
+ProcSwap = namedtuple("ProcSwap", ["total", "used", "free", "percent"])
+ProcDiskIo = namedtuple("ProcDiskIo", ["read_count", "write_count", "read_bytes", "write_bytes", "busy_time"])
+ProcNetIo = namedtuple("ProcNetIo", ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+                                     "errin", "errout", "dropin", "dropout"])
+# /proc/diskstats counts 512-byte sectors whatever the device's sector size
+SECTOR_SIZE = 512
+# /proc/meminfo lines read by LinuxProcBackend, with the newline so "Cached:" doesn't match "SwapCached:"
+MEMINFO_FIELDS = (b"\nMemTotal:", b"\nMemFree:", b"\nMemAvailable:", b"\nBuffers:", b"\nCached:",
+                  b"\nSReclaimable:", b"\nSwapTotal:", b"\nSwapFree:")
+
+class LinuxProcBackend:
+    """Linux fast path: the same counters as PsutilBackend read straight from /proc and /sys
+    
+    /proc/stat, /proc/meminfo, /proc/diskstats, /proc/net/dev and the
+    per-CPU scaling_cur_freq files (or /proc/cpuinfo where there is no
+    cpufreq driver) are opened once. Each
+    read is a single preadv() into a buffer that is kept between calls, and
+    each file is parsed in one pass: /proc/stat yields the per-CPU times and
+    the boot time, /proc/meminfo both memory and swap. A file read within
+    REUSE_WINDOW seconds is not read again, so groups due on the same tick
+    share one read. Results match psutil's Linux formulas.
+    """
+    name = "procfs"
+    REUSE_WINDOW = 0.05
+    
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("the /proc fast path is Linux only")
+        self.ticks = os.sysconf("SC_CLK_TCK")
+        self.stat_fd = os.open("/proc/stat", os.O_RDONLY)
+        self.meminfo_fd = os.open("/proc/meminfo", os.O_RDONLY)
+        try:
+            self.diskstats_fd = os.open("/proc/diskstats", os.O_RDONLY)
+        except OSError:
+            self.diskstats_fd = None
+        try:
+            self.net_dev_fd = os.open("/proc/net/dev", os.O_RDONLY)
+        except OSError:
+            self.net_dev_fd = None
+        self.buffers = {}
+        self.stat = self.meminfo = None
+        self.stat_at = self.meminfo_at = -1.0
+        
+        # scaling_cur_freq per CPU in CPU order, else the "cpu MHz" lines of /proc/cpuinfo
+        self.freq_fds = []
+        self.freq_limits = []
+        cpu_dir = "/sys/devices/system/cpu"
+        try:
+            cpus = sorted((name for name in os.listdir(cpu_dir) if name[3:].isdigit() and name.startswith("cpu")),
+                          key=lambda name: int(name[3:]))
+        except OSError:
+            cpus = []
+        for cpu in cpus:
+            base = os.path.join(cpu_dir, cpu, "cpufreq")
+            try:
+                self.freq_fds.append(os.open(os.path.join(base, "scaling_cur_freq"), os.O_RDONLY))
+            except OSError:
+                continue
+            self.freq_limits.append(tuple(self.read_khz(os.path.join(base, name)) / 1000
+                                          for name in ("scaling_min_freq", "scaling_max_freq")))
+        self.cpuinfo_fd = None
+        if not self.freq_fds:
+            try:
+                self.cpuinfo_fd = os.open("/proc/cpuinfo", os.O_RDONLY)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def read_khz(path):
+        """One cpufreq limit in kHz, 0 if unavailable"""
+        try:
+            with open(path, 'rb') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return 0
+            
+    def read(self, fd, size=16384):
+        """Whole contents of a /proc or /sys file, through a reused buffer"""
+        buffer = self.buffers.get(fd)
+        if buffer is None:
+            buffer = self.buffers[fd] = bytearray(size)
+        while True:
+            length = os.preadv(fd, [buffer], 0)
+            if length < len(buffer):
+                return bytes(buffer[:length])
+            # Didn't fit (many CPUs): grow and read again
+            buffer = self.buffers[fd] = bytearray(len(buffer) * 2)
+            
+    def read_stat(self):
+        """(per-CPU ProcCpuTimes, boot time) from one read of /proc/stat"""
+        now = time.monotonic()
+        if now - self.stat_at > self.REUSE_WINDOW:
+            ticks = self.ticks
+            data = self.read(self.stat_fd)
+            # One "cpuN" line per CPU after the aggregate "cpu " line; the order of
+            # the other lines isn't guaranteed, so select by prefix
+            cpus = []
+            for line in data.split(b"\n"):
+                if not line.startswith(b"cpu") or line.startswith(b"cpu "):
+                    continue
+                values = [int(value) / ticks for value in line.split()[1:11]]
+                if len(values) < 10:
+                    values.extend([0.0] * (10 - len(values)))
+                cpus.append(ProcCpuTimes(*values))
+            start = data.find(b"\nbtime ") + 7
+            boot_time = float(data[start:data.index(b"\n", start)]) if start > 6 else None
+            self.stat = (cpus, boot_time)
+            self.stat_at = now
+        return self.stat
+        
+    def read_meminfo(self):
+        """{field: bytes} for the MEMINFO_FIELDS of /proc/meminfo"""
+        now = time.monotonic()
+        if now - self.meminfo_at > self.REUSE_WINDOW:
+            data = b"\n" + self.read(self.meminfo_fd, 8192)
+            fields = {}
+            # Finding the few fields needed is cheaper than splitting all ~50 lines
+            for key in MEMINFO_FIELDS:
+                start = data.find(key)
+                if start >= 0:
+                    start += len(key)
+                    # "\nMemTotal:       16318480 kB"
+                    fields[key[1:-1]] = int(data[start:data.index(b"k", start)]) * 1024
+            self.meminfo = fields
+            self.meminfo_at = now
+        return self.meminfo
+        
+    def cpu_times(self):
+        return self.read_stat()[0]
+        
+    def boot_time(self):
+        return self.read_stat()[1]
+        
+    def cpu_freq(self):
+        if self.freq_fds:
+            return [ProcCpuFreq(int(self.read(fd, 64)) / 1000, low, high)
+                    for fd, (low, high) in zip(self.freq_fds, self.freq_limits)]
+        if self.cpuinfo_fd is None:
+            return []
+        return [ProcCpuFreq(float(line.split(b":")[1]), 0.0, 0.0)
+                for line in self.read(self.cpuinfo_fd, 65536).split(b"\n") if line.startswith(b"cpu MHz")]
+    
+    def disk_io_counters(self):
+        """{device name as bytes: ProcDiskIo}; the tracker decodes names once per device"""
+        if self.diskstats_fd is None:
+            return PSUTIL_BACKEND.disk_io_counters()
+        counters = {}
+        for line in self.read(self.diskstats_fd).split(b"\n"):
+            # major minor name reads merged sectors ms writes merged sectors ms in-flight busy-ms ...
+            fields = line.split()
+            if len(fields) >= 14:
+                counters[fields[2]] = ProcDiskIo(int(fields[3]), int(fields[7]), int(fields[5]) * SECTOR_SIZE,
+                                                 int(fields[9]) * SECTOR_SIZE, int(fields[12]))
+        return counters
+        
+    def net_io_counters(self):
+        """{interface name as bytes: ProcNetIo}"""
+        if self.net_dev_fd is None:
+            return PSUTIL_BACKEND.net_io_counters()
+        counters = {}
+        # Two header lines, then "  eth0: rx bytes packets errs drop ... tx bytes packets errs drop ..."
+        for line in self.read(self.net_dev_fd, 65536).split(b"\n")[2:]:
+            name, _, values = line.partition(b":")
+            fields = values.split()
+            if len(fields) >= 12:
+                counters[name.strip()] = ProcNetIo(int(fields[8]), int(fields[0]), int(fields[9]), int(fields[1]),
+                                                   int(fields[2]), int(fields[10]), int(fields[3]), int(fields[11]))
+        return counters
+        
+    def virtual_memory(self):
+        m = self.read_meminfo()
+        total = m[b"MemTotal"]
+        free = m.get(b"MemFree", 0)
+        buffers = m.get(b"Buffers", 0)
+        # psutil counts reclaimable slab as cache
+        cached = m.get(b"Cached", 0) + m.get(b"SReclaimable", 0)
+        available = m.get(b"MemAvailable", free + buffers + cached)
+        # As psutil computes it since 6.0, matching "free"
+        used = total - available
+        percent = round(100.0 * (total - available) / total, 1) if total else 0.0
+        return ProcMemory(total, available, percent, used, free, buffers, cached)
+        
+    def swap_memory(self):
+        m = self.read_meminfo()
+        total = m.get(b"SwapTotal", 0)
+        free = m.get(b"SwapFree", 0)
+        used = total - free
+        return ProcSwap(total, used, free, round(100.0 * used / total, 1) if total else 0.0)
+
+def select_backend():
+    """The Linux /proc fast path where available, psutil otherwise or with OPENABOUT_BACKEND=psutil"""
+    if os.environ.get("OPENABOUT_BACKEND", "").lower() != "psutil":
+        try:
+            return LinuxProcBackend()
+        except (OSError, ValueError):
+            pass
+    return PSUTIL_BACKEND
+
+class CpuUsageTracker:
+    """CPU utilisation from cpu_times deltas between successive calls
+    
+    Unlike psutil.cpu_percent(interval=...) this never sleeps; each reading
+    covers the whole period since the previous one. The very first reading
+    is the average since boot.
+    """
+    
+    def __init__(self, backend=PSUTIL_BACKEND):
+        self.backend = backend
+        self.previous = None
+        
+    @staticmethod
+    def _split(cpus):
+        """Return (busy, total) seconds per CPU as two lists
+        
+        Works column-wise: the counters are transposed once and combined with
+        map(), so the per-CPU work happens in C rather than in a Python loop.
+        """
+        fields = cpus[0]._fields
+        columns = dict(zip(fields, zip(*cpus)))
+        totals = list(map(sum, cpus))
+        # guest time is already accounted for in user/nice on Linux
+        for name in ('guest', 'guest_nice'):
+            if name in columns:
+                totals = list(map(operator.sub, totals, columns[name]))
+        idle = columns['idle']
+        if 'iowait' in columns:
+            idle = map(operator.add, idle, columns['iowait'])
+        return list(map(operator.sub, totals, idle)), totals
+        
+    def sample(self):
+        """Return (total_percent, per_core_percents) since the last call"""
+        cpus = self.backend.cpu_times()
+        if not cpus:
+            return 0.0, ()
+        busy, total = self._split(cpus)
+        previous = self.previous
+        if previous is None or len(previous[0]) != len(busy):
+            # First call or CPU hot-plug: measure from boot
+            previous = ([0.0] * len(busy), [0.0] * len(busy))
+        self.previous = (busy, total)
+        
+        busy_deltas = list(map(operator.sub, busy, previous[0]))
+        total_deltas = list(map(operator.sub, total, previous[1]))
+        # Rounded to 0.1 by hand; round(x, 1) costs several times more per core
+        per_core = tuple(min(int(1000.0 * b / t + 0.5) / 10, 100.0) if t > 0 and b > 0 else 0.0
+                         for b, t in zip(busy_deltas, total_deltas))
+        
+        busy_sum = sum(map(max, busy_deltas, repeat(0.0)))
+        total_sum = sum(total_deltas)
+        total_percent = min(100.0 * busy_sum / total_sum, 100.0) if total_sum > 0 else 0.0
+        return round(total_percent, 1), per_core
+
+class PrimaryPartitionCache:
+    """Remembers the primary partition and rescans only when the mount table changes
+    
+    On Linux the kernel flags /proc/self/mountinfo with POLLPRI whenever a
+    mount is added or removed, so checking for changes is a single
+    non-blocking poll(). Elsewhere the scan is simply redone every
+    RESCAN_INTERVAL seconds.
+    """
+    RESCAN_INTERVAL = 30
+    
+    def __init__(self):
+        self.root = "C:\\" if platform.system() == "Windows" else "/"
+        self.partition = None
+        self.scanned_at = 0.0
+        self.poller = None
+        try:
+            self.mountinfo_fd = os.open('/proc/self/mountinfo', os.O_RDONLY)
+            self.poller = select.poll()
+            self.poller.register(self.mountinfo_fd, select.POLLPRI | select.POLLERR)
+        except (OSError, AttributeError):
+            self.poller = None
+            
+    def mounts_changed(self):
+        """Cheap check whether the mount table may have changed since the last scan"""
+        if self.poller is not None:
+            return bool(self.poller.poll(0))
+        return time.monotonic() - self.scanned_at >= self.RESCAN_INTERVAL
+        
+    def scan(self):
+        """Find the primary partition in psutil.disk_partitions()"""
+        with diagnostics.measure("disk.partitions"):
+            partitions = psutil.disk_partitions()
+        for partition in partitions:
+            if partition.mountpoint == self.root:
+                return partition
+        return partitions[0] if partitions else None
+        
+    def get(self):
+        """Return the cached primary partition, rescanning if needed"""
+        # Always poll so a pending change notification is consumed
+        changed = self.mounts_changed()
+        if self.partition is None or changed:
+            self.partition = self.scan()
+            self.scanned_at = time.monotonic()
+        return self.partition
+        
+    def invalidate(self):
+        """Force a rescan on the next get()"""
+        self.partition = None
+
+def collect_disk(partition_cache):
+    """Collect usage of the primary disk (C:\\ on Windows, / elsewhere)"""
+    try:
+        partition = partition_cache.get()
+        if partition:
+            usage = psutil.disk_usage(partition.mountpoint)
+            return DiskSnapshot(partition.device, partition.mountpoint,
+                                partition.fstype, usage.total, usage.free, usage.percent)
+    except Exception as e:
+        # The mount may have vanished; look it up again next time
+        diagnostics.failed("collect.disk", e)
+        partition_cache.invalidate()
+    return None
+
+class NetworkIdentityResolver:
+    """Finds the primary network interface and caches its IP and MAC address
+    
+    The interface is taken from the default route in /proc/net/route. On
+    Linux a netlink socket subscribed to link, address and route events tells
+    us when to look again; elsewhere the lookup is repeated every
+    REFRESH_INTERVAL seconds.
+    """
+    REFRESH_INTERVAL = 60
+    # RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE
+    NETLINK_GROUPS = 0x01 | 0x10 | 0x40
+    
+    def __init__(self):
+        self.identity = (None, None, None)
+        self.resolved_at = 0.0
+        self.stale = True
+        try:
+            self.netlink = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            self.netlink.bind((0, self.NETLINK_GROUPS))
+            self.netlink.setblocking(False)
+        except (OSError, AttributeError):
+            self.netlink = None
+            
+    def changed(self):
+        """Drain pending netlink events; True if the interface or address set changed"""
+        if self.netlink is None:
+            return time.monotonic() - self.resolved_at >= self.REFRESH_INTERVAL
+        changed = False
+        try:
+            while True:
+                self.netlink.recv(65536)
+                changed = True
+        except BlockingIOError:
+            pass
+        except OSError:
+            # ENOBUFS after an event storm: we lost events, so assume a change
+            changed = True
+        return changed
+        
+    def invalidate(self):
+        """Force a new lookup on the next get() (safe to call from any thread)"""
+        self.stale = True
+        
+    @staticmethod
+    def default_route_interface():
+        """Interface of the lowest-metric IPv4 default route, or None"""
+        try:
+            with open('/proc/net/route') as f:
+                next(f)
+                best = None
+                for line in f:
+                    fields = line.split()
+                    # Destination 0.0.0.0 with RTF_UP set
+                    if len(fields) < 8 or fields[1] != '00000000' or not int(fields[3], 16) & 0x1:
+                        continue
+                    metric = int(fields[6])
+                    if best is None or metric < best[0]:
+                        best = (metric, fields[0])
+                return best[1] if best else None
+        except (OSError, ValueError, StopIteration):
+            return None
+            
+    @staticmethod
+    def outbound_ip():
+        """IP the OS would use for outbound traffic (no packets are sent)"""
+        try:
+            with diagnostics.measure("network.outbound_ip"):
+                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                try:
+                    s.connect(("8.8.8.8", 80))
+                    return s.getsockname()[0]
+                finally:
+                    s.close()
+        except OSError:
+            return None
+            
+    def resolve(self):
+        """Look up (interface, ip, mac) of the primary interface"""
+        net_if_addrs = psutil.net_if_addrs()
+        interface = self.default_route_interface()
+        
+        if interface not in net_if_addrs:
+            # No routing table to read (non-Linux) or no default route (air-gapped)
+            ip_address = self.outbound_ip()
+            interface = None
+            for name, addrs in net_if_addrs.items():
+                ipv4 = [addr.address for addr in addrs if addr.family == socket.AF_INET]
+                if ip_address in ipv4 or (ip_address is None and ipv4 and not ipv4[0].startswith("127.")):
+                    interface = name
+                    break
+            if interface is None:
+                return None, ip_address, None
+                
+        addrs = net_if_addrs[interface]
+        ip_address = next((addr.address for addr in addrs if addr.family == socket.AF_INET), None)
+        mac_address = next((addr.address for addr in addrs
+                            if addr.family == psutil.AF_LINK and addr.address), None)
+        return interface, ip_address, mac_address
+        
+    def get(self):
+        """Return the cached (interface, ip, mac), refreshing it if something changed"""
+        changed = self.changed()
+        if self.stale or changed:
+            self.stale = False
+            try:
+                self.identity = self.resolve()
+            except Exception as e:
+                diagnostics.failed("collect.network", e)
+                self.identity = (None, None, None)
+            self.resolved_at = time.monotonic()
+        return self.identity
+
+class MetricGroup:
+    """One independently scheduled collector with its refresh interval and cost tier"""
+    
+    def __init__(self, name, interval, tier, collect, default=None, max_duty=None):
+        self.name = name
+        self.interval = interval
+        # Largest fraction of wall time the group may take; a slow run stretches its interval
+        self.max_duty = max_duty
+        self.tier = tier
+        self.collect = collect
+        self.value = default
+        self.next_due = 0.0
+        self.suspended = False
+
+class RefreshScheduler:
+    """Runs metric groups only when they are due and accounts their cost per tier"""
+    COST_WINDOW = 60
+    # Timer jitter allowance, so a 2 s group isn't skipped on a 1.99 s tick
+    SLACK = 0.25
+    
+    def __init__(self, groups):
+        self.groups = groups
+        self.costs = {}
+        # Set by force(), from any thread, and consumed by the next run_due
+        self.force_requested = threading.Event()
+        
+    def force(self):
+        """Make every group due on the next run; may be called from another thread"""
+        self.force_requested.set()
+        
+    def run_due(self, visible):
+        """Run due collectors among the visible groups and return the latest value of every group by name
+        
+        Groups not in visible are suspended; they run immediately once they
+        become visible again.
+        """
+        now = time.monotonic()
+        # Cleared before any group runs, so a force() that lands mid-run is kept for the next one
+        forced = self.force_requested.is_set()
+        if forced:
+            self.force_requested.clear()
+        for group in self.groups:
+            if group.name not in visible:
+                group.suspended = True
+                continue
+            if not (forced or group.suspended) and group.next_due - now > self.SLACK:
+                continue
+            group.suspended = False
+            start = time.perf_counter()
+            error = None
+            try:
+                group.value = group.collect()
+            except Exception as e:
+                # Keep showing the last good value
+                error = e
+            elapsed = time.perf_counter() - start
+            self.record(group.tier, now, elapsed)
+            diagnostics.record("collect." + group.name, elapsed, error)
+            interval = group.interval
+            if group.max_duty:
+                interval = max(interval, elapsed / group.max_duty)
+            group.next_due = now + interval
+        return {group.name: group.value for group in self.groups}
+        
+    def record(self, tier, now, elapsed):
+        """Remember the cost of one collector run"""
+        samples = self.costs.setdefault(tier, deque())
+        samples.append((now, elapsed))
+        while samples and samples[0][0] <= now - self.COST_WINDOW:
+            samples.popleft()
+            
+    def cost_per_minute(self):
+        """Seconds spent in each tier over the last minute, as sorted (tier, seconds) pairs"""
+        cutoff = time.monotonic() - self.COST_WINDOW
+        return tuple(sorted(
+            (tier, sum(elapsed for at, elapsed in samples if at > cutoff))
+            for tier, samples in self.costs.items()
+        ))
+
+class ProcessTracker:
+    """Top processes by CPU or resident memory, with a PID-keyed cache of static attributes
+    
+    Each tick process_iter() reads only the counter being sorted on (plus
+    create_time, which psutil caches per Process). Name, user and command
+    line are fetched once, and only for processes that make it into the top
+    limit; a PID whose create_time changed was reused and is read again.
+    limit and key ("cpu" or "rss") may be changed between samples, on the
+    thread that calls sample().
+    """
+    STATIC = ["name", "username", "cmdline"]
+    
+    def __init__(self, limit=25, key="cpu"):
+        self.limit = limit
+        self.key = key
+        # pid -> (create_time, name, username, cmdline)
+        self.static = {}
+        # pid -> (create_time, cpu seconds) at the previous sample
+        self.previous = {}
+        self.previous_at = None
+        
+    def cpu_percent(self, pid, create_time, times, elapsed, current):
+        """CPU use since the previous sample (100 = one core); records times in current"""
+        cpu = times.user + times.system
+        current[pid] = (create_time, cpu)
+        before = self.previous.get(pid)
+        if elapsed and before is not None and before[0] == create_time:
+            return 100.0 * (cpu - before[1]) / elapsed
+        return 0.0
+        
+    def sample(self):
+        """Return (number of processes, top ProcessRows sorted by key)"""
+        now = time.monotonic()
+        elapsed = now - self.previous_at if self.previous_at is not None else None
+        current = {}
+        by_rss = self.key == "rss"
+        
+        # Only the counter being sorted on is read for every process
+        entries = []
+        for proc in psutil.process_iter(["memory_info" if by_rss else "cpu_times", "create_time"], ad_value=None):
+            info = proc.info
+            if by_rss:
+                memory = info["memory_info"]
+                if memory is not None:
+                    entries.append((memory.rss, proc.pid, info["create_time"], proc))
+            elif info["cpu_times"] is not None:
+                percent = self.cpu_percent(proc.pid, info["create_time"], info["cpu_times"], elapsed, current)
+                entries.append((percent, proc.pid, info["create_time"], proc))
+                
+        # ...and the other one for the top rows alone
+        rows = []
+        for value, pid, create_time, proc in heapq.nlargest(self.limit, entries, key=operator.itemgetter(0)):
+            try:
+                if by_rss:
+                    rss = value
+                    percent = self.cpu_percent(pid, create_time, proc.cpu_times(), elapsed, current)
+                else:
+                    percent = value
+                    rss = proc.memory_info().rss
+            except psutil.Error:
+                continue
+            static = self.static.get(pid)
+            if static is None or static[0] != create_time:
+                try:
+                    info = proc.as_dict(self.STATIC, ad_value=None)
+                except psutil.Error:
+                    info = {}
+                cmdline = info.get("cmdline")
+                static = (create_time, info.get("name") or "", info.get("username") or "",
+                          " ".join(cmdline) if cmdline else "")
+                self.static[pid] = static
+            rows.append(ProcessRow(pid, static[1], static[2], static[3], round(percent, 1), rss, create_time))
+        self.previous = current
+        self.previous_at = now
+        
+        # Forget processes that have exited
+        alive = {entry[1] for entry in entries}
+        for pid in self.static.keys() - alive:
+            del self.static[pid]
+        return len(entries), tuple(rows)
+
+# Block devices left out of the disk activity panel
+DISK_IO_EXCLUDED = ("loop", "ram", "zram", "dm-")
+
+class DiskIoTracker:
+    """Per-device throughput, IOPS and busy time from successive disk I/O counters
+    
+    Each tick reads the counters of every device in one call and does one
+    dict lookup per device to find whether it is shown: which devices to
+    show (no loop, ram, zram or device-mapper devices, and on Linux no
+    partitions, whose I/O their disk already counts) is decided once, when
+    a device is first seen.
+    """
+    # Whole disks are the entries of /sys/block, where there is one
+    WHOLE_DISKS_ONLY = os.path.isdir("/sys/block")
+    
+    def __init__(self, backend=PSUTIL_BACKEND):
+        self.backend = backend
+        # counters key -> display name, None for devices that aren't shown
+        self.names = {}
+        self.previous = {}
+        self.previous_at = None
+        
+    def device_name(self, key):
+        """Display name for a new counters key, or None to leave it out"""
+        name = key.decode("utf-8", "replace") if isinstance(key, bytes) else key
+        if name.startswith(DISK_IO_EXCLUDED):
+            name = None
+        elif self.WHOLE_DISKS_ONLY and not os.path.exists("/sys/block/" + name.replace("/", "!")):
+            name = None
+        self.names[key] = name
+        return name
+        
+    def sample(self):
+        """DiskIoRows of the shown devices since the previous sample; () on the first"""
+        now = time.monotonic()
+        elapsed = now - self.previous_at if self.previous_at is not None else None
+        names = self.names
+        previous = self.previous
+        current = {}
+        rows = []
+        counters = self.backend.disk_io_counters()
+        for key, io in counters.items():
+            name = names[key] if key in names else self.device_name(key)
+            if name is None:
+                continue
+            current[key] = io
+            before = previous.get(key)
+            if before is None or not elapsed:
+                continue
+            busy = getattr(io, "busy_time", None)
+            rows.append(DiskIoRow(
+                name,
+                # Counters go backwards if a device is replaced under the same name
+                round(max(0, io.read_bytes - before.read_bytes) / elapsed),
+                round(max(0, io.write_bytes - before.write_bytes) / elapsed),
+                round(max(0, io.read_count - before.read_count) / elapsed, 1),
+                round(max(0, io.write_count - before.write_count) / elapsed, 1),
+                None if busy is None else round(min(100.0, max(0, busy - before.busy_time) / (elapsed * 10)), 1),
+            ))
+        if len(names) > 2 * len(counters):
+            # Forget devices that have gone away, so hotplug churn doesn't grow the cache forever
+            self.names = {key: name for key, name in names.items() if key in counters}
+        self.previous = current
+        self.previous_at = now
+        return tuple(rows)
+
+# Interfaces left out of the network activity table unless patterns are given
+DEFAULT_NET_EXCLUDE = "lo"
+
+def compile_patterns(text):
+    """Comma or space separated glob patterns as one compiled regex, None if there are none"""
+    patterns = [pattern for pattern in re.split(r"[,\s]+", text or "") if pattern]
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+class NetIoTracker:
+    """Per-interface byte, packet, error and drop rates from successive network I/O counters
+    
+    Interfaces are chosen with include and exclude glob patterns ("eth*,
+    wl*"; exclude wins, an empty include means all), compiled once each
+    time they are set. Whether an interface is shown is decided when it is
+    first seen, and an interface whose counters didn't move reuses its
+    all-zero row, so thousands of quiet veth interfaces cost a dict lookup
+    and a tuple comparison each per tick. Patterns may be changed from
+    another thread between samples.
+    """
+    
+    def __init__(self, backend=PSUTIL_BACKEND, include="", exclude=DEFAULT_NET_EXCLUDE):
+        self.backend = backend
+        self.previous = {}
+        self.previous_at = None
+        self.set_patterns(include, exclude)
+        
+    def set_patterns(self, include, exclude):
+        self.include = include
+        self.exclude = exclude
+        # One assignment, so a sample in progress sees the old rules or the new ones, never a mix;
+        # the dict maps counters key -> (display name, idle row), or None if not shown
+        self.filters = (compile_patterns(include), compile_patterns(exclude), {})
+        
+    @staticmethod
+    def interface_name(key, include, exclude, names):
+        """(display name, idle row) for a new counters key, or None to leave it out"""
+        name = key.decode("utf-8", "replace") if isinstance(key, bytes) else key
+        shown = (include is None or include.match(name)) and not (exclude is not None and exclude.match(name))
+        names[key] = entry = (name, NetIoRow(name, 0, 0, 0.0, 0.0, 0.0, 0.0)) if shown else None
+        return entry
+        
+    def sample(self):
+        """NetIoRows of the shown interfaces since the previous sample; () on the first"""
+        now = time.monotonic()
+        elapsed = now - self.previous_at if self.previous_at is not None else None
+        include, exclude, names = self.filters
+        previous = self.previous
+        current = {}
+        rows = []
+        counters = self.backend.net_io_counters()
+        for key, io in counters.items():
+            entry = names[key] if key in names else self.interface_name(key, include, exclude, names)
+            if entry is None:
+                continue
+            current[key] = io
+            before = previous.get(key)
+            if before is None or not elapsed:
+                continue
+            if io == before:
+                rows.append(entry[1])
+                continue
+            # Counters go backwards if an interface is recreated under the same name
+            rows.append(NetIoRow(
+                entry[0],
+                round(max(0, io.bytes_recv - before.bytes_recv) / elapsed),
+                round(max(0, io.bytes_sent - before.bytes_sent) / elapsed),
+                round(max(0, io.packets_recv - before.packets_recv) / elapsed, 1),
+                round(max(0, io.packets_sent - before.packets_sent) / elapsed, 1),
+                round(max(0, io.errin + io.errout - before.errin - before.errout) / elapsed, 1),
+                round(max(0, io.dropin + io.dropout - before.dropin - before.dropout) / elapsed, 1),
+            ))
+        if len(names) > 2 * len(counters):
+            # Forget interfaces that have gone away, so veth churn doesn't grow the cache forever.
+            # In place: set_patterns() swaps in a new dict rather than touching this one
+            for key in [key for key in names if key not in counters]:
+                del names[key]
+        self.previous = current
+        self.previous_at = now
+        return tuple(rows)
+
+def read_cpu_freq(backend=PSUTIL_BACKEND):
+    """(current MHz or None, per-core MHz) from one percpu read; per-core is () where not reported"""
+    freqs = backend.cpu_freq()
+    if not freqs:
+        return None, ()
+    per_core = tuple(round(freq.current) for freq in freqs)
+    if len(per_core) == 1:
+        # Only a machine-wide value (Windows, macOS)
+        return freqs[0].current, ()
+    return sum(freq.current for freq in freqs) / len(freqs), per_core
+
+def collect_snapshot(scheduler, visible):
+    """Run the due visible collectors and return a SystemSnapshot of the latest values"""
+    values = scheduler.run_due(visible)
+    cpu_percent, cpu_per_core = values["cpu"]
+    cpu_freq, cpu_freq_per_core = values["cpu_freq"]
+    mem = values["memory"]
+    swap = values["swap"]
+    interface, ip_address, mac_address = values["network"]
+    process_count, processes = values["processes"]
+    
+    return SystemSnapshot(
+        timestamp=time.time(),
+        cpu_percent=cpu_percent,
+        cpu_per_core=cpu_per_core,
+        cpu_freq=cpu_freq,
+        cpu_freq_per_core=cpu_freq_per_core,
+        # Memory and swap are None until their groups have run once
+        mem_percent=mem.percent if mem else 0.0,
+        mem_available=mem.available if mem else 0,
+        mem_cached=getattr(mem, 'cached', 0),
+        swap_total=swap.total if swap else 0,
+        swap_used=swap.used if swap else 0,
+        disk=values["disk"],
+        disk_io=values["disk_io"],
+        boot_time=values["boot_time"],
+        interface=interface,
+        ip_address=ip_address,
+        mac_address=mac_address,
+        net_io=values["net_io"],
+        process_count=process_count,
+        processes=processes,
+        tier_costs=scheduler.cost_per_minute(),
+    )
+
+class RingBuffer:
+    """Fixed-capacity ring of numbers in a preallocated array"""
+    
+    def __init__(self, capacity, typecode='f'):
+        self.data = array(typecode, bytes(array(typecode).itemsize * capacity))
+        self.capacity = capacity
+        self.start = 0
+        self.count = 0
+        
+    def append(self, value):
+        end = (self.start + self.count) % self.capacity
+        self.data[end] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+            
+    def clear(self):
+        self.start = 0
+        self.count = 0
+        
+    def assign(self, values):
+        """Replace the contents with the last capacity of values, oldest first"""
+        values = values[-self.capacity:]
+        self.data[:len(values)] = array(self.data.typecode, values)
+        self.start = 0
+        self.count = len(values)
+        
+    def latest(self, n=None):
+        """The last n values (all if None), oldest first"""
+        n = self.count if n is None else min(n, self.count)
+        begin = (self.start + self.count - n) % self.capacity
+        end = begin + n
+        if end <= self.capacity:
+            return self.data[begin:end]
+        return self.data[begin:] + self.data[:end - self.capacity]
+        
+    def __len__(self):
+        return self.count
+        
+    def nbytes(self):
+        return self.data.itemsize * self.capacity
+
+class MetricHistory:
+    """Per-metric sample history with tiered downsampling in fixed-size ring buffers
+    
+    Tier 0 keeps every sample; each further tier keeps one averaged point per
+    step seconds. All storage is allocated up front, so memory use never
+    grows however long the window stays open.
+    """
+    # (seconds per point, points): 1 h at the 2 s tick, 24 h at 1 minute
+    TIERS = ((2, 1800), (60, 1440))
+    MEMORY_CAP = 1024 * 1024
+    
+    def __init__(self, metrics, tiers=TIERS):
+        self.metrics = tuple(metrics)
+        self.steps = [step for step, points in tiers]
+        self.values = [{name: RingBuffer(points) for name in self.metrics} for step, points in tiers]
+        self.times = [RingBuffer(points, 'd') for step, points in tiers]
+        # Running sums of the bucket being filled, per downsampled tier
+        self.buckets = [None] * len(tiers)
+        self.sums = [dict.fromkeys(self.metrics, 0.0) for step, points in tiers]
+        self.counts = [0] * len(tiers)
+        if self.nbytes() > self.MEMORY_CAP:
+            raise ValueError(f"history needs {self.nbytes()} bytes, cap is {self.MEMORY_CAP}")
+            
+    def add(self, timestamp, values):
+        """Record one sample; values maps metric name to number"""
+        self.times[0].append(timestamp)
+        for name in self.metrics:
+            self.values[0][name].append(values[name])
+            
+        for tier in range(1, len(self.steps)):
+            bucket = int(timestamp // self.steps[tier])
+            if bucket != self.buckets[tier]:
+                self.flush(tier)
+                self.buckets[tier] = bucket
+            sums = self.sums[tier]
+            for name in self.metrics:
+                sums[name] += values[name]
+            self.counts[tier] += 1
+            
+    def flush(self, tier):
+        """Close the current bucket of a downsampled tier"""
+        count = self.counts[tier]
+        if not count:
+            return
+        self.times[tier].append(self.buckets[tier] * self.steps[tier])
+        sums = self.sums[tier]
+        for name in self.metrics:
+            self.values[tier][name].append(sums[name] / count)
+            sums[name] = 0.0
+        self.counts[tier] = 0
+        
+    def load(self, times, columns):
+        """Replace the history with samples given column by column, oldest first
+        
+        columns maps each metric name to a list of values aligned with times.
+        Tier 0 takes the samples it can hold and each further tier one
+        average per bucket of its step, as add() would have left them; the
+        buckets are found by bisecting times, so refilling a day of samples
+        costs a few list sums per bucket rather than an add() per sample.
+        """
+        self.clear()
+        self.times[0].assign(times)
+        for name in self.metrics:
+            self.values[0][name].assign(columns[name])
+        count = len(times)
+        for tier in range(1, len(self.steps)):
+            step = self.steps[tier]
+            begin = 0
+            bucket_times = []
+            averages = {name: [] for name in self.metrics}
+            while begin < count:
+                bucket = int(times[begin] // step)
+                end = bisect_left(times, (bucket + 1) * step, begin)
+                if end == count:
+                    # The last bucket stays open so that later add() calls extend it
+                    self.buckets[tier] = bucket
+                    self.sums[tier] = {name: float(sum(columns[name][begin:end])) for name in self.metrics}
+                    self.counts[tier] = end - begin
+                else:
+                    bucket_times.append(bucket * step)
+                    for name in self.metrics:
+                        averages[name].append(sum(columns[name][begin:end]) / (end - begin))
+                begin = end
+            self.times[tier].assign(bucket_times)
+            for name in self.metrics:
+                self.values[tier][name].assign(averages[name])
+    
+    def clear(self):
+        """Forget every sample, keeping the allocated storage"""
+        for tier in range(len(self.steps)):
+            self.times[tier].clear()
+            for ring in self.values[tier].values():
+                ring.clear()
+            self.buckets[tier] = None
+            self.sums[tier] = dict.fromkeys(self.metrics, 0.0)
+            self.counts[tier] = 0
+            
+    def span(self):
+        """Seconds of history the longest tier holds"""
+        return max(step * ring.capacity for step, ring in zip(self.steps, self.times))
+        
+    def series(self, name, tier=0):
+        """(timestamps, values) of one metric in a tier, oldest first"""
+        return self.times[tier].latest(), self.values[tier][name].latest()
+        
+    def nbytes(self):
+        return sum(ring.nbytes() for tier in self.values for ring in tier.values()) + \
+            sum(ring.nbytes() for ring in self.times)
+
+def read_dmi(name):
+    """Read one /sys/class/dmi/id attribute, None if unavailable"""
+    try:
+        with open(f'/sys/class/dmi/id/{name}', 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+class WmiProvider:
+    """One lazily created WMI session shared by every Windows consumer
+    
+    Each class is fetched with a single query selecting only the fields
+    listed in QUERIES, and the row is kept for all later lookups. The COM
+    connection belongs to the thread that created it, so use one provider
+    per thread (the sampler owns one).
+    """
+    QUERIES = {
+        "Win32_ComputerSystem": ("Manufacturer", "Model", "Domain"),
+        "Win32_BIOS": ("Caption",),
+    }
+    
+    def __init__(self):
+        self.connection = None
+        self.unavailable = False
+        self.results = {}
+        
+    def connect(self):
+        """Create the WMI connection on first use"""
+        if self.connection is None:
+            if self.unavailable:
+                raise RuntimeError("WMI is not available")
+            try:
+                import pythoncom
+                import wmi
+                # Needed on any thread other than the main one
+                pythoncom.CoInitialize()
+                self.connection = wmi.WMI()
+            except Exception:
+                self.unavailable = True
+                raise
+        return self.connection
+        
+    def get(self, wmi_class):
+        """First instance of wmi_class as a dict of its QUERIES fields"""
+        if wmi_class not in self.results:
+            fields = self.QUERIES[wmi_class]
+            with diagnostics.measure("wmi." + wmi_class):
+                rows = self.connect().query(f"SELECT {', '.join(fields)} FROM {wmi_class}")
+            self.results[wmi_class] = {field: getattr(rows[0], field, None) for field in fields} if rows else {}
+        return self.results[wmi_class]
+        
+    def invalidate(self):
+        """Forget fetched rows so the next get() queries again"""
+        self.results.clear()
+
+def read_system_manufacturer(system, wmi_provider):
+    """Return (vendor, model, bios) of the machine, None where unknown"""
+    vendor = model = bios = None
+    if system == "Windows":
+        try:
+            computer = wmi_provider.get("Win32_ComputerSystem")
+            vendor = computer.get("Manufacturer")
+            model = computer.get("Model")
+            bios = wmi_provider.get("Win32_BIOS").get("Caption")
+        except Exception as e:
+            diagnostics.failed("static.manufacturer", e)
+    elif system == "Linux":
+        # Try to read from DMI/sysfs
+        vendor = read_dmi('sys_vendor')
+        model = read_dmi('product_name')
+        bios = read_dmi('bios_version')
+    return vendor, model, bios
+
+def read_cpu_brand():
+    """CPU brand string, from py-cpuinfo when installed"""
+    try:
+        import cpuinfo
+        return cpuinfo.get_cpu_info().get('brand_raw', 'Unknown CPU')
+    except Exception:
+        return platform.processor() or "Unknown CPU"
+
+def read_domain(system, wmi_provider):
+    """Windows domain/workgroup of this machine"""
+    if system == "Windows":
+        try:
+            return wmi_provider.get("Win32_ComputerSystem").get("Domain") or "WORKGROUP"
+        except Exception as e:
+            diagnostics.failed("static.domain", e)
+    return "WORKGROUP"
+
+# Bump when the cached fields or their meaning change
+STATIC_CACHE_VERSION = 1
+# Slow-to-probe facts kept in the on-disk cache
+STATIC_CACHED_FIELDS = ("version", "vendor", "model", "bios", "cpu_brand", "physical_cores", "domain")
+
+def static_cache_path():
+    """Location of the static facts cache file"""
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "openabout", "static.json")
+
+def read_first_line(path):
+    """First line of a small text file, None if unavailable"""
+    try:
+        with open(path, 'r') as f:
+            return f.readline().strip() or None
+    except OSError:
+        return None
+
+def static_cache_key():
+    """Identifies this boot of this machine; any difference invalidates the cache"""
+    boot_id = read_first_line('/proc/sys/kernel/random/boot_id') or str(int(psutil.boot_time()))
+    machine_id = (read_first_line('/etc/machine-id') or read_first_line('/var/lib/dbus/machine-id')
+                  or socket.gethostname())
+    return {
+        "boot_id": boot_id,
+        "machine_id": machine_id,
+        # Cheap hardware fingerprint for CPU hot-plug
+        "logical_cores": psutil.cpu_count(logical=True),
+    }
+
+def load_static_cache(key):
+    """Cached facts for this key, or None if missing, stale or unreadable"""
+    try:
+        with open(static_cache_path(), 'r') as f:
+            data = json.load(f)
+        if data.get("format") != STATIC_CACHE_VERSION or data.get("key") != key:
+            return None
+        facts = data["facts"]
+        if set(facts) != set(STATIC_CACHED_FIELDS):
+            return None
+        return facts
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+def save_static_cache(key, facts):
+    """Write the cache atomically; failures only cost a slow start next time"""
+    path = static_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"format": STATIC_CACHE_VERSION, "key": key, "facts": facts}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def probe_static_facts(system, wmi_provider):
+    """Run the slow probes (WMI, DMI, py-cpuinfo) for the cached fields"""
+    wmi_provider.invalidate()
+    vendor, model, bios = read_system_manufacturer(system, wmi_provider)
+    return {
+        "version": platform.version(),
+        "vendor": vendor,
+        "model": model,
+        "bios": bios,
+        "cpu_brand": read_cpu_brand(),
+        "physical_cores": psutil.cpu_count(logical=False),
+        "domain": read_domain(system, wmi_provider),
+    }
+
+def collect_static_info(wmi_provider):
+    """Collect the facts shown once per refresh, using the on-disk cache for slow probes"""
+    system = platform.system()
+    
+    key = static_cache_key()
+    facts = load_static_cache(key)
+    if facts is None:
+        facts = probe_static_facts(system, wmi_provider)
+        save_static_cache(key, facts)
+        
+    try:
+        hostname = socket.gethostname()
+    except OSError:
+        hostname = None
+    try:
+        interface_count = len(psutil.net_if_addrs())
+    except Exception as e:
+        diagnostics.failed("static.interface_count", e)
+        interface_count = 0
+        
+    return StaticInfo(
+        system=system,
+        release=platform.release(),
+        logical_cores=key["logical_cores"],
+        memory_total=psutil.virtual_memory().total,
+        hostname=hostname,
+        interface_count=interface_count,
+        **facts
+    )
+
+class MountUsageProber:
+    """Bounded pool of daemon threads running psutil.disk_usage
+
+    A statvfs on a dead NFS/CIFS mount can block indefinitely and cannot be
+    cancelled, so the workers are daemon threads that never hold up exit,
+    and a mount whose previous probe is still stuck is not queued again.
+    """
+    WORKERS = 8
+    
+    def __init__(self, workers=WORKERS):
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.in_flight = set()
+        for i in range(workers):
+            threading.Thread(target=self.run, name=f"disk-probe-{i}", daemon=True).start()
+            
+    def probe(self, mountpoint, callback):
+        """Queue a probe; False if a probe of this mount is still outstanding
+
+        callback(mountpoint, usage or None, seconds) is called on a worker thread.
+        """
+        with self.lock:
+            if mountpoint in self.in_flight:
+                return False
+            self.in_flight.add(mountpoint)
+        self.queue.put((mountpoint, callback))
+        return True
+        
+    def run(self):
+        while True:
+            mountpoint, callback = self.queue.get()
+            start = time.monotonic()
+            error = None
+            try:
+                usage = psutil.disk_usage(mountpoint)
+            except Exception as e:
+                usage = None
+                error = e
+            elapsed = time.monotonic() - start
+            diagnostics.record("disk.usage", elapsed, error)
+            with self.lock:
+                self.in_flight.discard(mountpoint)
+            callback(mountpoint, usage, elapsed)
+            
+    def usage_all(self, mountpoints, timeout):
+        """Probe mounts in parallel and return {mountpoint: usage or None} for those answering within timeout"""
+        results = {}
+        pending = set(mountpoints)
+        lock = threading.Lock()
+        done = threading.Event()
+        
+        def finished(mountpoint, usage, elapsed):
+            with lock:
+                results[mountpoint] = usage
+                pending.discard(mountpoint)
+                if not pending:
+                    done.set()
+                    
+        for mountpoint in list(pending):
+            if not self.probe(mountpoint, finished):
+                with lock:
+                    pending.discard(mountpoint)
+        with lock:
+            if not pending:
+                done.set()
+        done.wait(timeout)
+        with lock:
+            return dict(results)
+
+# Groups collected by default; "processes" walks every process, so it only
+# runs when asked for (the Processes tab)
+ALL_GROUPS = frozenset(["cpu", "memory", "cpu_freq", "disk", "disk_io", "network", "net_io", "swap",
+                        "boot_time"])
+
+class Collector:
+    """All collection state: CPU deltas, cached lookups and the refresh schedule"""
+    
+    def __init__(self):
+        self.backend = select_backend()
+        self.cpu_tracker = CpuUsageTracker(self.backend)
+        self.partition_cache = PrimaryPartitionCache()
+        self.network_resolver = NetworkIdentityResolver()
+        self.process_tracker = ProcessTracker()
+        self.disk_io_tracker = DiskIoTracker(self.backend)
+        self.net_io_tracker = NetIoTracker(self.backend, os.environ.get("OPENABOUT_NET_INCLUDE", ""),
+                                           os.environ.get("OPENABOUT_NET_EXCLUDE", DEFAULT_NET_EXCLUDE))
+        self.wmi_provider = WmiProvider()
+        
+        # Interval in seconds; tiers: "light" = in-memory kernel counters,
+        # "io" = touches sysfs/filesystems, may stall
+        self.scheduler = RefreshScheduler([
+            MetricGroup("cpu", 2, "light", self.cpu_tracker.sample, (0.0, ())),
+            MetricGroup("memory", 2, "light", self.backend.virtual_memory),
+            MetricGroup("cpu_freq", 10, "io", lambda: read_cpu_freq(self.backend), (None, ())),
+            MetricGroup("disk", 10, "io", lambda: collect_disk(self.partition_cache)),
+            MetricGroup("disk_io", 2, "light", self.disk_io_tracker.sample, ()),
+            MetricGroup("network", 10, "light", self.network_resolver.get, (None, None, None)),
+            MetricGroup("net_io", 2, "light", self.net_io_tracker.sample, ()),
+            MetricGroup("swap", 60, "light", self.backend.swap_memory),
+            MetricGroup("boot_time", 300, "light", self.backend.boot_time),
+            MetricGroup("processes", 2, "io", self.process_tracker.sample, (0, ()), max_duty=0.25),
+        ])
+        
+    def snapshot(self, groups=ALL_GROUPS):
+        """Run the due collectors among groups and return a SystemSnapshot"""
+        return collect_snapshot(self.scheduler, groups)
+        
+    def static_info(self):
+        """Collect StaticInfo (cached on disk between launches)"""
+        with diagnostics.measure("collect.static_info"):
+            return collect_static_info(self.wmi_provider)
+
+def format_bytes(bytes_value):
+    """Format bytes to human readable format"""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if bytes_value < 1024.0:
+            return f"{bytes_value:.1f} {unit}"
+        bytes_value /= 1024.0
+    return f"{bytes_value:.1f} PB"
+
+def parse_address(address, default_host="127.0.0.1"):
+    """'PORT' or 'HOST:PORT' to (host, port); the default host is loopback only"""
+    host, _, port = str(address).rpartition(":")
+    return host or default_host, int(port)
+
+def snapshot_as_dict(snapshot):
+    """SystemSnapshot as plain JSON-serialisable data"""
+    data = snapshot._asdict()
+    data["disk"] = snapshot.disk._asdict() if snapshot.disk else None
+    data["disk_io"] = [row._asdict() for row in snapshot.disk_io]
+    data["net_io"] = [row._asdict() for row in snapshot.net_io]
+    data["cpu_per_core"] = list(snapshot.cpu_per_core)
+    data["cpu_freq_per_core"] = list(snapshot.cpu_freq_per_core)
+    data["processes"] = [row._asdict() for row in snapshot.processes]
+    data["tier_costs"] = dict(snapshot.tier_costs)
+    return data
@@ -0,0 +1,74 @@
+"""Tests for alerts.py: python -m pytest"""
+import pytest
+from alerts import AlertEngine, AlertRule, RollingWindow, parse_threshold
+from test_recording import snapshot
+
+def feed(window, samples):
+    return [window.add(timestamp, value) for timestamp, value in samples]
+
+SAMPLES = [(0, 5.0), (1, 1.0), (2, 3.0), (3, 8.0), (4, 2.0), (5, 2.0)]
+
+def brute_force(aggregate, seconds):
+    results = []
+    for index, (now, _) in enumerate(SAMPLES):
+        values = [value for timestamp, value in SAMPLES[:index + 1] if timestamp >= now - seconds]
+        results.append(sum(values) / len(values) if aggregate == "mean" else
+                       min(values) if aggregate == "min" else max(values))
+    return results
+
+@pytest.mark.parametrize("aggregate", ["mean", "min", "max"])
+def test_rolling_window(aggregate):
+    assert feed(RollingWindow(2, aggregate), SAMPLES) == pytest.approx(brute_force(aggregate, 2))
+
+def test_rolling_window_unknown_aggregate():
+    with pytest.raises(ValueError):
+        RollingWindow(10, "median")
+
+def test_fire_hold_clear():
+    rule = AlertRule({"metric": "cpu_percent", "above": 90, "for": 10, "clear": 80})
+    # Breaching, but not yet for 10 seconds
+    assert rule.update(0, 95) is None
+    assert rule.update(5, 95) is None
+    assert not rule.firing
+    assert rule.update(10, 95) is True
+    assert rule.firing
+    # Below the threshold but above clear: still firing
+    assert rule.update(15, 85) is None
+    assert rule.firing
+    assert rule.update(20, 79) is False
+    assert not rule.firing
+
+def test_breach_must_be_continuous():
+    rule = AlertRule({"metric": "cpu_percent", "above": 90, "for": 10})
+    assert rule.update(0, 95) is None
+    assert rule.update(5, 50) is None
+    assert rule.update(12, 95) is None
+    assert rule.update(22, 95) is True
+
+def test_below_with_window():
+    rule = AlertRule({"metric": "mem_available", "below": "1 GB", "window": 10, "aggregate": "max"})
+    assert rule.update(0, 2 * 1024**3) is None
+    # The window still holds the 2 GB sample
+    assert rule.update(5, 512 * 1024**2) is None
+    assert rule.update(11, 512 * 1024**2) is True
+    assert rule.update(12, 1024**3 + 1) is False
+
+def test_clear_on_wrong_side():
+    with pytest.raises(ValueError):
+        AlertRule({"metric": "cpu_percent", "above": 90, "clear": 95})
+
+def test_parse_threshold():
+    assert parse_threshold(90, "%") == 90.0
+    assert parse_threshold("1.5 GB", "bytes") == 1.5 * 1024**3
+    assert parse_threshold("512MB", "bytes") == 512 * 1024**2
+    with pytest.raises(ValueError):
+        parse_threshold("90", "%")
+
+def test_engine_events():
+    events = []
+    engine = AlertEngine([AlertRule({"name": "Busy", "metric": "process_count", "above": 104})], events.append)
+    assert engine.groups == {"processes"}
+    fired = [engine.evaluate(snapshot(row)) for row in range(8)]
+    assert [len(row_events) for row_events in fired] == [0, 0, 0, 0, 0, 1, 0, 0]
+    assert events[0].firing and events[0].rule == "Busy" and events[0].value == 105
+    assert engine.firing() == ["Busy"]
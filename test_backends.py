@@ -0,0 +1,144 @@
+"""Tests for the counter backends in sysinfo.py: LinuxProcBackend against PsutilBackend
+
+The same canned /proc files are given to both, psutil through its
+PROCFS_PATH, and on Linux both are also compared on the live system.
+"""
+import os
+import sys
+import psutil
+import pytest
+from sysinfo import LinuxProcBackend, PsutilBackend
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="the /proc backend is Linux only")
+
+TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# The per-CPU lines are not followed by "intr" here, so a parser relying on the line order would break
+STAT = f"""cpu  {4 * TICKS} 0 {2 * TICKS} {40 * TICKS} 10 0 3 0 0 0
+cpu0 {TICKS} 0 {TICKS} {20 * TICKS} 5 0 1 0 0 0
+cpu1 {3 * TICKS} 0 {TICKS} {20 * TICKS} 5 0 2 0 0 0
+ctxt 123456
+btime 1700000000
+intr 1000 1 2 3
+processes 4242
+procs_running 2
+procs_blocked 0
+softirq 55 1 2 3
+"""
+MEMINFO = """MemTotal:       16318480 kB
+MemFree:         2315764 kB
+MemAvailable:    9876544 kB
+Buffers:          412340 kB
+Cached:          6123456 kB
+SwapCached:        10240 kB
+Active:          7000000 kB
+Inactive:        5000000 kB
+Shmem:            345678 kB
+Slab:             700000 kB
+SReclaimable:     512000 kB
+SwapTotal:       8388604 kB
+SwapFree:        6291452 kB
+"""
+DISKSTATS = """   8       0 sda 120000 3000 9600000 40000 80000 5000 6400000 90000 0 65000 130000 0 0 0 0
+   8       1 sda1 110000 2900 9500000 39000 79000 4900 6300000 89000 0 64000 128000 0 0 0 0
+ 259       0 nvme0n1 5000 10 800000 2000 7000 20 1200000 3000 1 4500 5000 0 0 0 0 0 0
+   7       0 loop0 50 0 400 10 0 0 0 0 0 20 10 0 0 0 0
+"""
+NET_DEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo: 8000000   60000    0    0    0     0          0         0  8000000   60000    0    0    0     0       0          0
+  eth0: 987654321  900000   12    3    0     0          0       100 123456789  700000    4    1    0     0       0          0
+wlan0:  555 6 0 0 0 0 0 0 777 8 0 0 0 0 0 0
+"""
+VMSTAT = """pswpin 100
+pswpout 200
+"""
+
+@pytest.fixture
+def canned(tmp_path, monkeypatch):
+    """(LinuxProcBackend, PsutilBackend) both reading the canned files"""
+    files = {"stat": STAT, "meminfo": MEMINFO, "diskstats": DISKSTATS, "net/dev": NET_DEV, "vmstat": VMSTAT}
+    for name, text in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(text)
+    monkeypatch.setattr(psutil, "PROCFS_PATH", str(tmp_path))
+    backend = LinuxProcBackend()
+    for attribute, name in (("stat_fd", "stat"), ("meminfo_fd", "meminfo"), ("diskstats_fd", "diskstats"),
+                            ("net_dev_fd", "net/dev")):
+        os.close(getattr(backend, attribute))
+        setattr(backend, attribute, os.open(tmp_path / name, os.O_RDONLY))
+    yield backend, PsutilBackend()
+    # psutil remembers the counters to undo wraparound; the canned ones must not leak into later reads
+    psutil.disk_io_counters.cache_clear()
+    psutil.net_io_counters.cache_clear()
+
+def test_canned_cpu_times(canned):
+    proc, reference = canned
+    cpus = proc.cpu_times()
+    assert len(cpus) == 2
+    for ours, theirs in zip(cpus, reference.cpu_times()):
+        for field in theirs._fields:
+            assert getattr(ours, field) == pytest.approx(getattr(theirs, field)), field
+    assert proc.boot_time() == 1700000000
+
+def test_canned_memory(canned):
+    proc, reference = canned
+    ours, theirs = proc.virtual_memory(), reference.virtual_memory()
+    for field in ours._fields:
+        assert getattr(ours, field) == getattr(theirs, field), field
+    ours, theirs = proc.swap_memory(), reference.swap_memory()
+    for field in ours._fields:
+        assert getattr(ours, field) == getattr(theirs, field), field
+
+def test_canned_disk_io(canned):
+    proc, reference = canned
+    ours, theirs = proc.disk_io_counters(), reference.disk_io_counters()
+    assert {name.decode() for name in ours} == set(theirs)
+    for name, counters in ours.items():
+        for field in counters._fields:
+            assert getattr(counters, field) == getattr(theirs[name.decode()], field), (name, field)
+
+def test_canned_net_io(canned):
+    proc, reference = canned
+    ours, theirs = proc.net_io_counters(), reference.net_io_counters()
+    assert {name.decode() for name in ours} == set(theirs) == {"lo", "eth0", "wlan0"}
+    for name, counters in ours.items():
+        for field in counters._fields:
+            assert getattr(counters, field) == getattr(theirs[name.decode()], field), (name, field)
+
+@pytest.fixture
+def live():
+    return LinuxProcBackend(), PsutilBackend()
+
+def test_live_cpu_times(live):
+    proc, reference = live
+    ours, theirs = proc.cpu_times(), reference.cpu_times()
+    assert len(ours) == len(theirs)
+    for cpu, (mine, other) in enumerate(zip(ours, theirs)):
+        # Read a moment apart, so allow a second of drift per counter
+        for field in ("user", "system", "idle", "iowait"):
+            assert getattr(mine, field) == pytest.approx(getattr(other, field), abs=1.0), (cpu, field)
+    assert proc.boot_time() == pytest.approx(reference.boot_time(), abs=1.0)
+
+def test_live_memory(live):
+    proc, reference = live
+    ours, theirs = proc.virtual_memory(), reference.virtual_memory()
+    assert ours.total == theirs.total
+    for field in ("available", "used", "free", "buffers", "cached"):
+        assert getattr(ours, field) == pytest.approx(getattr(theirs, field), rel=0.05, abs=64 * 1024**2), field
+    ours, theirs = proc.swap_memory(), reference.swap_memory()
+    assert ours.total == theirs.total
+    assert ours.used == pytest.approx(theirs.used, abs=64 * 1024**2)
+
+def test_live_disk_and_net_io(live):
+    proc, reference = live
+    for ours, theirs in ((proc.disk_io_counters(), reference.disk_io_counters()),
+                         (proc.net_io_counters(), reference.net_io_counters())):
+        ours = {name.decode(): counters for name, counters in ours.items()}
+        assert set(ours) == set(theirs)
+        for name, counters in ours.items():
+            for field in counters._fields:
+                mine, other = getattr(counters, field), getattr(theirs[name], field)
+                # Counters only grow; allow for activity between the two reads
+                assert other * 0.99 - 1e6 <= mine <= other * 1.01 + 1e6, (name, field)
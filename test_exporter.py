@@ -0,0 +1,55 @@
+"""Tests for exporter.py: python -m pytest"""
+import http.client
+import threading
+import time
+import pytest
+from exporter import MetricsExporter
+
+@pytest.fixture
+def hung_exporter():
+    """An exporter serving on a free local port whose first collection doesn't finish until released"""
+    exporter = MetricsExporter(interval=15.0)
+    release = threading.Event()
+    collect = exporter.collect
+    
+    def slow_collect():
+        release.wait()
+        collect()
+        
+    exporter.collect = slow_collect
+    exporter.start()
+    server = exporter.make_server("127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield exporter, server.server_address[1], release
+    release.set()
+    exporter.stop()
+    server.shutdown()
+    server.server_close()
+
+def scrape(port):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+def test_503_without_waiting_for_first_collection(hung_exporter):
+    exporter, port, release = hung_exporter
+    start = time.monotonic()
+    status, _ = scrape(port)
+    assert status == 503
+    assert time.monotonic() - start < 1.0
+    release.set()
+    assert exporter.ready.wait(10)
+    status, body = scrape(port)
+    assert status == 200
+    assert b"openabout_cpu_usage_percent" in body
+
+def test_unknown_path(hung_exporter):
+    _, port, _ = hung_exporter
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request("GET", "/other")
+    assert connection.getresponse().status == 404
+    connection.close()
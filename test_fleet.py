@@ -0,0 +1,118 @@
+"""Tests for fleet.py: python -m pytest"""
+import json
+import socket
+import time
+import pytest
+from fleet import MAX_MESSAGE, FleetAggregator, accepted_fields
+
+@pytest.fixture
+def aggregator():
+    aggregator = FleetAggregator()
+    aggregator.start("127.0.0.1", 0)
+    yield aggregator
+    aggregator.stop()
+
+@pytest.fixture
+def connect(aggregator):
+    """Open agent connections to the aggregator; they are closed before it stops"""
+    sockets = []
+    
+    def connect():
+        sock = socket.create_connection(aggregator.address, timeout=5)
+        sockets.append(sock)
+        return sock
+        
+    yield connect
+    for sock in sockets:
+        sock.close()
+
+def send(sock, message):
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+def host_record(aggregator, host, condition=lambda record: True, timeout=5.0):
+    """Copy of a host's record once condition holds for it"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with aggregator.lock:
+            record = dict(aggregator.hosts.get(host) or {})
+        if record and condition(record):
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"{host}: {record}")
+
+def is_closed(sock):
+    try:
+        return sock.recv(1) == b""
+    except ConnectionResetError:
+        # Closed with our unread data still in its buffer
+        return True
+
+def test_accepted_fields():
+    fields = {"host": "web-1", "cpu": 12.5, "cores": 8, "disk": None, "mem": "high", "online": False,
+              "last_seen": 0, "interval": True}
+    assert accepted_fields(fields) == {"host": "web-1", "cpu": 12.5, "cores": 8, "disk": None}
+
+def test_full_and_delta(aggregator, connect):
+    sock = connect()
+    send(sock, {"f": {"host": "web-1", "os": "Linux 6.1", "cpu": 10.0, "mem": 40.0, "online": False,
+                      "address": "10.0.0.9", "extra": "x" * 100}})
+    record = host_record(aggregator, "web-1")
+    assert record["online"] is True
+    assert record["address"] == "127.0.0.1"
+    assert "extra" not in record
+    send(sock, {"d": {"cpu": 55.5, "mem": "full", "last_seen": 0, "disk": 70}})
+    record = host_record(aggregator, "web-1", lambda record: record["cpu"] == 55.5)
+    assert record["mem"] == 40.0
+    assert record["disk"] == 70
+    assert record["last_seen"] > 0
+    assert aggregator.take_changes().keys() == {"web-1"}
+    assert aggregator.take_changes() == {}
+
+def test_disconnect_marks_offline(aggregator, connect):
+    sock = connect()
+    send(sock, {"f": {"host": "web-1", "cpu": 1.0}})
+    host_record(aggregator, "web-1")
+    sock.close()
+    host_record(aggregator, "web-1", lambda record: not record["online"])
+
+@pytest.mark.parametrize("line", [
+    b"{not json\n",
+    b"[1, 2]\n",
+    b'{"f": [1, 2]}\n',
+    b"{" + b" " * MAX_MESSAGE + b"}\n",
+])
+def test_bad_line_drops_connection(aggregator, connect, line):
+    sock = connect()
+    send(sock, {"f": {"host": "web-1", "cpu": 1.0}})
+    host_record(aggregator, "web-1")
+    sock.sendall(line)
+    host_record(aggregator, "web-1", lambda record: not record["online"])
+    assert is_closed(sock)
+    assert host_record(aggregator, "web-1")["cpu"] == 1.0
+
+def test_delta_before_full_record(aggregator, connect):
+    sock = connect()
+    send(sock, {"d": {"host": "web-1", "cpu": 1.0}})
+    assert is_closed(sock)
+    assert aggregator.hosts == {}
+
+def test_rename(aggregator, connect):
+    sock = connect()
+    send(sock, {"f": {"host": "old", "cpu": 1.0}})
+    host_record(aggregator, "old")
+    send(sock, {"f": {"host": "new", "cpu": 2.0}})
+    host_record(aggregator, "new")
+    assert host_record(aggregator, "old")["online"] is False
+    assert set(aggregator.connections) == {"new"}
+
+def test_reconnect_keeps_host_online(aggregator, connect):
+    first = connect()
+    send(first, {"f": {"host": "web-1", "cpu": 1.0}})
+    host_record(aggregator, "web-1")
+    second = connect()
+    send(second, {"f": {"host": "web-1", "cpu": 2.0}})
+    host_record(aggregator, "web-1", lambda record: record["cpu"] == 2.0)
+    # The old connection closing must not mark the host offline
+    first.close()
+    time.sleep(0.2)
+    assert host_record(aggregator, "web-1")["online"] is True
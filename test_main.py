@@ -0,0 +1,76 @@
+"""Tests for the Qt models in main.py: python -m pytest"""
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6")
+from main import DeviceTableModel, Sparkline
+from sysinfo import DiskIoRow, MetricHistory
+
+@pytest.fixture
+def model():
+    """A DeviceTableModel and the list of signals it emitted"""
+    model = DeviceTableModel([("Device", str), ("Read", str), ("Write", str), ("Reads", str), ("Writes", str),
+                              ("Busy", str)])
+    signals = []
+    model.rowsInserted.connect(lambda parent, first, last: signals.append(("inserted", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: signals.append(("removed", first, last)))
+    model.dataChanged.connect(lambda first, last: signals.append(("changed", first.row(), last.row())))
+    return model, signals
+
+def row(device, read_bytes=0):
+    return DiskIoRow(device, read_bytes, 0, 0.0, 0.0, 0.0)
+
+def devices(model):
+    return [model.data(model.index(position, 0)) for position in range(model.rowCount())]
+
+def test_insert(model):
+    model, signals = model
+    model.update([row("sda"), row("sdb")])
+    assert devices(model) == ["sda", "sdb"]
+    assert signals == [("inserted", 0, 1)]
+
+def test_unchanged_rows_emit_nothing(model):
+    model, signals = model
+    model.update([row("sda"), row("sdb")])
+    signals.clear()
+    model.update([row("sda"), row("sdb")])
+    assert signals == []
+
+def test_changed_rows(model):
+    model, signals = model
+    model.update([row("sda"), row("sdb"), row("sdc")])
+    signals.clear()
+    model.update([row("sda"), row("sdb", 100), row("sdc", 200)])
+    assert signals == [("changed", 1, 2)]
+    assert model.data(model.index(2, 1)) == "200"
+
+def test_remove_and_insert(model):
+    model, signals = model
+    model.update([row("sda"), row("sdb"), row("sdc")])
+    signals.clear()
+    model.update([row("sdc", 5), row("sdd"), row("sda")])
+    assert signals == [("removed", 1, 1), ("changed", 1, 1), ("inserted", 2, 2)]
+    assert devices(model) == ["sda", "sdc", "sdd"]
+    assert model.index_of == {"sda": 0, "sdc": 1, "sdd": 2}
+    model.update([])
+    assert model.rowCount() == 0 and model.index_of == {}
+
+@pytest.mark.parametrize("seconds, name", [
+    (0, "last minute"), (45 * 60, "last 45 minutes"), (3600, "last hour"), (5 * 3600, "last 5 hours"),
+])
+def test_sparkline_span(seconds, name):
+    history = MetricHistory(("cpu",))
+    # Sampled every 10 s, as while the window is hidden
+    for step in range(0, seconds + 1, 10):
+        history.add(1_000_000 + step, {"cpu": 50.0 if step == 0 else 10.0})
+    assert f"({name} of samples)" in Sparkline.history_tooltip(history, "cpu", 0)
+
+def test_adjacent_rows_removed_together(model):
+    model, signals = model
+    model.update([row(device) for device in ("sda", "sdb", "sdc", "sdd", "sde")])
+    signals.clear()
+    model.update([row("sda"), row("sdd")])
+    assert signals == [("removed", 4, 4), ("removed", 1, 2)]
+    assert devices(model) == ["sda", "sdd"]
+    assert model.index_of == {"sda": 0, "sdd": 1}
@@ -0,0 +1,102 @@
+"""Tests for recording.py: python -m pytest"""
+import pytest
+from recording import SessionReader, SessionWriter
+from sysinfo import DiskSnapshot, StaticInfo, SystemSnapshot
+
+CORES = 4
+# Small blocks so a handful of rows spans several of them
+ROWS_PER_BLOCK = 4
+
+def static_info(cores=CORES):
+    return StaticInfo(
+        system="Linux", release="6.1", version="#1", vendor="Vendor", model="Model", bios="1.0",
+        cpu_brand="Test CPU", physical_cores=cores, logical_cores=cores, memory_total=8 * 1024**3,
+        hostname="host", domain="WORKGROUP", interface_count=2,
+    )
+
+def snapshot(row):
+    return SystemSnapshot(
+        timestamp=1000.0 + 2 * row,
+        cpu_percent=float(row % 100),
+        cpu_per_core=tuple(float((row + core) % 100) for core in range(CORES)),
+        cpu_freq=2000.0 + row,
+        cpu_freq_per_core=tuple(2000 + row + core for core in range(CORES)),
+        mem_percent=50.0,
+        mem_available=4 * 1024**3 - row,
+        mem_cached=1024**3,
+        swap_total=0,
+        swap_used=0,
+        disk=DiskSnapshot("/dev/sda1", "/", "ext4", 100 * 1024**3, 40 * 1024**3 + row, 60.0),
+        disk_io=(),
+        boot_time=500.0,
+        interface="eth0",
+        ip_address="192.168.1.2",
+        mac_address="00:11:22:33:44:55",
+        net_io=(),
+        process_count=100 + row,
+        processes=(),
+        tier_costs=(),
+    )
+
+def write(path, rows, start=0):
+    writer = SessionWriter(str(path), static_info(), rows_per_block=ROWS_PER_BLOCK)
+    try:
+        for row in range(start, start + rows):
+            writer.append(snapshot(row))
+    finally:
+        writer.close()
+
+@pytest.fixture
+def session(tmp_path):
+    path = tmp_path / "session.oas"
+    write(path, 10)
+    reader = SessionReader(str(path))
+    yield reader
+    reader.close()
+
+def test_rows_round_trip(session):
+    assert len(session) == 10
+    assert session.static == static_info()
+    for row in range(10):
+        expected = snapshot(row)
+        assert session.timestamp(row) == expected.timestamp
+        assert session.value("process_count", row) == expected.process_count
+        assert session.value("mem_available", row) == expected.mem_available
+        assert session.value("cpu_per_core", row) == expected.cpu_per_core
+        restored = session.snapshot(row)
+        assert restored.cpu_freq_per_core == expected.cpu_freq_per_core
+        assert restored.disk == expected.disk
+        assert restored.ip_address == expected.ip_address
+
+def test_column_spans_blocks(session):
+    assert session.column("process_count", 2, 9) == [100 + row for row in range(2, 9)]
+
+def test_find(session):
+    assert session.find(0) == 0
+    assert session.find(1000.0) == 0
+    assert session.find(1007.0) == 3
+    assert session.find(1008.0) == 4
+    assert session.find(10**9) == 9
+
+def test_append_to_existing_file(tmp_path):
+    path = tmp_path / "session.oas"
+    write(path, 6)
+    write(path, 5, start=6)
+    reader = SessionReader(str(path))
+    try:
+        assert len(reader) == 11
+        assert [reader.value("process_count", row) for row in range(11)] == [100 + row for row in range(11)]
+    finally:
+        reader.close()
+
+def test_cores_mismatch(tmp_path):
+    path = tmp_path / "session.oas"
+    write(path, 1)
+    with pytest.raises(ValueError, match="cores"):
+        SessionWriter(str(path), static_info(cores=CORES * 2))
+
+def test_not_a_session(tmp_path):
+    path = tmp_path / "other.oas"
+    path.write_bytes(b"x" * 100)
+    with pytest.raises(ValueError):
+        SessionReader(str(path))
@@ -0,0 +1,196 @@
+"""Tests for sysinfo.py: python -m pytest"""
+import pytest
+import sysinfo
+from sysinfo import (DiskIoRow, DiskIoTracker, MetricGroup, MetricHistory, NetIoRow, NetIoTracker, ProcDiskIo,
+                     ProcNetIo, RefreshScheduler, compile_patterns)
+
+def test_force_during_run_is_kept():
+    runs = []
+    
+    def collect():
+        runs.append(len(runs))
+        # A refresh requested from another thread while this group is being collected
+        if len(runs) == 1:
+            scheduler.force()
+        return len(runs)
+        
+    scheduler = RefreshScheduler([MetricGroup("slow", 3600, 2, collect)])
+    scheduler.run_due({"slow"})
+    assert scheduler.run_due({"slow"}) == {"slow": 2}
+    # Consumed: the group isn't due again for an hour
+    assert scheduler.run_due({"slow"}) == {"slow": 2}
+    scheduler.force()
+    assert scheduler.run_due({"slow"}) == {"slow": 3}
+
+def test_history_load_matches_add():
+    metrics = ("cpu", "memory")
+    # Two hours at 2 s with a gap, in a history with small tiers
+    times = [1000.5 + 2 * i for i in range(1800)] + [9000.5 + 2 * i for i in range(1800)]
+    columns = {"cpu": [float(i % 97) for i in range(3600)], "memory": [float(i % 13) for i in range(3600)]}
+    tiers = ((2, 100), (60, 50))
+    added, loaded = MetricHistory(metrics, tiers), MetricHistory(metrics, tiers)
+    for index, timestamp in enumerate(times):
+        added.add(timestamp, {name: columns[name][index] for name in metrics})
+    loaded.load(times, columns)
+    # Both carry on the same way from the open bucket
+    for history in (added, loaded):
+        for step in range(1, 40):
+            history.add(times[-1] + 2 * step, {"cpu": 50.0, "memory": 5.0})
+    for tier in range(2):
+        for name in metrics:
+            added_times, added_values = added.series(name, tier)
+            loaded_times, loaded_values = loaded.series(name, tier)
+            assert list(loaded_times) == list(added_times)
+            assert list(loaded_values) == pytest.approx(list(added_values))
+
+class FakeClock:
+    """Stands in for time.monotonic in sysinfo"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        
+    def __call__(self):
+        return self.now
+
+class FakeBackend:
+    """Serves the counters a test sets, as the disk and network trackers read them"""
+    
+    def __init__(self):
+        self.disks = {}
+        self.nics = {}
+        
+    def disk_io_counters(self):
+        return dict(self.disks)
+        
+    def net_io_counters(self):
+        return dict(self.nics)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(sysinfo.time, "monotonic", clock)
+    return clock
+
+def disk(reads=0, writes=0, read_bytes=0, write_bytes=0, busy_time=0):
+    return ProcDiskIo(reads, writes, read_bytes, write_bytes, busy_time)
+
+@pytest.fixture
+def disk_tracker(monkeypatch):
+    # Whole disks are sda and nvme0n1; anything else is taken for a partition
+    monkeypatch.setattr(DiskIoTracker, "WHOLE_DISKS_ONLY", True)
+    real_exists = sysinfo.os.path.exists
+    monkeypatch.setattr(sysinfo.os.path, "exists", lambda path: path in ("/sys/block/sda", "/sys/block/nvme0n1")
+                        if path.startswith("/sys/block/") else real_exists(path))
+    backend = FakeBackend()
+    return DiskIoTracker(backend), backend
+
+def test_disk_io_rates(clock, disk_tracker):
+    tracker, backend = disk_tracker
+    backend.disks = {b"sda": disk(100, 50, 1000, 2000, 500)}
+    assert tracker.sample() == ()
+    clock.now += 2
+    backend.disks = {b"sda": disk(300, 150, 5000, 4000, 1500)}
+    assert tracker.sample() == (DiskIoRow("sda", 2000, 1000, 100.0, 50.0, 50.0),)
+    # Busy time is capped at 100%
+    clock.now += 1
+    backend.disks = {b"sda": disk(300, 150, 5000, 4000, 3500)}
+    assert tracker.sample() == (DiskIoRow("sda", 0, 0, 0.0, 0.0, 100.0),)
+
+def test_disk_io_counter_reset(clock, disk_tracker):
+    tracker, backend = disk_tracker
+    backend.disks = {b"sda": disk(1000, 1000, 10**9, 10**9, 10**6)}
+    tracker.sample()
+    clock.now += 2
+    # The device was replaced under the same name and its counters started again
+    backend.disks = {b"sda": disk(10, 0, 4096, 0, 20)}
+    assert tracker.sample() == (DiskIoRow("sda", 0, 0, 0.0, 0.0, 0.0),)
+    clock.now += 2
+    backend.disks = {b"sda": disk(20, 0, 8192, 0, 20)}
+    assert tracker.sample() == (DiskIoRow("sda", 2048, 0, 5.0, 0.0, 0.0),)
+
+def test_disk_io_excluded_devices(clock, disk_tracker):
+    tracker, backend = disk_tracker
+    names = [b"sda", b"sda1", b"nvme0n1", b"nvme0n1p2", b"loop0", b"ram0", b"zram0", b"dm-0"]
+    backend.disks = {name: disk() for name in names}
+    tracker.sample()
+    clock.now += 1
+    assert [row.device for row in tracker.sample()] == ["sda", "nvme0n1"]
+    assert tracker.names[b"sda1"] is None and tracker.names[b"zram0"] is None
+
+def test_disk_io_names_pruned(clock, disk_tracker):
+    tracker, backend = disk_tracker
+    for step in range(50):
+        # One disk stays, a hot-plugged one comes and goes under a new name each time
+        backend.disks = {b"sda": disk(step), f"sd{step}".encode(): disk(step)}
+        tracker.sample()
+        clock.now += 1
+        assert len(tracker.names) <= 2 * len(backend.disks) + 1
+    assert b"sda" in tracker.names
+
+def nic(received=0, sent=0, errors=0, drops=0):
+    return ProcNetIo(sent, received, sent // 100, received // 100, errors, 0, drops, 0)
+
+def test_compile_patterns():
+    assert compile_patterns("") is None
+    assert compile_patterns(" , ") is None
+    pattern = compile_patterns("eth*, wl*  veth?")
+    assert [name for name in ("eth0", "wlan0", "veth1", "veth12", "lo", "xeth0") if pattern.match(name)] == \
+        ["eth0", "wlan0", "veth1"]
+
+def shown(tracker, clock, backend, names):
+    backend.nics = {name: nic() for name in names}
+    tracker.sample()
+    clock.now += 1
+    return [row.interface for row in tracker.sample()]
+
+def test_net_io_default_excludes_lo(clock):
+    backend = FakeBackend()
+    assert shown(NetIoTracker(backend), clock, backend, [b"lo", b"eth0", b"wlan0"]) == ["eth0", "wlan0"]
+
+def test_net_io_include_and_exclude(clock):
+    backend = FakeBackend()
+    tracker = NetIoTracker(backend, include="eth*, veth*", exclude="veth1*")
+    assert shown(tracker, clock, backend, [b"lo", b"eth0", b"veth0", b"veth10", b"wlan0"]) == ["eth0", "veth0"]
+    # New patterns apply to interfaces already seen
+    tracker.set_patterns("", "")
+    assert shown(tracker, clock, backend, [b"lo", b"eth0", b"veth0", b"veth10", b"wlan0"]) == \
+        ["lo", "eth0", "veth0", "veth10", "wlan0"]
+
+def test_net_io_rates(clock):
+    backend = FakeBackend()
+    tracker = NetIoTracker(backend)
+    backend.nics = {b"eth0": nic(1000, 500)}
+    assert tracker.sample() == ()
+    clock.now += 2
+    backend.nics = {b"eth0": nic(5000, 900, errors=4, drops=2)}
+    assert tracker.sample() == (NetIoRow("eth0", 2000, 200, 20.0, 2.0, 2.0, 1.0),)
+    # Recreated under the same name: counters went backwards
+    clock.now += 2
+    backend.nics = {b"eth0": nic(100, 0)}
+    assert tracker.sample() == (NetIoRow("eth0", 0, 0, 0.0, 0.0, 0.0, 0.0),)
+
+def test_net_io_idle_row_reused(clock):
+    backend = FakeBackend()
+    tracker = NetIoTracker(backend)
+    backend.nics = {b"veth0": nic(1000, 1000), b"veth1": nic(1000, 1000)}
+    tracker.sample()
+    clock.now += 1
+    first = tracker.sample()
+    clock.now += 1
+    second = tracker.sample()
+    idle = NetIoRow("veth0", 0, 0, 0.0, 0.0, 0.0, 0.0)
+    assert first == second == (idle, idle._replace(interface="veth1"))
+    assert all(a is b for a, b in zip(first, second))
+
+def test_net_io_names_pruned_in_place(clock):
+    backend = FakeBackend()
+    tracker = NetIoTracker(backend)
+    names = tracker.filters[2]
+    for step in range(50):
+        backend.nics = {b"eth0": nic(step), f"veth{step}".encode(): nic(step)}
+        tracker.sample()
+        clock.now += 1
+        assert len(names) <= 2 * len(backend.nics) + 1
+    # Pruned in place, so it is still the dict set_patterns() installed
+    assert tracker.filters[2] is names
+    assert b"eth0" in names and b"veth0" not in names